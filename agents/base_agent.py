@@ -4,17 +4,94 @@ This module provides a base agent class using Google Gemini via Vertex AI.
 All specialized agents (Scanner, Analyzer, Creator, etc.) will inherit from this.
 """
 
-import os
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+import time
+import asyncio
+import weakref
+import functools
+import orjson
+from typing import Dict, Any, Optional, AsyncIterator
 from google import genai
 from google.genai import types
 
 from utils.monitoring import AgentLogger, PerformanceMonitor
 from utils.a2a_protocol import a2a_protocol
+from utils.config import config
+from utils.llm_cache import get_llm_cache, make_cache_key
+from utils.llm_pool import LLMPool
 
-# Load environment variables
-load_dotenv()
+# Vertex AI context caching only accepts prompts of at least this many tokens
+MIN_CACHE_TOKENS = 1024
+
+# Responses above this temperature are creative, not idempotent, so never cached
+MAX_CACHEABLE_TEMPERATURE = 0.5
+
+# Parsed analyses stay valid as long as the repository data is unchanged
+RESULT_CACHE_EXPIRE_SECONDS = 7 * 86400
+
+
+# Connection limits for the async HTTP transport shared by all agents
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+
+# Idle connections stay open across pipeline steps (a problem-creation call
+# can leave the validator's connection idle for well over httpx's 5s default)
+KEEPALIVE_EXPIRY_SECONDS = 120
+
+
+def _http_options() -> types.HttpOptions:
+    """Build transport options for the async client
+    
+    Enables HTTP/2 when the `h2` package is installed, so concurrent agent
+    calls multiplex over one TLS connection instead of queueing on HTTP/1.1.
+    """
+    import httpx
+    
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    return types.HttpOptions(
+        async_client_args={
+            "http2": http2,
+            "limits": httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+            )
+        }
+    )
+
+
+# Clients per event loop: the async transport's pooled connections belong to
+# the loop that opened them (the web server runs each generation on its own loop)
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, genai.Client]]" = weakref.WeakKeyDictionary()
+
+
+def get_shared_client(project: Optional[str], region: str) -> genai.Client:
+    """Get the Vertex AI client shared by every agent on the running event loop
+    
+    Reusing one client lets all agents share its connection pool instead of
+    each agent opening its own connections. Must be called from a coroutine.
+    """
+    clients = _shared_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get((project, region))
+    if client is None:
+        client = clients[(project, region)] = genai.Client(
+            vertexai=True,
+            project=project,
+            location=region,
+            http_options=_http_options()
+        )
+    return client
+
+
+async def aclose_shared_clients() -> None:
+    """Close the running loop's Vertex AI clients (call before the loop ends)"""
+    clients = _shared_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aio.aclose()
 
 
 class BaseGeminiAgent:
@@ -33,7 +110,8 @@ class BaseGeminiAgent:
         model: str = "gemini-2.5-flash",
         system_instruction: str = None,
         temperature: float = 0.7,
-        max_output_tokens: int = 2048
+        max_output_tokens: int = 2048,
+        response_schema: Optional[type] = None
     ):
         """Initialize a Gemini agent
         
@@ -43,19 +121,36 @@ class BaseGeminiAgent:
             system_instruction: System prompt for the agent
             temperature: Model temperature (0.0-1.0)
             max_output_tokens: Maximum tokens to generate
+            response_schema: Optional Pydantic model the output must match
         """
         self.name = name
         self.model = model
         self.system_instruction = system_instruction
         self.temperature = temperature
         self.max_output_tokens = max_output_tokens
+        self.response_schema = response_schema
         
         # Initialize logging and monitoring
         self.logger = AgentLogger(name)
         self.performance = PerformanceMonitor()
+        self._timer_name = f"{name}_execution"
         
-        # Initialize Vertex AI client
-        self.client = self._initialize_client()
+        # Vertex AI configuration (the client itself is per event loop, see `client`)
+        self._initialize_client()
+        
+        # Default generation config, copied only when a call needs overrides.
+        # The response schema is attached once here so the SDK converts it a
+        # single time rather than on every call
+        self._default_config = types.GenerateContentConfig(
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            system_instruction=system_instruction,
+            response_mime_type="application/json" if response_schema else None,
+            response_schema=response_schema
+        )
+        
+        # Background A2A notifications (kept referenced so they are not GC'd)
+        self._pending_notifications: set[asyncio.Task] = set()
         
         self.logger.info(
             f"Agent initialized",
@@ -63,27 +158,141 @@ class BaseGeminiAgent:
             temperature=temperature
         )
     
-    def _initialize_client(self) -> genai.Client:
-        """Initialize Vertex AI client"""
+    def _initialize_client(self) -> None:
+        """Resolve the Vertex AI project and region the shared client uses"""
         
-        try:
-            client = genai.Client(
-                vertexai=True,
-                project=os.getenv("GOOGLE_CLOUD_PROJECT"),
-                location=os.getenv("GOOGLE_CLOUD_REGION", "us-central1")
-            )
+        cfg = config()
+        self._project = cfg.project
+        self._region = cfg.region
+        
+        self.logger.info(
+            "Vertex AI client configured",
+            project=cfg.project,
+            region=cfg.region
+        )
+    
+    @property
+    def client(self) -> genai.Client:
+        """The running event loop's shared Vertex AI client"""
+        return get_shared_client(self._project, self._region)
+    
+    async def _build_config(self, **kwargs) -> types.GenerateContentConfig:
+        """Build the generation config for a single call
+        
+        Args:
+            **kwargs: Overrides (temperature, max_output_tokens,
+                response_mime_type, response_schema, cached_content)
             
-            self.logger.info(
-                "Vertex AI client initialized",
-                project=os.getenv("GOOGLE_CLOUD_PROJECT"),
-                region=os.getenv("GOOGLE_CLOUD_REGION")
+        Returns:
+            types.GenerateContentConfig: Config for generate_content
+        """
+        updates = {}
+        
+        if 'temperature' in kwargs:
+            updates['temperature'] = kwargs['temperature']
+        if 'max_output_tokens' in kwargs:
+            updates['max_output_tokens'] = kwargs['max_output_tokens']
+        
+        # Vertex AI rejects system_instruction alongside a caller's cached
+        # content, so _build_contents moves the instruction into the prompt
+        cached_content = kwargs.get('cached_content')
+        if cached_content:
+            updates['cached_content'] = cached_content
+            updates['system_instruction'] = None
+        
+        # Request JSON output directly when the caller asks for a schema other
+        # than the agent's own
+        if kwargs.get('response_schema') and kwargs['response_schema'] is not self.response_schema:
+            updates['response_mime_type'] = "application/json"
+            updates['response_schema'] = kwargs['response_schema']
+        elif kwargs.get('response_mime_type'):
+            updates['response_mime_type'] = kwargs['response_mime_type']
+        
+        if not updates:
+            return self._default_config
+        return self._default_config.model_copy(update=updates)
+    
+    def _response_cache_key(self, prompt: str, **kwargs) -> Optional[str]:
+        """Get the response cache key for a call, or None if it must not be cached
+        
+        Calls are cached unless use_cache=False is passed or the effective
+        temperature is above MAX_CACHEABLE_TEMPERATURE. Calls with a caller's
+        `cached_content` are never cached here: the cache name changes every
+        run, so such callers key a result cache on the content hash instead.
+        """
+        temperature = kwargs.get('temperature', self.temperature)
+        if not kwargs.get('use_cache', True) or temperature > MAX_CACHEABLE_TEMPERATURE:
+            return None
+        if kwargs.get('cached_content'):
+            return None
+        
+        schema = kwargs.get('response_schema') or self.response_schema
+        return make_cache_key(
+            self.model,
+            temperature,
+            kwargs.get('max_output_tokens', self.max_output_tokens),
+            getattr(schema, '__name__', schema),
+            self.system_instruction,
+            prompt
+        )
+    
+    def _is_cacheable_response(self, text: Optional[str], **kwargs) -> bool:
+        """Whether a response may be reused: it is non-empty and, when JSON
+        output was requested, parses (truncated or malformed JSON is not cached)"""
+        if not text:
+            return False
+        if not (kwargs.get('response_schema') or self.response_schema
+                or kwargs.get('response_mime_type') == "application/json"):
+            return True
+        try:
+            orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return False
+        return True
+    
+    def result_cache_key(self, *parts: Any) -> Optional[str]:
+        """Get the cache key for a parsed result derived from `parts`
+        
+        Returns None when the agent's temperature makes its output
+        non-idempotent, in which case results must not be cached.
+        """
+        if self.temperature > MAX_CACHEABLE_TEMPERATURE:
+            return None
+        return make_cache_key(
+            "result",
+            self.name,
+            self.model,
+            self.temperature,
+            self.system_instruction,
+            *parts
+        )
+    
+    async def get_cached_result(self, key: Optional[str]) -> Optional[Any]:
+        """Get a parsed result stored with cache_result, or None on a miss"""
+        if not key:
+            return None
+        
+        # The disk cache blocks, so keep it off the event loop
+        cached = await asyncio.to_thread(get_llm_cache().get, key)
+        if cached is None:
+            return None
+        
+        self.logger.info("Result cache hit")
+        return orjson.loads(cached)
+    
+    async def cache_result(self, key: Optional[str], result: Any) -> None:
+        """Store a successfully parsed result under `key`"""
+        if key:
+            await asyncio.to_thread(
+                get_llm_cache().set, key, orjson.dumps(result).decode(), expire=RESULT_CACHE_EXPIRE_SECONDS
             )
-            
-            return client
-            
-        except Exception as e:
-            self.logger.error(f"Failed to initialize Vertex AI client: {str(e)}")
-            raise
+    
+    def _build_contents(self, prompt: str, **kwargs) -> str:
+        """Build the request contents, inlining the system instruction when
+        the caller supplies its own cached content"""
+        if kwargs.get('cached_content') and self.system_instruction:
+            return f"{self.system_instruction}\n\n{prompt}"
+        return prompt
     
     async def run(
         self,
@@ -96,7 +305,8 @@ class BaseGeminiAgent:
         Args:
             prompt: Input prompt for the agent
             conversation_id: Optional conversation ID for A2A tracking
-            **kwargs: Additional parameters (temperature, max_tokens, etc.)
+            **kwargs: Additional parameters (temperature, max_output_tokens,
+                response_mime_type, response_schema, cached_content, use_cache)
         
         Returns:
             str: Agent's response
@@ -108,27 +318,31 @@ class BaseGeminiAgent:
             conversation_id=conversation_id
         )
         
-        self.performance.start_timer(f"{self.name}_execution")
+        # Serve idempotent (low-temperature) calls from the response cache
+        cache_key = self._response_cache_key(prompt, **kwargs)
+        if cache_key:
+            cached_response = await asyncio.to_thread(get_llm_cache().get, cache_key)
+            if cached_response is not None:
+                self.logger.info("Response cache hit", response_length=len(cached_response))
+                return cached_response
+        
+        t0 = time.perf_counter_ns()
         
         try:
-            # Prepare config
-            config = types.GenerateContentConfig(
-                temperature=kwargs.get('temperature', self.temperature),
-                max_output_tokens=kwargs.get('max_output_tokens', self.max_output_tokens)
-            )
-            
-            # Add system instruction if provided
-            if self.system_instruction:
-                config.system_instruction = self.system_instruction
+            config = await self._build_config(**kwargs)
             
-            # Generate content
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=config
+            # Generate content (native async surface, keeps the event loop free;
+            # the shared pool bounds concurrency and request rate)
+            response = await LLMPool.instance().submit(
+                self.client.aio.models.generate_content(
+                    model=self.model,
+                    contents=self._build_contents(prompt, **kwargs),
+                    config=config
+                )
             )
             
-            duration = self.performance.end_timer(f"{self.name}_execution")
+            duration = (time.perf_counter_ns() - t0) / 1e9
+            self.performance.record(self._timer_name, duration)
             
             self.logger.info(
                 "Agent completed successfully",
@@ -136,9 +350,9 @@ class BaseGeminiAgent:
                 response_length=len(response.text)
             )
             
-            # Send A2A notification if conversation_id provided
+            # Send A2A notification if conversation_id provided (off the critical path)
             if conversation_id:
-                await a2a_protocol.send_message(
+                self._send_notification(
                     sender_id=self.name,
                     sender_type="agent",
                     recipient_id="orchestrator",
@@ -151,16 +365,112 @@ class BaseGeminiAgent:
                     message_type="notification"
                 )
             
+            if cache_key and self._is_cacheable_response(response.text, **kwargs):
+                await asyncio.to_thread(get_llm_cache().set, cache_key, response.text)
+            
             return response.text
             
         except Exception as e:
-            duration = self.performance.end_timer(f"{self.name}_execution")
+            duration = (time.perf_counter_ns() - t0) / 1e9
+            self.performance.record(self._timer_name, duration)
             self.logger.error(
                 f"Agent execution failed: {str(e)}",
-                duration=f"{duration:.2f}s" if duration else "N/A"
+                duration=f"{duration:.2f}s"
             )
             raise
     
+    async def run_stream(
+        self,
+        prompt: str,
+        conversation_id: str = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Run the agent with a prompt, yielding the response as it is generated
+        
+        Args:
+            prompt: Input prompt for the agent
+            conversation_id: Optional conversation ID for A2A tracking
+            **kwargs: Additional parameters (same as run)
+        
+        Yields:
+            str: Chunks of the agent's response text
+        """
+        
+        self.logger.info(
+            f"Running agent (streaming)",
+            prompt_length=len(prompt),
+            conversation_id=conversation_id
+        )
+        
+        t0 = time.perf_counter_ns()
+        
+        try:
+            config = await self._build_config(**kwargs)
+            
+            response_length = 0
+            async with LLMPool.instance().slot():
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=self.model,
+                    contents=self._build_contents(prompt, **kwargs),
+                    config=config
+                )
+                async for chunk in stream:
+                    if chunk.text:
+                        response_length += len(chunk.text)
+                        yield chunk.text
+            
+            duration = (time.perf_counter_ns() - t0) / 1e9
+            self.performance.record(self._timer_name, duration)
+            
+            self.logger.info(
+                "Agent completed successfully",
+                duration=f"{duration:.2f}s",
+                response_length=response_length
+            )
+            
+            if conversation_id:
+                self._send_notification(
+                    sender_id=self.name,
+                    sender_type="agent",
+                    recipient_id="orchestrator",
+                    data={
+                        "status": "completed",
+                        "duration": duration,
+                        "response_length": response_length
+                    },
+                    conversation_id=conversation_id,
+                    message_type="notification"
+                )
+            
+        except Exception as e:
+            duration = (time.perf_counter_ns() - t0) / 1e9
+            self.performance.record(self._timer_name, duration)
+            self.logger.error(
+                f"Agent execution failed: {str(e)}",
+                duration=f"{duration:.2f}s"
+            )
+            raise
+    
+    def _send_notification(self, **message) -> asyncio.Task:
+        """Send an A2A message in the background without awaiting it
+        
+        Args:
+            **message: Arguments for a2a_protocol.send_message
+            
+        Returns:
+            asyncio.Task: The scheduled send
+        """
+        task = asyncio.create_task(a2a_protocol.send_message(**message))
+        self._pending_notifications.add(task)
+        task.add_done_callback(self._pending_notifications.discard)
+        return task
+    
+    async def drain(self) -> None:
+        """Wait for all in-flight A2A notifications to be sent (a failed send
+        is not re-raised)"""
+        if self._pending_notifications:
+            await asyncio.gather(*self._pending_notifications, return_exceptions=True)
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get agent performance statistics"""
         return {
@@ -173,8 +483,6 @@ class BaseGeminiAgent:
 
 # Example usage and testing
 if __name__ == "__main__":
-    import asyncio
-    
     async def test_base_agent():
         """Test the base agent class"""
         
@@ -4,18 +4,16 @@ Analyzes codebase architecture, patterns, and complexity to identify
 opportunities for coding challenges.
 """
 
-import json
-from typing import Dict, Any
+import orjson
+import functools
+from typing import Dict, Any, Final
 from agents.base_agent import BaseGeminiAgent
-from utils.a2a_protocol import a2a_protocol
+from agents.schemas import CodeAnalysisSchema
 from utils.json_parser import extract_json_from_response
+from utils.repo_serializer import get_repo_context
 
 
-class CodeAnalyzerAgent(BaseGeminiAgent):
-    """Analyzes code architecture and identifies problem opportunities"""
-    
-    def __init__(self):
-        system_instruction = """You are a senior software architect analyzing codebases.
+_SYSTEM_INSTRUCTION: Final[str] = """You are a senior software architect analyzing codebases.
 
 Your job is to analyze code architecture, patterns, and complexity to identify opportunities for coding challenges.
 
@@ -50,13 +48,19 @@ Return a JSON object with:
     "extensions": ["possible extensions"]
   }
 }"""
-        
+
+
+class CodeAnalyzerAgent(BaseGeminiAgent):
+    """Analyzes code architecture and identifies problem opportunities"""
+    
+    def __init__(self):
         super().__init__(
             name="code_analyzer",
             model="gemini-2.5-pro",  # Using Gemini 2.5 Pro
-            system_instruction=system_instruction,
+            system_instruction=_SYSTEM_INSTRUCTION,
             temperature=0.3,  # Lower temperature for more focused analysis
-            max_output_tokens=4096  # Increased for complete JSON responses
+            max_output_tokens=4096,  # Increased for complete JSON responses
+            response_schema=CodeAnalysisSchema
         )
     
     async def analyze(
@@ -76,7 +80,16 @@ Return a JSON object with:
         
         self.logger.info("Starting code analysis", conversation_id=conversation_id)
         
-        # Prepare analysis prompt
+        repo_context = get_repo_context(repo_data)
+        
+        # Unchanged repository data yields the same analysis, so reuse a
+        # previous one before building the prompt
+        cache_key = self.result_cache_key(repo_context['content_hash'])
+        cached_analysis = await self.get_cached_result(cache_key)
+        if cached_analysis is not None:
+            return cached_analysis
+        
+        # Prepare analysis prompt (JSON snippets are shared with the other analyzers)
         prompt = f"""Analyze this codebase:
 
 Repository: {repo_data.get('repository', {}).get('name', 'Unknown')}
@@ -84,20 +97,20 @@ Language: {repo_data.get('repository', {}).get('language', 'Unknown')}
 Description: {repo_data.get('repository', {}).get('description', 'No description')}
 
 File Structure:
-{json.dumps(repo_data.get('codebase', {}).get('file_tree', []), indent=2)[:500]}
+{repo_context['file_tree_json']}
 
 README:
 {repo_data.get('readme', 'No README')[:1000]}
 
 Dependencies:
-{json.dumps(repo_data.get('dependencies', []), indent=2)[:500]}
+{repo_context['deps_json'][:500]}
 
 Analyze the architecture, code quality, and identify opportunities for coding challenges.
 Return ONLY valid JSON matching the specified format."""
         
-        # Send A2A message - starting analysis
+        # Send A2A message - starting analysis (overlaps with the model call below)
         if conversation_id:
-            await a2a_protocol.send_message(
+            self._send_notification(
                 sender_id=self.name,
                 sender_type="analyzer",
                 recipient_id="orchestrator",
@@ -107,12 +120,15 @@ Return ONLY valid JSON matching the specified format."""
             )
         
         # Run analysis
-        response = await self.run(prompt, conversation_id=conversation_id)
+        # (raw responses are not cached; only successfully parsed analyses are)
+        response = await self.run(prompt, conversation_id=conversation_id, use_cache=False)
         
-        # Parse JSON response using robust parser
+        # Parse JSON response (schema-constrained; the robust parser still
+        # covers responses truncated at max_output_tokens)
         analysis = extract_json_from_response(response)
         
         if analysis and not analysis.get('parse_failed'):
+            await self.cache_result(cache_key, analysis)
             
             self.logger.info(
                 "Code analysis complete",
@@ -120,9 +136,9 @@ Return ONLY valid JSON matching the specified format."""
                 quality_score=analysis.get('code_quality', {}).get('score')
             )
             
-            # Send A2A message - analysis complete
+            # Send A2A message - analysis complete (sent in the background)
             if conversation_id:
-                await a2a_protocol.send_message(
+                self._send_notification(
                     sender_id=self.name,
                     sender_type="analyzer",
                     recipient_id="orchestrator",
@@ -165,8 +181,12 @@ Return ONLY valid JSON matching the specified format."""
             }
 
 
-# Create singleton instance
-code_analyzer = CodeAnalyzerAgent()
+# Singleton instance, created on first use so importing this module
+# does not construct a Vertex AI client
+@functools.cache
+def get_code_analyzer() -> CodeAnalyzerAgent:
+    """Get the shared CodeAnalyzerAgent instance"""
+    return CodeAnalyzerAgent()
 
 
 # Testing
@@ -218,14 +238,14 @@ A simple Flask web application for managing tasks.
         }
         
         # Run analysis
-        result = await code_analyzer.analyze(
+        result = await get_code_analyzer().analyze(
             repo_data=mock_repo_data,
             conversation_id="test_conv_001"
         )
         
         print("\n📊 Analysis Results:")
         print("=" * 60)
-        print(json.dumps(result, indent=2))
+        print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
         
         print("\n" + "=" * 60)
         print("✅ Code Analyzer test complete!")
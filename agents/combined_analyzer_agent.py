@@ -0,0 +1,277 @@
+"""Agents 3 & 5: Combined PR + Dependency Analyzer
+
+Runs the PR and dependency analyses in a single model call so both share one
+network round-trip and one prefill of the repository context.
+"""
+
+import asyncio
+import functools
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Any, Optional, Final
+from agents.base_agent import BaseGeminiAgent
+from agents.schemas import CombinedAnalysisSchema
+from utils.json_parser import extract_json_from_response
+from utils.repo_serializer import get_repo_context
+
+# Shared analyses kept for the PR and dependency analyzer wrappers (one per
+# recent conversation)
+SHARED_ANALYSES_SIZE = 8
+
+
+_SYSTEM_INSTRUCTION: Final[str] = """You are a software development analyst and technical architect.
+
+Your job is to analyze BOTH pull request patterns and the dependency / technology stack of a repository, and identify coding challenge opportunities.
+
+PR ANALYSIS FOCUS:
+1. **Development Patterns**: Common change types, workflows, collaboration patterns
+2. **Problem Areas**: Frequent changes to same files, recurring bugs or issues
+3. **Feature Insights**: Recent additions, in-progress work, feature development patterns
+
+DEPENDENCY ANALYSIS FOCUS:
+1. **Tech Stack**: Frameworks, libraries, tools, runtime environment
+2. **Dependency Health**: Outdated packages, vulnerabilities, maintenance status
+3. **Integration Opportunities**: Underutilized libraries, missing integrations, potential improvements
+
+CRITICAL REQUIREMENTS:
+- Identify realistic problems suitable for coding challenges
+- Focus on common patterns and widely-used technologies
+- Note both successful patterns and problematic areas
+
+OUTPUT FORMAT:
+Return a JSON object with:
+{
+  "pr_analysis": {
+    "patterns": {
+      "common_change_types": ["array of change types"],
+      "frequent_files": [{"path": "file/path", "change_count": number}],
+      "workflow_patterns": ["array of workflow observations"]
+    },
+    "insights": {
+      "recent_features": ["array of recent feature additions"],
+      "common_bugs": ["array of common bug types"],
+      "performance_improvements": ["array of performance-related changes"]
+    },
+    "suggested_problems": [
+      {
+        "title": "problem title",
+        "rationale": "why this would be a good problem",
+        "based_on_prs": ["pr ids or titles"]
+      }
+    ]
+  },
+  "dependency_analysis": {
+    "tech_stack": {
+      "frameworks": ["array of frameworks"],
+      "libraries": ["array of key libraries"],
+      "runtime": "runtime environment",
+      "build_tools": ["array of build tools"]
+    },
+    "dependency_health": {
+      "outdated": ["list of outdated dependencies"],
+      "vulnerable": ["list of vulnerable dependencies"],
+      "well_maintained": ["list of well-maintained dependencies"]
+    },
+    "integration_opportunities": [
+      {
+        "opportunity": "opportunity description",
+        "technologies": ["technologies involved"],
+        "difficulty": "easy|medium|hard",
+        "rationale": "why this would be a good problem"
+      }
+    ]
+  }
+}"""
+
+
+class CombinedAnalyzerAgent(BaseGeminiAgent):
+    """Analyzes pull request patterns and the tech stack in one request"""
+    
+    def __init__(self):
+        super().__init__(
+            name="combined_analyzer",
+            model="gemini-2.5-flash",
+            system_instruction=_SYSTEM_INSTRUCTION,
+            temperature=0.3,
+            max_output_tokens=8192,
+            response_schema=CombinedAnalysisSchema
+        )
+        self._shared: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+    
+    async def analyze(
+        self,
+        repo_data: Dict[str, Any],
+        conversation_id: str = None,
+        repo_cache: Optional[Callable[[], Awaitable[Optional[str]]]] = None
+    ) -> Dict[str, Any]:
+        """Analyze pull request patterns and dependencies together
+        
+        Args:
+            repo_data: Repository data including PRs and dependencies
+            conversation_id: Optional conversation ID for A2A tracking
+            repo_cache: Optional function returning the name of a context
+                cache holding the repository summary (creating it on first use)
+        
+        Returns:
+            Dictionary with 'pr_analysis' and 'dependency_analysis' results
+        """
+        
+        self.logger.info("Starting combined PR + dependency analysis", conversation_id=conversation_id)
+        
+        # Prepare analysis prompt (serialization shared with the other analyzers)
+        repo_context = get_repo_context(repo_data)
+        
+        # Unchanged repository data yields the same analysis, so reuse a
+        # previous one before building the prompt or the shared context cache
+        cache_key = self.result_cache_key(repo_context['content_hash'])
+        cached_analysis = await self.get_cached_result(cache_key)
+        if cached_analysis is not None:
+            return cached_analysis
+        
+        cache_name = await repo_cache() if repo_cache else None
+        
+        if cache_name:
+            # Repository header, dependencies and README live in the shared cache
+            prompt = f"""Using the repository context above, analyze the pull requests and the tech stack of this repository:
+
+Recent Pull Requests:
+{repo_context['prs_json']}
+
+Analyze the PR patterns and development workflows, the technology stack and dependency health, and identify opportunities for coding challenges.
+Return ONLY valid JSON matching the specified format."""
+        else:
+            prompt = f"""Analyze the pull requests and the tech stack of this repository:
+
+Repository: {repo_context['repo_name']}
+Primary Language: {repo_context['language']}
+
+Recent Pull Requests:
+{repo_context['prs_json']}
+
+Dependencies:
+{repo_context['deps_json']}
+
+README (for context):
+{repo_context['readme_excerpt']}
+
+Analyze the PR patterns and development workflows, the technology stack and dependency health, and identify opportunities for coding challenges.
+Return ONLY valid JSON matching the specified format."""
+        
+        # Send A2A notification (overlaps with the model call below)
+        if conversation_id:
+            self._send_notification(
+                sender_id=self.name,
+                sender_type="analyzer",
+                recipient_id="orchestrator",
+                data={"status": "analyzing", "target": ["pr_patterns", "dependencies"]},
+                conversation_id=conversation_id,
+                message_type="notification"
+            )
+        
+        # Run analysis (single round-trip for both analyses)
+        response = await self.run(
+            prompt,
+            conversation_id=conversation_id,
+            cached_content=cache_name,
+            use_cache=False
+        )
+        
+        # Parse JSON response (schema-constrained; the robust parser still
+        # covers responses truncated at max_output_tokens)
+        analysis = extract_json_from_response(response)
+        
+        if analysis and not analysis.get('parse_failed'):
+            pr_analysis = analysis.get('pr_analysis') or self._default_pr_analysis("Missing pr_analysis section")
+            dependency_analysis = analysis.get('dependency_analysis') or self._default_dependency_analysis("Missing dependency_analysis section")
+            
+            self.logger.info(
+                "Combined analysis complete",
+                patterns_found=len(pr_analysis.get('patterns', {}).get('common_change_types', [])),
+                frameworks=len(dependency_analysis.get('tech_stack', {}).get('frameworks', []))
+            )
+            
+            # Send A2A response (sent in the background)
+            if conversation_id:
+                self._send_notification(
+                    sender_id=self.name,
+                    sender_type="analyzer",
+                    recipient_id="orchestrator",
+                    data={
+                        "status": "completed",
+                        "analysis_type": ["pr_patterns", "dependencies"],
+                        "summary": {
+                            "patterns": len(pr_analysis.get('patterns', {}).get('common_change_types', [])),
+                            "suggested_problems": len(pr_analysis.get('suggested_problems', [])),
+                            "frameworks": dependency_analysis.get('tech_stack', {}).get('frameworks', []),
+                            "opportunities": len(dependency_analysis.get('integration_opportunities', []))
+                        }
+                    },
+                    conversation_id=conversation_id,
+                    message_type="response"
+                )
+            
+            result = {
+                "pr_analysis": pr_analysis,
+                "dependency_analysis": dependency_analysis
+            }
+            await self.cache_result(cache_key, result)
+            return result
+        else:
+            error_msg = analysis.get('error', 'Unknown parsing error') if analysis else 'Failed to extract JSON'
+            self.logger.error(f"Failed to parse JSON response: {error_msg}")
+            return {
+                "pr_analysis": self._default_pr_analysis(error_msg),
+                "dependency_analysis": self._default_dependency_analysis(error_msg)
+            }
+    
+    async def analyze_shared(self, repo_data: Dict[str, Any], conversation_id: str = None) -> Dict[str, Any]:
+        """Analyze once per conversation
+        
+        Concurrent and repeated calls with the same conversation ID await the
+        same analysis, so the PR and dependency halves cost one model call.
+        """
+        if not conversation_id:
+            return await self.analyze(repo_data)
+        
+        shared = self._shared.get(conversation_id)
+        if shared is None or not self._reusable(shared):
+            shared = self._shared[conversation_id] = asyncio.ensure_future(self.analyze(repo_data, conversation_id))
+            if len(self._shared) > SHARED_ANALYSES_SIZE:
+                self._shared.popitem(last=False)
+        self._shared.move_to_end(conversation_id)
+        return await asyncio.shield(shared)
+    
+    @staticmethod
+    def _reusable(shared: asyncio.Future) -> bool:
+        """Whether a shared analysis can be awaited again: it succeeded, or it
+        is still running on this event loop"""
+        if shared.done():
+            return not shared.cancelled() and shared.exception() is None
+        return shared.get_loop() is asyncio.get_running_loop()
+    
+    @staticmethod
+    def _default_pr_analysis(error_msg: str) -> Dict[str, Any]:
+        """Empty PR analysis returned when the model output is unusable"""
+        return {
+            "patterns": {"common_change_types": [], "frequent_files": [], "workflow_patterns": []},
+            "insights": {"recent_features": [], "common_bugs": [], "performance_improvements": []},
+            "suggested_problems": [],
+            "error": error_msg
+        }
+    
+    @staticmethod
+    def _default_dependency_analysis(error_msg: str) -> Dict[str, Any]:
+        """Empty dependency analysis returned when the model output is unusable"""
+        return {
+            "tech_stack": {"frameworks": [], "libraries": [], "runtime": "Unknown", "build_tools": []},
+            "dependency_health": {"outdated": [], "vulnerable": [], "well_maintained": []},
+            "integration_opportunities": [],
+            "error": error_msg
+        }
+
+
+# Singleton instance, created on first use so importing this module
+# does not construct a Vertex AI client
+@functools.cache
+def get_combined_analyzer() -> CombinedAnalyzerAgent:
+    """Get the shared CombinedAnalyzerAgent instance"""
+    return CombinedAnalyzerAgent()
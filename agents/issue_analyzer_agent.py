@@ -4,18 +4,15 @@ Extracts problem patterns and feature requests from issues to identify
 coding challenge opportunities.
 """
 
-import json
-from typing import Dict, Any
+import functools
+from typing import Awaitable, Callable, Dict, Any, Optional, Final
 from agents.base_agent import BaseGeminiAgent
-from utils.a2a_protocol import a2a_protocol
+from agents.schemas import IssueAnalysisSchema
 from utils.json_parser import extract_json_from_response
+from utils.repo_serializer import get_repo_context
 
 
-class IssueAnalyzerAgent(BaseGeminiAgent):
-    """Analyzes issue patterns and feature requests"""
-    
-    def __init__(self):
-        system_instruction = """You are a product analyst specializing in issue tracking analysis.
+_SYSTEM_INSTRUCTION: Final[str] = """You are a product analyst specializing in issue tracking analysis.
 
 Your job is to analyze issues to identify problem patterns, feature requests, and coding challenge opportunities.
 
@@ -52,25 +49,34 @@ Return a JSON object with:
     }
   ]
 }"""
-        
+
+
+class IssueAnalyzerAgent(BaseGeminiAgent):
+    """Analyzes issue patterns and feature requests"""
+    
+    def __init__(self):
         super().__init__(
             name="issue_analyzer",
             model="gemini-2.5-flash",
-            system_instruction=system_instruction,
+            system_instruction=_SYSTEM_INSTRUCTION,
             temperature=0.4,
-            max_output_tokens=4096
+            max_output_tokens=4096,
+            response_schema=IssueAnalysisSchema
         )
     
     async def analyze(
         self,
         repo_data: Dict[str, Any],
-        conversation_id: str = None
+        conversation_id: str = None,
+        repo_cache: Optional[Callable[[], Awaitable[Optional[str]]]] = None
     ) -> Dict[str, Any]:
         """Analyze issue patterns
         
         Args:
             repo_data: Repository data including issues
             conversation_id: Optional conversation ID for A2A tracking
+            repo_cache: Optional function returning the name of a context
+                cache holding the repository summary (creating it on first use)
             
         Returns:
             Issue analysis results as dictionary
@@ -78,22 +84,35 @@ Return a JSON object with:
         
         self.logger.info("Starting issue analysis", conversation_id=conversation_id)
         
+        repo_context = get_repo_context(repo_data)
+        
+        # Unchanged repository data yields the same analysis, so reuse a
+        # previous one before building the prompt (the cache name is not part
+        # of the key: it changes every run but only relocates the repo header)
+        cache_key = self.result_cache_key(repo_context['content_hash'])
+        cached_analysis = await self.get_cached_result(cache_key)
+        if cached_analysis is not None:
+            return cached_analysis
+        
+        cache_name = await repo_cache() if repo_cache else None
+        
         # Prepare analysis prompt
-        issues_summary = json.dumps(repo_data.get('issues', [])[:15], indent=2)[:2000]
+        issues_summary = repo_context['issues_json']
+        
+        # Repository header lives in the shared cache when one is provided
+        repo_header = "" if cache_name else f"Repository: {repo_data.get('repository', {}).get('name', 'Unknown')}\n\n"
         
         prompt = f"""Analyze these GitHub issues:
 
-Repository: {repo_data.get('repository', {}).get('name', 'Unknown')}
-
-Recent Issues:
+{repo_header}Recent Issues:
 {issues_summary}
 
 Analyze the issue patterns, feature requests, and identify opportunities for coding challenges.
 Return ONLY valid JSON matching the specified format."""
         
-        # Send A2A notification
+        # Send A2A notification (overlaps with the model call below)
         if conversation_id:
-            await a2a_protocol.send_message(
+            self._send_notification(
                 sender_id=self.name,
                 sender_type="analyzer",
                 recipient_id="orchestrator",
@@ -103,21 +122,35 @@ Return ONLY valid JSON matching the specified format."""
             )
         
         # Run analysis
-        response = await self.run(prompt, conversation_id=conversation_id)
+        response = await self.run(
+            prompt,
+            conversation_id=conversation_id,
+            cached_content=cache_name,
+            use_cache=False
+        )
         
-        # Parse JSON response using robust parser
+        # Parse JSON response (schema-constrained; the robust parser still
+        # covers responses truncated at max_output_tokens)
         analysis = extract_json_from_response(response)
         
         if analysis and not analysis.get('parse_failed'):
+            await self.cache_result(cache_key, analysis)
             
             self.logger.info(
                 "Issue analysis complete",
                 suggested_problems=len(analysis.get('suggested_problems', []))
             )
             
-            # Send A2A response
+            # Send A2A response (sent in the background)
             if conversation_id:
-                await a2a_protocol.send_message(
+                # The schema fixes the category names, so sum them directly
+                categories = analysis.get('categories') or {}
+                total_issues = (
+                    (categories.get('bugs') or {}).get('count', 0)
+                    + (categories.get('features') or {}).get('count', 0)
+                    + (categories.get('enhancements') or {}).get('count', 0)
+                )
+                self._send_notification(
                     sender_id=self.name,
                     sender_type="analyzer",
                     recipient_id="orchestrator",
@@ -125,7 +158,7 @@ Return ONLY valid JSON matching the specified format."""
                         "status": "completed",
                         "analysis_type": "issue_patterns",
                         "summary": {
-                            "total_issues": sum(c.get('count', 0) for c in analysis.get('categories', {}).values() if isinstance(c, dict)),
+                            "total_issues": total_issues,
                             "suggested_problems": len(analysis.get('suggested_problems', []))
                         }
                     },
@@ -146,5 +179,9 @@ Return ONLY valid JSON matching the specified format."""
             }
 
 
-# Create singleton instance
-issue_analyzer = IssueAnalyzerAgent()
+# Singleton instance, created on first use so importing this module
+# does not construct a Vertex AI client
+@functools.cache
+def get_issue_analyzer() -> IssueAnalyzerAgent:
+    """Get the shared IssueAnalyzerAgent instance"""
+    return IssueAnalyzerAgent()
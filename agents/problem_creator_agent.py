@@ -4,18 +4,20 @@ Creates detailed, implementable coding problems based on repository analysis.
 This is the core agent that generates the actual assessment.
 """
 
-import json
-from typing import Dict, Any
+import functools
+import io
+import orjson
+from typing import Dict, Any, Final
 from agents.base_agent import BaseGeminiAgent
-from utils.a2a_protocol import a2a_protocol
+from agents.schemas import ProblemSchema
 from utils.json_parser import extract_json_from_response
 
+# Generation progress is reported to A2A subscribers once per this many
+# received characters (the text itself is not forwarded)
+PROGRESS_INTERVAL_CHARS = 4096
 
-class ProblemCreatorAgent(BaseGeminiAgent):
-    """Generates coding assessment problems"""
-    
-    def __init__(self):
-        system_instruction = """You are an expert technical interviewer and assessment creator.
+
+_SYSTEM_INSTRUCTION: Final[str] = """You are an expert technical interviewer and assessment creator.
 
 Your job is to create REALISTIC, IMPLEMENTABLE coding assessments that test relevant skills for the given codebase.
 
@@ -83,13 +85,19 @@ Return a JSON object with:
     }
   ]
 }"""
-        
+
+
+class ProblemCreatorAgent(BaseGeminiAgent):
+    """Generates coding assessment problems"""
+    
+    def __init__(self):
         super().__init__(
             name="problem_creator",
             model="gemini-2.5-flash",  # Using Gemini 2.5 flash
-            system_instruction=system_instruction,
+            system_instruction=_SYSTEM_INSTRUCTION,
             temperature=0.7,  # Higher temperature for creativity
-            max_output_tokens=8192  # Increased for complete problem generation
+            max_output_tokens=8192,  # Increased for complete problem generation
+            response_schema=ProblemSchema
         )
     
     async def create_problem(
@@ -129,22 +137,23 @@ Return a JSON object with:
             validation_feedback = improvement_context.get('validation_feedback', {})
             issues = validation_feedback.get('issues', [])
             suggestions = validation_feedback.get('suggestions', [])
+            strengths = (validation_feedback.get('feedback') or {}).get('strengths', [])
             
             self.logger.info("Refinement mode: improving existing problem with minimal changes")
             
             prompt = f"""TASK: Refine this coding problem based on QA feedback. Make ONLY MINIMAL improvements.
 
 ORIGINAL PROBLEM (Keep this as the base):
-{json.dumps(original_problem, indent=2)}
+{orjson.dumps(original_problem).decode()}
 
 QA FEEDBACK:
 Score: {validation_feedback.get('overall_score', 0)}/100
 
-Issues: {json.dumps(issues, indent=2) if issues else 'None - problem is generally good'}
+Issues: {orjson.dumps(issues).decode() if issues else 'None - problem is generally good'}
 
-Suggestions: {json.dumps(suggestions, indent=2) if suggestions else 'None - minor polish only'}
+Suggestions: {orjson.dumps(suggestions).decode() if suggestions else 'None - minor polish only'}
 
-Strengths to Preserve: {json.dumps(validation_feedback.get('feedback', {}).get('strengths', []), indent=2)}
+Strengths to Preserve: {orjson.dumps(strengths).decode()}
 
 REFINEMENT RULES:
 1. Keep EXACT same title, description, and tech stack
@@ -156,15 +165,23 @@ REFINEMENT RULES:
 Return the refined problem as JSON."""
         else:
             # CREATION MODE: Create brand new problem
-            repo_profile = repository_report.get('repository_profile', {})
-            tech_stack = repository_report.get('dependency_analysis', {}).get('tech_stack', {})
+            # Bind the nested report sections once for the prompt below
+            repo_profile = repository_report.get('repository_profile') or {}
+            tech_stack = (repository_report.get('dependency_analysis') or {}).get('tech_stack') or {}
+            code_analysis = repository_report.get('code_analysis') or {}
+            architecture = code_analysis.get('architecture') or {}
+            quality = code_analysis.get('code_quality') or {}
+            frameworks = tech_stack.get('frameworks', [])
+            libraries = tech_stack.get('libraries', [])
+            repo_name = repo_profile.get('name', 'Unknown')
+            features = (repository_report.get('opportunities') or {}).get('features', [])
             
             prompt = f"""Create a {difficulty} {problem_type} coding assessment for THIS SPECIFIC REPOSITORY:
 
 CRITICAL: This problem MUST be about THIS repository, not a generic problem!
 
 REPOSITORY DETAILS:
-Name: {repo_profile.get('name', 'Unknown')}
+Name: {repo_name}
 Description: {repo_profile.get('description', 'N/A')[:200]}
 Primary Language: {repo_profile.get('language', 'Unknown')}
 
@@ -172,36 +189,36 @@ README Summary:
 {repository_report.get('readme_summary', 'N/A')[:400]}
 
 TECH STACK (USE THESE EXACT TECHNOLOGIES):
-Frameworks: {json.dumps(tech_stack.get('frameworks', []))}
-Libraries: {json.dumps(tech_stack.get('libraries', [])[:8])}
+Frameworks: {orjson.dumps(frameworks).decode()}
+Libraries: {orjson.dumps(libraries[:8]).decode()}
 Runtime: {tech_stack.get('runtime', 'Unknown')}
 
 ARCHITECTURE:
-Pattern: {repository_report.get('code_analysis', {}).get('architecture', {}).get('pattern', 'Unknown')}
-Complexity: {repository_report.get('code_analysis', {}).get('architecture', {}).get('complexity', 'unknown')}
+Pattern: {architecture.get('pattern', 'Unknown')}
+Complexity: {architecture.get('complexity', 'unknown')}
 
 CODE QUALITY (Current State):
-Score: {repository_report.get('code_analysis', {}).get('code_quality', {}).get('score', 0)}/100
-Weaknesses: {json.dumps(repository_report.get('code_analysis', {}).get('code_quality', {}).get('weaknesses', [])[:3])}
+Score: {quality.get('score', 0)}/100
+Weaknesses: {orjson.dumps(quality.get('weaknesses', [])[:3]).decode()}
 
 IMPROVEMENT OPPORTUNITIES:
-{json.dumps(repository_report.get('opportunities', {}).get('features', [])[:3], indent=2)}
+{orjson.dumps(features[:3]).decode()}
 
 REQUIREMENTS:
-1. Problem MUST use the repository's actual tech stack: {', '.join(tech_stack.get('frameworks', []) + tech_stack.get('libraries', [])[:5])}
+1. Problem MUST use the repository's actual tech stack: {', '.join(frameworks + libraries[:5])}
 2. Problem MUST address weaknesses or opportunities identified above
 3. Problem MUST be implementable within {focus_area or f'{240} minutes'}
 4. NO generic problems (no To-Do apps, no unrelated topics)
-5. Use repository name "{repo_profile.get('name', 'Unknown')}" as context
+5. Use repository name "{repo_name}" as context
 
 Difficulty: {difficulty}
 Problem Type: {problem_type}
 
 Return ONLY valid JSON matching the specified format."""
         
-        # Send A2A notification
+        # Send A2A notification (overlaps with the model call below)
         if conversation_id:
-            await a2a_protocol.send_message(
+            self._send_notification(
                 sender_id=self.name,
                 sender_type="creator",
                 recipient_id="orchestrator",
@@ -210,10 +227,31 @@ Return ONLY valid JSON matching the specified format."""
                 message_type="notification"
             )
         
-        # Generate problem
-        response = await self.run(prompt, conversation_id=conversation_id)
+        # Generate problem, streaming so consumers can follow progress
+        buffer = io.StringIO()
+        next_progress = PROGRESS_INTERVAL_CHARS
+        async for text in self.run_stream(
+            prompt,
+            conversation_id=conversation_id
+        ):
+            buffer.write(text)
+            
+            # Report progress to A2A subscribers every few KB, not per chunk
+            if conversation_id and buffer.tell() >= next_progress:
+                next_progress = buffer.tell() + PROGRESS_INTERVAL_CHARS
+                self._send_notification(
+                    sender_id=self.name,
+                    sender_type="creator",
+                    recipient_id="orchestrator",
+                    data={"status": "generating", "received_chars": buffer.tell()},
+                    conversation_id=conversation_id,
+                    message_type="partial"
+                )
+        
+        response = buffer.getvalue()
         
-        # Parse JSON response using robust parser
+        # Parse JSON response (schema-constrained; the robust parser still
+        # covers responses truncated at max_output_tokens)
         problem = extract_json_from_response(response)
         
         if problem and not problem.get('parse_failed'):
@@ -224,9 +262,9 @@ Return ONLY valid JSON matching the specified format."""
                 difficulty=problem.get('difficulty')
             )
             
-            # Send A2A response
+            # Send A2A response (sent in the background)
             if conversation_id:
-                await a2a_protocol.send_message(
+                self._send_notification(
                     sender_id=self.name,
                     sender_type="creator",
                     recipient_id="qa_validator",
@@ -254,5 +292,9 @@ Return ONLY valid JSON matching the specified format."""
             }
 
 
-# Create singleton instance
-problem_creator = ProblemCreatorAgent()
+# Singleton instance, created on first use so importing this module
+# does not construct a Vertex AI client
+@functools.cache
+def get_problem_creator() -> ProblemCreatorAgent:
+    """Get the shared ProblemCreatorAgent instance"""
+    return ProblemCreatorAgent()
@@ -4,96 +4,132 @@ Validates problem quality and ensures feasibility through rigorous scoring
 across multiple dimensions.
 """
 
-import json
-from typing import Dict, Any, Tuple
+import functools
+from dataclasses import dataclass
+from typing import Dict, Any, Tuple, List, Optional, Final
 from agents.base_agent import BaseGeminiAgent
-from utils.a2a_protocol import a2a_protocol
+from agents.schemas import ValidationSchema
 from utils.json_parser import extract_json_from_response
+from utils.llm_pool import LLMPool
+from utils.semantic_cache import SemanticCache
 
+# Embeds problems for the near-match validation cache
+EMBEDDING_MODEL = "text-embedding-004"
 
-class QAValidatorAgent(BaseGeminiAgent):
-    """Validates and improves coding assessment quality"""
-    
-    def __init__(self, quality_threshold: int = 85):
-        system_instruction = """You are a strict quality assurance reviewer for coding assessments.
-
-Your job is to validate assessments on 4 critical dimensions and provide detailed feedback.
-
-VALIDATION DIMENSIONS:
-
-1. **Feasibility (0-100)**:
-   - Can be completed in stated time limit
-   - All required context is provided
-   - No private repository access needed
-   - Starter code is functional
-   - Dependencies are accessible
-
-2. **Quality (0-100)**:
-   - Problem statement is clear and unambiguous
-   - Requirements are specific and testable
-   - Acceptance criteria are objective
-   - Hints are appropriate (helpful but not solutions)
-   - Business context is realistic
-
-3. **Technical (0-100)**:
-   - Uses repository's actual tech stack
-   - Code patterns match repository style
-   - Complexity matches stated difficulty level
-   - Code examples are correct
-   - APIs/interfaces are well-defined
-
-4. **Educational (0-100)**:
-   - Tests relevant skills for the codebase
-   - Difficulty is appropriate
-   - Learning objectives are clear
-   - Problem is non-trivial
-   - Solution approach is not obvious
-
-CRITICAL REQUIREMENTS:
-- Be STRICT - only approve high-quality problems
-- Provide SPECIFIC, ACTIONABLE feedback
-- If overall score < 85, suggest concrete improvements
-- Focus on what makes the problem realistic and valuable
+_SYSTEM_INSTRUCTION: Final[str] = """You are a strict quality assurance reviewer for coding assessments.
+
+Score each assessment on 4 dimensions (0-100):
+
+1. **Feasibility**: completable in the stated time limit; all required context provided; no private repository access needed; starter code functional; dependencies accessible
+2. **Quality**: clear, unambiguous problem statement; specific, testable requirements; objective acceptance criteria; hints helpful but not solutions; realistic business context
+3. **Technical**: uses the repository's actual tech stack and code patterns; complexity matches the stated difficulty; correct code examples; well-defined APIs/interfaces
+4. **Educational**: tests skills relevant to the codebase; appropriate, non-trivial difficulty; clear learning objectives; solution approach not obvious
+
+Approve only high-quality problems. Make every issue and suggestion specific and actionable, and suggest concrete improvements whenever the overall score is below 85.
 
 OUTPUT FORMAT:
-You MUST return ONLY a valid JSON object - NO markdown, NO code blocks, NO extra text.
-Ensure ALL JSON is complete with proper closing brackets.
-Return ONLY this JSON structure:
+Return one complete JSON object:
 {
   "is_approved": true/false,
   "overall_score": 0-100,
-  "scores": {
-    "feasibility": 0-100,
-    "quality": 0-100,
-    "technical": 0-100,
-    "educational": 0-100
-  },
-  "issues": [
-    "Specific issue 1",
-    "Specific issue 2",
-    ...
-  ],
-  "suggestions": [
-    "Specific improvement 1",
-    "Specific improvement 2",
-    ...
-  ],
-  "feedback": {
-    "strengths": ["strength 1", "strength 2"],
-    "weaknesses": ["weakness 1", "weakness 2"],
-    "improvements": ["improvement 1", "improvement 2"]
-  }
+  "scores": {"feasibility": 0-100, "quality": 0-100, "technical": 0-100, "educational": 0-100},
+  "issues": ["specific issue"],
+  "suggestions": ["specific improvement"],
+  "feedback": {"strengths": ["strength"], "weaknesses": ["weakness"], "improvements": ["improvement"]}
 }"""
-        
+
+# Scoring calibration appended to every validation prompt
+_EVALUATION_GUIDE: Final[str] = """INSTRUCTIONS:
+- Be FAIR in scoring - a well-structured problem should score 70-85
+- Provide 2-3 specific issues if score < 85
+- Provide 2-3 actionable suggestions for improvement
+- Keep feedback concise (under 100 chars each)"""
+
+
+@dataclass(frozen=True, slots=True)
+class ProblemView:
+    """The problem fields the validator scores, extracted once per problem"""
+    title: str
+    short_description: str
+    tech_stack: Any
+    difficulty: str
+    requirement_count: int
+    criteria_count: int
+    starter_file_count: int
+    
+    @classmethod
+    def from_dict(cls, problem: Dict[str, Any]) -> "ProblemView":
+        return cls(
+            title=problem.get('title', 'N/A'),
+            short_description=problem.get('description', 'N/A')[:300],
+            tech_stack=problem.get('tech_stack', []),
+            difficulty=problem.get('difficulty', 'N/A'),
+            requirement_count=len(problem.get('requirements', [])),
+            criteria_count=len(problem.get('acceptance_criteria', [])),
+            starter_file_count=len(problem.get('starter_code', []))
+        )
+    
+    def describe(self) -> str:
+        """Summarize the problem for a validation prompt"""
+        return f"""Title: {self.title}
+Description: {self.short_description}...
+Tech Stack: {self.tech_stack}
+Difficulty: {self.difficulty}
+Requirements: {self.requirement_count} requirements
+Acceptance Criteria: {self.criteria_count} criteria
+Starter Code: {self.starter_file_count} files"""
+
+
+class QAValidatorAgent(BaseGeminiAgent):
+    """Validates and improves coding assessment quality"""
+    
+    def __init__(self, quality_threshold: int = 85):
         super().__init__(
             name="qa_validator",
             model="gemini-2.5-flash",  # Using stable experimental model
-            system_instruction=system_instruction,
+            system_instruction=_SYSTEM_INSTRUCTION,
             temperature=0.3,  # Slightly higher for better JSON generation
-            max_output_tokens=8192  # Increased for complete validation output
+            max_output_tokens=2048,  # Schema-enforced output needs no slack
+            response_schema=ValidationSchema
         )
         
         self.quality_threshold = quality_threshold
+        
+        # Problems that differ only in wording reuse an earlier verdict. The
+        # cache is in memory, so it only pays for its embeddings call in a
+        # long-lived process (see enable_semantic_cache)
+        self.semantic_cache: Optional[SemanticCache] = None
+    
+    def enable_semantic_cache(self) -> None:
+        """Reuse verdicts for near-duplicate problems (for long-lived servers)"""
+        if self.semantic_cache is None:
+            self.semantic_cache = SemanticCache()
+    
+    async def _embed_text(self, text: str) -> List[float]:
+        """Embed one text"""
+        response = await LLMPool.instance().submit(
+            self.client.aio.models.embed_content(model=EMBEDDING_MODEL, contents=text)
+        )
+        return response.embeddings[0].values
+    
+    async def _embed_problem(self, problem: Dict[str, Any], tech_stack: Any) -> Optional[List[float]]:
+        """Embed the fields that determine a problem's verdict
+        
+        Returns:
+            Embedding vector, or None if embedding failed
+        """
+        text = "\n".join([
+            str(problem.get('title', '')),
+            str(problem.get('description', '')),
+            str(problem.get('requirements', [])),
+            str(tech_stack)
+        ])
+        
+        try:
+            return await self._embed_text(text)
+        except Exception as e:
+            self.logger.warning(f"Problem embedding failed, skipping semantic cache: {str(e)}")
+            return None
     
     async def validate_problem(
         self,
@@ -118,57 +154,63 @@ Return ONLY this JSON structure:
             conversation_id=conversation_id
         )
         
-        # Prepare validation prompt with full problem details
-        problem_json = json.dumps(problem, indent=2)
+        # Structurally incomplete problems cannot pass, so reject them
+        # without a model call
+        missing = [
+            label
+            for field, label in (
+                ('requirements', "requirements"),
+                ('acceptance_criteria', "acceptance criteria"),
+                ('starter_code', "starter code")
+            )
+            if not problem.get(field)
+        ]
+        if missing:
+            self.logger.info("Validation rejected before model call", missing=", ".join(missing))
+            issues = [f"Problem has no {label}" for label in missing]
+            return False, {
+                "is_approved": False,
+                "overall_score": 0,
+                "scores": {"feasibility": 0, "quality": 0, "technical": 0, "educational": 0},
+                "issues": issues,
+                "suggestions": [f"Add {label}" for label in missing],
+                "feedback": {"strengths": [], "weaknesses": issues, "improvements": []}
+            }
+        
+        # Prepare validation prompt; the repository's tech stack is what the
+        # technical score is judged against
         tech_stack = repository_report.get('repository_profile', {}).get('tech_stack', problem.get('tech_stack', []))
         
-        prompt = f"""Validate this coding assessment and return ONLY valid JSON.
+        prompt = f"""Validate this coding assessment.
 
 PROBLEM:
-Title: {problem.get('title', 'N/A')}
-Description: {problem.get('description', 'N/A')[:300]}...
-Tech Stack: {problem.get('tech_stack', [])}
-Difficulty: {problem.get('difficulty', 'N/A')}
-Requirements: {len(problem.get('requirements', []))} requirements
-Acceptance Criteria: {len(problem.get('acceptance_criteria', []))} criteria
-Starter Code: {len(problem.get('starter_code', []))} files
-
-EVALUATION DIMENSIONS:
-1. Feasibility (0-100): Can it be completed in the time limit? Is context sufficient?
-2. Quality (0-100): Are requirements clear and testable?
-3. Technical (0-100): Does it match the repository's tech stack and patterns?
-4. Educational (0-100): Is it realistic and valuable for assessing skills?
-
-INSTRUCTIONS:
-- Be FAIR in scoring - a well-structured problem should score 70-85
-- Provide 2-3 specific issues if score < 85
-- Provide 2-3 actionable suggestions for improvement
-- Keep feedback concise (under 100 chars each)
-
-OUTPUT FORMAT - Return ONLY this JSON structure (no markdown, no code blocks):
-{{
-  "is_approved": false,
-  "overall_score": 75,
-  "scores": {{
-    "feasibility": 80,
-    "quality": 75,
-    "technical": 70,
-    "educational": 75
-  }},
-  "issues": ["Issue 1", "Issue 2"],
-  "suggestions": ["Suggestion 1", "Suggestion 2"],
-  "feedback": {{
-    "strengths": ["Strength 1", "Strength 2"],
-    "weaknesses": ["Weakness 1"],
-    "improvements": ["Improvement 1"]
-  }}
-}}
-
-Now return ONLY the JSON for this problem:"""
-        
-        # Send A2A notification
+{ProblemView.from_dict(problem).describe()}
+
+REPOSITORY TECH STACK:
+{tech_stack}
+
+{_EVALUATION_GUIDE}"""
+        
+        # Identical problems get the same verdict, so reuse a previous one
+        cache_key = self.result_cache_key(self.quality_threshold, prompt)
+        cached_validation = await self.get_cached_result(cache_key)
+        if cached_validation is not None:
+            return cached_validation['is_approved'], cached_validation
+        
+        embedding = None
+        if self.semantic_cache is not None:
+            embedding = await self._embed_problem(problem, tech_stack)
+        if embedding is not None:
+            cached_validation = self.semantic_cache.get(embedding)
+            if cached_validation is not None:
+                self.logger.info("Semantic cache hit", title=problem.get('title', 'Unknown'))
+                # The verdict may have been stored under another threshold
+                is_approved = cached_validation.get('overall_score', 0) >= self.quality_threshold
+                return is_approved, {**cached_validation, 'is_approved': is_approved}
+        
+        # Send A2A notification (overlaps with the model call below)
         if conversation_id:
-            await a2a_protocol.send_message(
+            self._send_notification(
                 sender_id=self.name,
                 sender_type="validator",
                 recipient_id="orchestrator",
@@ -178,12 +220,13 @@ Now return ONLY the JSON for this problem:"""
             )
         
         # Run validation
-        response = await self.run(prompt, conversation_id=conversation_id)
+        response = await self.run(prompt, conversation_id=conversation_id, use_cache=False)
         
         # Log response for debugging
         self.logger.info(f"QA Validator response length: {len(response)} characters")
         
-        # Parse JSON response using robust parser
+        # Parse JSON response (schema-constrained; the robust parser still
+        # covers responses truncated at max_output_tokens)
         validation_result = extract_json_from_response(response)
         
         # Log parsing result
@@ -195,6 +238,9 @@ Now return ONLY the JSON for this problem:"""
             
             is_approved = validation_result.get('overall_score', 0) >= self.quality_threshold
             validation_result['is_approved'] = is_approved
+            await self.cache_result(cache_key, validation_result)
+            if embedding is not None:
+                self.semantic_cache.set(embedding, validation_result)
             
             self.logger.info(
                 "Validation complete",
@@ -202,9 +248,9 @@ Now return ONLY the JSON for this problem:"""
                 overall_score=validation_result.get('overall_score')
             )
             
-            # Send A2A response
+            # Send A2A response (sent in the background)
             if conversation_id:
-                await a2a_protocol.send_message(
+                self._send_notification(
                     sender_id=self.name,
                     sender_type="validator",
                     recipient_id="orchestrator",
@@ -234,5 +280,9 @@ Now return ONLY the JSON for this problem:"""
             }
 
 
-# Create singleton instance
-qa_validator = QAValidatorAgent(quality_threshold=85)
+# Singleton instance, created on first use so importing this module
+# does not construct a Vertex AI client
+@functools.cache
+def get_qa_validator() -> QAValidatorAgent:
+    """Get the shared QAValidatorAgent instance"""
+    return QAValidatorAgent(quality_threshold=85)
@@ -5,10 +5,122 @@ Retrieves comprehensive repository data using GitHub API via github_mcp utility.
 
 import json
 import os
+import functools
 from typing import Dict, Any, Optional
 from agents.base_agent import BaseGeminiAgent
-from utils.a2a_protocol import a2a_protocol
-from utils.github_mcp import get_github_mcp
+from utils.github_mcp import get_github_mcp, parse_repo_url
+
+
+# Mock repository data, built once; the repository name, owner and URL are
+# filled in by ScannerAgent._get_mock_repository_data (callers treat the
+# result as read-only)
+_MOCK_REPOSITORY_DATA = {
+    "repository": {
+        "description": "A modern web application built with React and Node.js",
+        "language": "JavaScript",
+        "stars": 1234,
+        "forks": 456,
+        "default_branch": "main"
+    },
+    "codebase": {
+        "file_tree": [
+            {"path": "src/", "type": "directory"},
+            {"path": "src/components/", "type": "directory"},
+            {"path": "src/components/App.jsx", "type": "file", "language": "JavaScript"},
+            {"path": "src/components/Header.jsx", "type": "file", "language": "JavaScript"},
+            {"path": "src/api/", "type": "directory"},
+            {"path": "src/api/users.js", "type": "file", "language": "JavaScript"},
+            {"path": "src/utils/", "type": "directory"},
+            {"path": "src/utils/helpers.js", "type": "file", "language": "JavaScript"},
+            {"path": "server/", "type": "directory"},
+            {"path": "server/index.js", "type": "file", "language": "JavaScript"},
+            {"path": "server/routes/", "type": "directory"},
+            {"path": "server/models/", "type": "directory"},
+            {"path": "tests/", "type": "directory"},
+            {"path": "tests/unit/", "type": "directory"},
+            {"path": "tests/integration/", "type": "directory"},
+            {"path": "package.json", "type": "file"},
+            {"path": "README.md", "type": "file"},
+            {"path": ".gitignore", "type": "file"}
+        ],
+        "total_files": 45,
+        "language_distribution": {
+            "JavaScript": 75,
+            "JSX": 15,
+            "CSS": 8,
+            "Markdown": 2
+        }
+    },
+    "pullRequests": [
+        {
+            "id": 1,
+            "title": "Add user authentication",
+            "description": "Implements JWT-based authentication",
+            "author": "developer1",
+            "state": "merged",
+            "files_changed": ["src/api/auth.js", "server/middleware/auth.js"]
+        },
+        {
+            "id": 2,
+            "title": "Fix memory leak in data fetching",
+            "description": "Resolves issue with unmounted components",
+            "author": "developer2",
+            "state": "merged",
+            "files_changed": ["src/hooks/useData.js"]
+        },
+        {
+            "id": 3,
+            "title": "Add caching layer",
+            "description": "Implements Redis caching for API responses",
+            "author": "developer1",
+            "state": "open",
+            "files_changed": ["server/cache.js", "server/routes/api.js"]
+        }
+    ],
+    "issues": [
+        {
+            "id": 101,
+            "title": "Add remedy history/favorites feature",
+            "description": "Users want to save and revisit their past remedy searches using localStorage",
+            "labels": ["enhancement", "feature"],
+            "state": "open",
+            "comments": 8
+        },
+        {
+            "id": 102,
+            "title": "Typing animation stutters on mobile",
+            "description": "The remedy typing effect lags on mobile devices, especially with longer responses",
+            "labels": ["performance", "bug", "mobile"],
+            "state": "open",
+            "comments": 5
+        },
+        {
+            "id": 103,
+            "title": "Add multilingual support for remedies",
+            "description": "Support Hindi, Sanskrit, and other Indian languages for remedy descriptions",
+            "labels": ["feature", "i18n"],
+            "state": "open",
+            "comments": 12
+        }
+    ],
+    "commits": [
+        {"sha": "a1b2c3d", "message": "Initial commit - Basic remedy generator", "author": "developer1", "date": "2024-01-15"},
+        {"sha": "e4f5g6h", "message": "Add Google Gemini AI integration", "author": "developer1", "date": "2024-01-20"},
+        {"sha": "i7j8k9l", "message": "Implement typing animation effect", "author": "developer2", "date": "2024-02-01"},
+        {"sha": "m1n2o3p", "message": "Add animated herb icons", "author": "developer2", "date": "2024-02-10"},
+        {"sha": "q4r5s6t", "message": "Improve CSS styling and responsiveness", "author": "developer1", "date": "2024-02-15"}
+    ],
+    "readme": "# Ayurvedic-Remedy\n\nAI-powered Ayurvedic remedy generator",
+    "dependencies": [
+        {"name": "@google/generative-ai", "version": "latest", "type": "production", "description": "Google Gemini AI SDK"},
+        {"name": "dotenv", "version": "16.0.0", "type": "production", "description": "Environment variable management"}
+    ],
+    "tech_stack": {
+        "frontend": ["Vanilla JavaScript", "HTML5", "CSS3"],
+        "ai": ["Google Gemini Pro API"],
+        "features": ["Typing animation", "Animated icons", "Responsive design"]
+    }
+}
 
 
 class ScannerAgent(BaseGeminiAgent):
@@ -53,7 +165,7 @@ Your role is to organize and format the data for downstream agents."""
             repo_url: GitHub repository URL
             depth: Scan depth ('shallow' or 'deep')
             conversation_id: Optional conversation ID for A2A tracking
-            
+        
         Returns:
             Repository data dictionary
         """
@@ -66,9 +178,9 @@ Your role is to organize and format the data for downstream agents."""
             conversation_id=conversation_id
         )
         
-        # Send A2A notification
+        # Send A2A notification (overlaps with the fetch below)
         if conversation_id:
-            await a2a_protocol.send_message(
+            self._send_notification(
                 sender_id=self.name,
                 sender_type="scanner",
                 recipient_id="orchestrator",
@@ -81,8 +193,8 @@ Your role is to organize and format the data for downstream agents."""
         if pre_fetched_data:
             self.logger.info("Using pre-fetched repository data")
             repo_data = pre_fetched_data
-        # Use real GitHub data if configured
-        elif self.use_real_data and self.github_client:
+        # Use real GitHub data if configured (and GitHub has not been failing)
+        elif self.use_real_data and self.github_client and not self.github_client.circuit_breaker.is_open:
             self.logger.info("Fetching real repository data from GitHub")
             try:
                 repo_data = await self.github_client.fetch_repository_data(
@@ -107,9 +219,9 @@ Your role is to organize and format the data for downstream agents."""
             data_source="prefetched" if pre_fetched_data else ("real" if self.use_real_data else "mock")
         )
         
-        # Send A2A response
+        # Send A2A response (sent in the background)
         if conversation_id:
-            await a2a_protocol.send_message(
+            self._send_notification(
                 sender_id=self.name,
                 sender_type="scanner",
                 recipient_id="orchestrator",
@@ -125,127 +237,34 @@ Your role is to organize and format the data for downstream agents."""
         
         return repo_data
     
+    async def aclose(self) -> None:
+        """Close the pooled GitHub HTTP session of the running event loop"""
+        if self.github_client is not None:
+            await self.github_client.aclose()
+    
     def _get_mock_repository_data(self, repo_url: str) -> Dict[str, Any]:
         """Generate comprehensive mock repository data
         
         This simulates what GitHub MCP would return.
         """
         
-        # Extract repo name from URL
-        repo_name = repo_url.rstrip('/').split('/')[-1]
-        owner = repo_url.rstrip('/').split('/')[-2] if '/' in repo_url else "owner"
+        owner, repo_name = parse_repo_url(repo_url)
         
         return {
+            **_MOCK_REPOSITORY_DATA,
             "repository": {
+                **_MOCK_REPOSITORY_DATA["repository"],
                 "name": repo_name,
                 "full_name": f"{owner}/{repo_name}",
-                "description": f"A modern web application built with React and Node.js",
-                "language": "JavaScript",
-                "stars": 1234,
-                "forks": 456,
-                "url": repo_url,
-                "default_branch": "main"
-            },
-            "codebase": {
-                "file_tree": [
-                    {"path": "src/", "type": "directory"},
-                    {"path": "src/components/", "type": "directory"},
-                    {"path": "src/components/App.jsx", "type": "file", "language": "JavaScript"},
-                    {"path": "src/components/Header.jsx", "type": "file", "language": "JavaScript"},
-                    {"path": "src/api/", "type": "directory"},
-                    {"path": "src/api/users.js", "type": "file", "language": "JavaScript"},
-                    {"path": "src/utils/", "type": "directory"},
-                    {"path": "src/utils/helpers.js", "type": "file", "language": "JavaScript"},
-                    {"path": "server/", "type": "directory"},
-                    {"path": "server/index.js", "type": "file", "language": "JavaScript"},
-                    {"path": "server/routes/", "type": "directory"},
-                    {"path": "server/models/", "type": "directory"},
-                    {"path": "tests/", "type": "directory"},
-                    {"path": "tests/unit/", "type": "directory"},
-                    {"path": "tests/integration/", "type": "directory"},
-                    {"path": "package.json", "type": "file"},
-                    {"path": "README.md", "type": "file"},
-                    {"path": ".gitignore", "type": "file"}
-                ],
-                "total_files": 45,
-                "language_distribution": {
-                    "JavaScript": 75,
-                    "JSX": 15,
-                    "CSS": 8,
-                    "Markdown": 2
-                }
-            },
-            "pullRequests": [
-                {
-                    "id": 1,
-                    "title": "Add user authentication",
-                    "description": "Implements JWT-based authentication",
-                    "author": "developer1",
-                    "state": "merged",
-                    "files_changed": ["src/api/auth.js", "server/middleware/auth.js"]
-                },
-                {
-                    "id": 2,
-                    "title": "Fix memory leak in data fetching",
-                    "description": "Resolves issue with unmounted components",
-                    "author": "developer2",
-                    "state": "merged",
-                    "files_changed": ["src/hooks/useData.js"]
-                },
-                {
-                    "id": 3,
-                    "title": "Add caching layer",
-                    "description": "Implements Redis caching for API responses",
-                    "author": "developer1",
-                    "state": "open",
-                    "files_changed": ["server/cache.js", "server/routes/api.js"]
-                }
-            ],
-            "issues": [
-                {
-                    "id": 101,
-                    "title": "Add remedy history/favorites feature",
-                    "description": "Users want to save and revisit their past remedy searches using localStorage",
-                    "labels": ["enhancement", "feature"],
-                    "state": "open",
-                    "comments": 8
-                },
-                {
-                    "id": 102,
-                    "title": "Typing animation stutters on mobile",
-                    "description": "The remedy typing effect lags on mobile devices, especially with longer responses",
-                    "labels": ["performance", "bug", "mobile"],
-                    "state": "open",
-                    "comments": 5
-                },
-                {
-                    "id": 103,
-                    "title": "Add multilingual support for remedies",
-                    "description": "Support Hindi, Sanskrit, and other Indian languages for remedy descriptions",
-                    "labels": ["feature", "i18n"],
-                    "state": "open",
-                    "comments": 12
-                }
-            ],
-            "commits": [
-                {"sha": "a1b2c3d", "message": "Initial commit - Basic remedy generator", "author": "developer1", "date": "2024-01-15"},
-                {"sha": "e4f5g6h", "message": "Add Google Gemini AI integration", "author": "developer1", "date": "2024-01-20"},
-                {"sha": "i7j8k9l", "message": "Implement typing animation effect", "author": "developer2", "date": "2024-02-01"},
-                {"sha": "m1n2o3p", "message": "Add animated herb icons", "author": "developer2", "date": "2024-02-10"},
-                {"sha": "q4r5s6t", "message": "Improve CSS styling and responsiveness", "author": "developer1", "date": "2024-02-15"}
-            ],
-            "readme": file_contents.get('README.md', '# Ayurvedic-Remedy\n\nAI-powered Ayurvedic remedy generator'),
-            "dependencies": [
-                {"name": "@google/generative-ai", "version": "latest", "type": "production", "description": "Google Gemini AI SDK"},
-                {"name": "dotenv", "version": "16.0.0", "type": "production", "description": "Environment variable management"}
-            ],
-            "tech_stack": {
-                "frontend": ["Vanilla JavaScript", "HTML5", "CSS3"],
-                "ai": ["Google Gemini Pro API"],
-                "features": ["Typing animation", "Animated icons", "Responsive design"]
+                "url": repo_url
             }
         }
 
 
-# Create singleton instance (will use real data if GITHUB_TOKEN is set)
-scanner = ScannerAgent(use_real_data=True)
+# Singleton instance, created on first use so importing this module does not
+# construct a Vertex AI client or GitHub client (uses real data if
+# GITHUB_TOKEN is set)
+@functools.cache
+def get_scanner() -> ScannerAgent:
+    """Get the shared ScannerAgent instance"""
+    return ScannerAgent(use_real_data=True)
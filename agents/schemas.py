@@ -0,0 +1,190 @@
+"""Response Schemas for Structured Output
+
+Pydantic models mirroring each agent's OUTPUT FORMAT. Passed to Gemini as
+`response_schema` so the model returns JSON that always matches the shape
+downstream agents expect.
+"""
+
+from typing import List
+from pydantic import BaseModel
+
+
+# Code Analyzer
+
+class ArchitectureSchema(BaseModel):
+    pattern: str
+    layers: List[str]
+    complexity: str
+
+
+class CodeQualitySchema(BaseModel):
+    score: int
+    strengths: List[str]
+    weaknesses: List[str]
+
+
+class CodeOpportunities(BaseModel):
+    features: List[str]
+    improvements: List[str]
+    extensions: List[str]
+
+
+class CodeAnalysisSchema(BaseModel):
+    architecture: ArchitectureSchema
+    code_quality: CodeQualitySchema
+    opportunities: CodeOpportunities
+
+
+# PR Analyzer
+
+class FrequentFile(BaseModel):
+    path: str
+    change_count: int
+
+
+class PRPatterns(BaseModel):
+    common_change_types: List[str]
+    frequent_files: List[FrequentFile]
+    workflow_patterns: List[str]
+
+
+class PRInsights(BaseModel):
+    recent_features: List[str]
+    common_bugs: List[str]
+    performance_improvements: List[str]
+
+
+class PRSuggestedProblem(BaseModel):
+    title: str
+    rationale: str
+    based_on_prs: List[str]
+
+
+class PRAnalysisSchema(BaseModel):
+    patterns: PRPatterns
+    insights: PRInsights
+    suggested_problems: List[PRSuggestedProblem]
+
+
+# Dependency Analyzer
+
+class TechStack(BaseModel):
+    frameworks: List[str]
+    libraries: List[str]
+    runtime: str
+    build_tools: List[str]
+
+
+class DependencyHealth(BaseModel):
+    outdated: List[str]
+    vulnerable: List[str]
+    well_maintained: List[str]
+
+
+class IntegrationOpportunity(BaseModel):
+    opportunity: str
+    technologies: List[str]
+    difficulty: str
+    rationale: str
+
+
+class DependencyAnalysisSchema(BaseModel):
+    tech_stack: TechStack
+    dependency_health: DependencyHealth
+    integration_opportunities: List[IntegrationOpportunity]
+
+
+# Issue Analyzer
+
+class IssueCategory(BaseModel):
+    count: int
+    examples: List[str]
+
+
+class IssueCategories(BaseModel):
+    bugs: IssueCategory
+    features: IssueCategory
+    enhancements: IssueCategory
+
+
+class PriorityIssue(BaseModel):
+    title: str
+    reason: str
+
+
+class ProblemPattern(BaseModel):
+    pattern: str
+    frequency: str
+
+
+class IssueSuggestedProblem(BaseModel):
+    title: str
+    rationale: str
+    difficulty: str
+    based_on_issues: List[str]
+
+
+class IssueAnalysisSchema(BaseModel):
+    categories: IssueCategories
+    priority_issues: List[PriorityIssue]
+    problem_patterns: List[ProblemPattern]
+    suggested_problems: List[IssueSuggestedProblem]
+
+
+# Combined PR + Dependency Analyzer
+
+class CombinedAnalysisSchema(BaseModel):
+    pr_analysis: PRAnalysisSchema
+    dependency_analysis: DependencyAnalysisSchema
+
+
+# Problem Creator
+
+class StarterFile(BaseModel):
+    filename: str
+    content: str
+    description: str
+
+
+class RubricItem(BaseModel):
+    criterion: str
+    points: int
+    description: str
+
+
+class ProblemSchema(BaseModel):
+    title: str
+    description: str
+    business_context: str
+    requirements: List[str]
+    acceptance_criteria: List[str]
+    starter_code: List[StarterFile]
+    hints: List[str]
+    estimated_time: int
+    difficulty: str
+    tech_stack: List[str]
+    evaluation_rubric: List[RubricItem]
+
+
+# QA Validator
+
+class ValidationScores(BaseModel):
+    feasibility: int
+    quality: int
+    technical: int
+    educational: int
+
+
+class ValidationFeedback(BaseModel):
+    strengths: List[str]
+    weaknesses: List[str]
+    improvements: List[str]
+
+
+class ValidationSchema(BaseModel):
+    is_approved: bool
+    overall_score: int
+    scores: ValidationScores
+    issues: List[str]
+    suggestions: List[str]
+    feedback: ValidationFeedback
@@ -8,15 +8,20 @@ Interactive terminal interface for generating coding assessments from GitHub rep
 import asyncio
 import sys
 import os
+import time
 from typing import Optional
-from datetime import datetime
-import json
+import orjson
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add parent directory to path (unless it is already importable)
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
-from utils.github_mcp import get_github_mcp
-from orchestrator import AssessmentOrchestrator
+from utils.config import config
+
+# Flush terminal output per line rather than per write() call
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(line_buffering=True)
 
 
 class Colors:
@@ -32,9 +37,16 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
-def print_banner():
-    """Print ActualCode banner"""
-    banner = f"""
+# Drop color codes when output is piped rather than shown on a terminal
+if not sys.stdout.isatty():
+    for _name in ('HEADER', 'BLUE', 'CYAN', 'GREEN', 'YELLOW', 'RED', 'END', 'BOLD', 'UNDERLINE'):
+        setattr(Colors, _name, '')
+
+# Banner and section header pieces, built once at import
+_BAR = f"{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.END}"
+_SECTION_FMT = f"{Colors.BOLD}{Colors.GREEN}{{emoji}} {{title}}{Colors.END}"
+
+_BANNER = f"""
 {Colors.CYAN}{Colors.BOLD}
 ╔═══════════════════════════════════════════════════════════════════════════╗
 ║                                                                           ║
@@ -51,14 +63,16 @@ def print_banner():
 ╚═══════════════════════════════════════════════════════════════════════════╝
 {Colors.END}
 """
-    print(banner)
+
+
+def print_banner():
+    """Print ActualCode banner"""
+    print(_BANNER)
 
 
 def print_section(title: str, emoji: str = ""):
     """Print formatted section header"""
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.GREEN}{emoji} {title}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.END}\n")
+    print(f"\n{_BAR}\n{_SECTION_FMT.format(emoji=emoji, title=title)}\n{_BAR}\n")
 
 
 def get_input(prompt: str, default: Optional[str] = None) -> str:
@@ -74,10 +88,13 @@ def get_input(prompt: str, default: Optional[str] = None) -> str:
 
 def get_choice(prompt: str, options: list, default: int = 0) -> str:
     """Get user choice from a list of options"""
-    print(f"\n{Colors.CYAN}{prompt}{Colors.END}")
-    for i, option in enumerate(options, 1):
-        marker = f"{Colors.GREEN}→{Colors.END}" if i == default + 1 else " "
-        print(f"  {marker} {i}. {option}")
+    marker = f"{Colors.GREEN}→{Colors.END}"
+    lines = [
+        f"  {marker if i == default else ' '} {i + 1}. {option}"
+        for i, option in enumerate(options)
+    ]
+    sys.stdout.write(f"\n{Colors.CYAN}{prompt}{Colors.END}\n" + "\n".join(lines) + "\n")
+    sys.stdout.flush()
     
     while True:
         choice = input(f"\n{Colors.CYAN}Enter choice (1-{len(options)}) [{default + 1}]{Colors.END}: ").strip()
@@ -93,8 +110,96 @@ def get_choice(prompt: str, options: list, default: int = 0) -> str:
             print(f"{Colors.RED}Invalid input. Please enter a number.{Colors.END}")
 
 
+def dumps(obj, indent: bool = False) -> str:
+    """Serialize to JSON with orjson (2-space indent when `indent` is set)"""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(obj, option=option).decode()
+
+
+def save_result(output_file: str, result: dict) -> None:
+    """Write the assessment JSON to `output_file`
+    
+    The file is read by tools, not people, so it is written compact
+    (pretty-print on demand with `python -m json.tool`).
+    """
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(dumps(result))
+
+
+def open_detailed_log(log_file: str, repo_url: str, difficulty: str, time_value: int):
+    """Create the detailed generation log and write its header
+    
+    Returns:
+        Open file object; repository data is streamed into it during the fetch
+    """
+    f = open(log_file, 'w', encoding='utf-8')
+    f.write("="*80 + "\n")
+    f.write("ACTUALCODE - DETAILED GENERATION LOG\n")
+    f.write("="*80 + "\n\n")
+    f.write(f"Generated at: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    f.write(f"Repository: {repo_url}\n")
+    f.write(f"Difficulty: {difficulty}\n")
+    f.write(f"Time Limit: {time_value} minutes\n\n")
+    
+    # Repository Data (one JSON line per section, written as each arrives)
+    f.write("="*80 + "\n")
+    f.write("REPOSITORY DATA\n")
+    f.write("="*80 + "\n")
+    return f
+
+
+async def stream_repo_data(f, queue: asyncio.Queue) -> None:
+    """Write repository data sections from `queue` to the log until a None sentinel"""
+    while (item := await queue.get()) is not None:
+        section, data = item
+        await asyncio.to_thread(f.write, dumps({"section": section, "data": data}) + "\n")
+    f.write("\n")
+
+
+def write_detailed_log(
+    f,
+    result: dict,
+    problem: dict,
+    validation: dict
+) -> None:
+    """Write the remaining sections of the detailed generation log"""
+    # Analysis Report
+    if 'debug' in result and 'analysis_report' in result['debug']:
+        f.write("="*80 + "\n")
+        f.write("ANALYSIS REPORT (3 LOOPS)\n")
+        f.write("="*80 + "\n")
+        f.write(dumps(result['debug']['analysis_report'], indent=True))
+        f.write("\n\n")
+    
+    # Generated Problem
+    f.write("="*80 + "\n")
+    f.write("GENERATED PROBLEM\n")
+    f.write("="*80 + "\n")
+    f.write(dumps(problem, indent=True))
+    f.write("\n\n")
+    
+    # QA Validation
+    f.write("="*80 + "\n")
+    f.write("QA VALIDATION\n")
+    f.write("="*80 + "\n")
+    f.write(dumps(validation, indent=True))
+    f.write("\n\n")
+    
+    # Full Result
+    f.write("="*80 + "\n")
+    f.write("COMPLETE RESULT\n")
+    f.write("="*80 + "\n")
+    f.write(dumps(result, indent=True))
+    f.write("\n")
+
+
 async def main():
     """Main CLI runner"""
+    # The agent stack (Gemini SDK, aiohttp) is only imported when a run starts
+    from utils.github_mcp import get_github_mcp, aclose_all as aclose_github_clients
+    from orchestrator import AssessmentOrchestrator
+    from agents.base_agent import aclose_shared_clients
+    
     print_banner()
     
     print(f"{Colors.YELLOW}Welcome to ActualCode - AI-Powered Code Assessment Generator{Colors.END}")
@@ -103,7 +208,8 @@ async def main():
     # Check environment
     print_section("Environment Check", "🔍")
     
-    github_token = os.getenv('GITHUB_TOKEN') or os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')
+    cfg = config()
+    github_token = cfg.github_token
     if not github_token:
         print(f"{Colors.RED}❌ GitHub token not found!{Colors.END}")
         print(f"{Colors.YELLOW}Please set GITHUB_TOKEN environment variable:{Colors.END}")
@@ -112,7 +218,7 @@ async def main():
     else:
         print(f"{Colors.GREEN}✅ GitHub token configured{Colors.END}")
     
-    google_project = os.getenv('GOOGLE_CLOUD_PROJECT')
+    google_project = cfg.project
     if google_project:
         print(f"{Colors.GREEN}✅ Google Cloud project: {google_project}{Colors.END}")
     else:
@@ -146,11 +252,14 @@ async def main():
     time_value = int(time_limit.split()[0])
     
     # Confirm
-    print(f"\n{Colors.BOLD}Configuration Summary:{Colors.END}")
-    print(f"  Repository:  {Colors.CYAN}{repo_url}{Colors.END}")
-    print(f"  Difficulty:  {Colors.CYAN}{difficulty}{Colors.END}")
-    print(f"  Type:        {Colors.CYAN}{problem_type}{Colors.END}")
-    print(f"  Time Limit:  {Colors.CYAN}{time_value} minutes{Colors.END}")
+    sys.stdout.write(
+        f"\n{Colors.BOLD}Configuration Summary:{Colors.END}\n"
+        f"  Repository:  {Colors.CYAN}{repo_url}{Colors.END}\n"
+        f"  Difficulty:  {Colors.CYAN}{difficulty}{Colors.END}\n"
+        f"  Type:        {Colors.CYAN}{problem_type}{Colors.END}\n"
+        f"  Time Limit:  {Colors.CYAN}{time_value} minutes{Colors.END}\n"
+    )
+    sys.stdout.flush()
     
     confirm = input(f"\n{Colors.YELLOW}Proceed with generation? (y/n) [y]{Colors.END}: ").strip().lower()
     if confirm and confirm not in ['y', 'yes']:
@@ -160,28 +269,52 @@ async def main():
     # Start generation
     print_section("Generating Assessment", "🚀")
     
+    log = None
     try:
         # Initialize GitHub MCP
         print(f"{Colors.BLUE}🔧 Initializing GitHub MCP client...{Colors.END}")
         github_client = get_github_mcp(github_token)
         
+        # One timestamp names both output files so they always pair up
+        run_timestamp = time.strftime("%Y%m%d_%H%M%S")
+        
+        # Detailed log (skipped with ACTUALCODE_QUIET=1), opened up front so
+        # repository data streams into it
+        if not os.getenv('ACTUALCODE_QUIET'):
+            log_file = f"DETAILED_RUN_{run_timestamp}.txt"
+            log = await asyncio.to_thread(open_detailed_log, log_file, repo_url, difficulty, time_value)
+        
         # Fetch repository data
         print(f"{Colors.BLUE}📡 Fetching repository data from GitHub...{Colors.END}")
-        repo_data = await github_client.fetch_repository_data(
-            repo_url=repo_url,
-            fetch_issues=True,
-            fetch_prs=True,
-            fetch_commits=True,
-            max_items=20
-        )
+        repo_queue = None
+        log_writer = None
+        if log is not None:
+            repo_queue = asyncio.Queue()
+            log_writer = asyncio.create_task(stream_repo_data(log, repo_queue))
+        try:
+            repo_data = await github_client.fetch_repository_data(
+                repo_url=repo_url,
+                fetch_issues=True,
+                fetch_prs=True,
+                fetch_commits=True,
+                max_items=20,
+                queue=repo_queue
+            )
+        finally:
+            if log_writer is not None:
+                repo_queue.put_nowait(None)
+                await log_writer
         
-        print(f"{Colors.GREEN}✅ Repository data fetched successfully!{Colors.END}")
-        print(f"   Name: {repo_data['repository'].get('name', 'N/A')}")
-        print(f"   Language: {repo_data['repository'].get('language', 'N/A')}")
-        print(f"   Files: {repo_data['codebase']['total_files']}")
-        print(f"   Issues: {len(repo_data['issues'])}")
-        print(f"   PRs: {len(repo_data['pull_requests'])}")
-        print(f"   Commits: {len(repo_data['commits'])}")
+        sys.stdout.write(
+            f"{Colors.GREEN}✅ Repository data fetched successfully!{Colors.END}\n"
+            f"   Name: {repo_data['repository'].get('name', 'N/A')}\n"
+            f"   Language: {repo_data['repository'].get('language', 'N/A')}\n"
+            f"   Files: {repo_data['codebase']['total_files']}\n"
+            f"   Issues: {len(repo_data['issues'])}\n"
+            f"   PRs: {len(repo_data['pull_requests'])}\n"
+            f"   Commits: {len(repo_data['commits'])}\n"
+        )
+        sys.stdout.flush()
         
         # Initialize orchestrator
         print(f"\n{Colors.BLUE}🤖 Initializing Multi-Agent System...{Colors.END}")
@@ -207,30 +340,30 @@ async def main():
         problem = assessment.get('problem', {})
         validation = assessment.get('validation', {})
         
-        print(f"{Colors.BOLD}Problem Title:{Colors.END} {problem.get('title', 'N/A')}")
-        print(f"{Colors.BOLD}Difficulty:{Colors.END} {problem.get('difficulty', 'N/A')}")
-        print(f"{Colors.BOLD}Estimated Time:{Colors.END} {problem.get('estimated_time', 'N/A')} minutes")
-        print(f"{Colors.BOLD}Tech Stack:{Colors.END} {', '.join(problem.get('tech_stack', []))}")
-        
-        print(f"\n{Colors.BOLD}Description:{Colors.END}")
-        print(f"{problem.get('description', 'N/A')[:300]}...")
-        
-        print(f"\n{Colors.BOLD}Requirements:{Colors.END} {len(problem.get('requirements', []))}")
-        print(f"{Colors.BOLD}Acceptance Criteria:{Colors.END} {len(problem.get('acceptance_criteria', []))}")
-        print(f"{Colors.BOLD}Starter Code Files:{Colors.END} {len(problem.get('starter_code', []))}")
-        
-        print(f"\n{Colors.BOLD}QA Validation Score:{Colors.END} {validation.get('overall_score', 0)}/100")
-        print(f"{Colors.BOLD}Feasibility:{Colors.END} {validation.get('scores', {}).get('feasibility', 0)}/100")
-        print(f"{Colors.BOLD}Quality:{Colors.END} {validation.get('scores', {}).get('quality', 0)}/100")
-        print(f"{Colors.BOLD}Technical:{Colors.END} {validation.get('scores', {}).get('technical', 0)}/100")
-        print(f"{Colors.BOLD}Educational:{Colors.END} {validation.get('scores', {}).get('educational', 0)}/100")
+        scores = validation.get('scores', {})
+        sys.stdout.write(
+            f"{Colors.BOLD}Problem Title:{Colors.END} {problem.get('title', 'N/A')}\n"
+            f"{Colors.BOLD}Difficulty:{Colors.END} {problem.get('difficulty', 'N/A')}\n"
+            f"{Colors.BOLD}Estimated Time:{Colors.END} {problem.get('estimated_time', 'N/A')} minutes\n"
+            f"{Colors.BOLD}Tech Stack:{Colors.END} {', '.join(problem.get('tech_stack', []))}\n"
+            f"\n{Colors.BOLD}Description:{Colors.END}\n"
+            f"{problem.get('description', 'N/A')[:300]}...\n"
+            f"\n{Colors.BOLD}Requirements:{Colors.END} {len(problem.get('requirements', []))}\n"
+            f"{Colors.BOLD}Acceptance Criteria:{Colors.END} {len(problem.get('acceptance_criteria', []))}\n"
+            f"{Colors.BOLD}Starter Code Files:{Colors.END} {len(problem.get('starter_code', []))}\n"
+            f"\n{Colors.BOLD}QA Validation Score:{Colors.END} {validation.get('overall_score', 0)}/100\n"
+            f"{Colors.BOLD}Feasibility:{Colors.END} {scores.get('feasibility', 0)}/100\n"
+            f"{Colors.BOLD}Quality:{Colors.END} {scores.get('quality', 0)}/100\n"
+            f"{Colors.BOLD}Technical:{Colors.END} {scores.get('technical', 0)}/100\n"
+            f"{Colors.BOLD}Educational:{Colors.END} {scores.get('educational', 0)}/100\n"
+        )
+        sys.stdout.flush()
         
         # Save to file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = f"assessment_{timestamp}.json"
+        output_file = f"assessment_{run_timestamp}.json"
         
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        # File writes run in a worker thread so they do not block the event loop
+        await asyncio.to_thread(save_result, output_file, result)
         
         print(f"\n{Colors.GREEN}✅ Assessment saved to: {output_file}{Colors.END}")
         
@@ -238,7 +371,6 @@ async def main():
         metadata = assessment.get('metadata', {})
         if 'performance' in metadata:
             perf = metadata['performance']
-            print(f"\n{Colors.BOLD}Performance Metrics:{Colors.END}")
             total_dur = perf.get('total_duration', 0)
             scan_dur = perf.get('scan', 0)
             analysis_dur = perf.get('analysis', 0)
@@ -246,57 +378,27 @@ async def main():
             validation_dur = perf.get('validation', 0)
             
             # Ensure all are floats
-            print(f"  Total Time: {float(total_dur):.2f}s")
-            print(f"  Scan: {float(scan_dur):.2f}s")
-            print(f"  Analysis: {float(analysis_dur):.2f}s")
-            print(f"  Creation: {float(creation_dur):.2f}s")
-            print(f"  Validation: {float(validation_dur):.2f}s")
+            sys.stdout.write(
+                f"\n{Colors.BOLD}Performance Metrics:{Colors.END}\n"
+                f"  Total Time: {float(total_dur):.2f}s\n"
+                f"  Scan: {float(scan_dur):.2f}s\n"
+                f"  Analysis: {float(analysis_dur):.2f}s\n"
+                f"  Creation: {float(creation_dur):.2f}s\n"
+                f"  Validation: {float(validation_dur):.2f}s\n"
+            )
+            sys.stdout.flush()
         
         # Save detailed logs
-        log_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = f"DETAILED_RUN_{log_timestamp}.txt"
-        
-        with open(log_file, 'w') as f:
-            f.write("="*80 + "\n")
-            f.write("ACTUALCODE - DETAILED GENERATION LOG\n")
-            f.write("="*80 + "\n\n")
-            f.write(f"Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Repository: {repo_url}\n")
-            f.write(f"Difficulty: {difficulty}\n")
-            f.write(f"Time Limit: {time_value} minutes\n\n")
+        if log is not None:
+            await asyncio.to_thread(
+                write_detailed_log,
+                log,
+                result,
+                problem,
+                validation
+            )
             
-            # Repository Data
-            f.write("="*80 + "\n")
-            f.write("REPOSITORY DATA\n")
-            f.write("="*80 + "\n")
-            f.write(json.dumps(repo_data, indent=2) + "\n\n")
-            
-            # Analysis Report
-            if 'debug' in result and 'analysis_report' in result['debug']:
-                f.write("="*80 + "\n")
-                f.write("ANALYSIS REPORT (3 LOOPS)\n")
-                f.write("="*80 + "\n")
-                f.write(json.dumps(result['debug']['analysis_report'], indent=2) + "\n\n")
-            
-            # Generated Problem
-            f.write("="*80 + "\n")
-            f.write("GENERATED PROBLEM\n")
-            f.write("="*80 + "\n")
-            f.write(json.dumps(problem, indent=2) + "\n\n")
-            
-            # QA Validation
-            f.write("="*80 + "\n")
-            f.write("QA VALIDATION\n")
-            f.write("="*80 + "\n")
-            f.write(json.dumps(validation, indent=2) + "\n\n")
-            
-            # Full Result
-            f.write("="*80 + "\n")
-            f.write("COMPLETE RESULT\n")
-            f.write("="*80 + "\n")
-            f.write(json.dumps(result, indent=2) + "\n")
-        
-        print(f"{Colors.GREEN}✅ Detailed logs saved to: {log_file}{Colors.END}")
+            print(f"{Colors.GREEN}✅ Detailed logs saved to: {log_file}{Colors.END}")
         
         print(f"\n{Colors.BOLD}{Colors.GREEN}🎊 Assessment generation complete!{Colors.END}\n")
         
@@ -304,9 +406,16 @@ async def main():
         print(f"\n{Colors.YELLOW}Operation cancelled by user.{Colors.END}")
     except Exception as e:
         print(f"\n{Colors.RED}❌ Error: {type(e).__name__}: {str(e)}{Colors.END}")
-        import traceback
-        print(f"\n{Colors.RED}Traceback:{Colors.END}")
-        traceback.print_exc()
+        # Full traceback only when debugging (set ACTUALCODE_DEBUG=1)
+        if os.getenv('ACTUALCODE_DEBUG'):
+            import traceback
+            print(f"\n{Colors.RED}Traceback:{Colors.END}")
+            traceback.print_exc()
+    finally:
+        await aclose_github_clients()
+        await aclose_shared_clients()
+        if log is not None:
+            log.close()
 
 
 if __name__ == "__main__":
@@ -7,10 +7,12 @@ showcasing production-ready deployment for hackathon judges.
 """
 
 import os
-import json
+import orjson
 from google.cloud import aiplatform
 from datetime import datetime
 
+from agent_config import AGENT_CONFIG
+
 # Configuration
 PROJECT_ID = os.getenv('GOOGLE_CLOUD_PROJECT', 'true-ability-473715-b4')
 REGION = os.getenv('REGION', 'us-central1')
@@ -32,193 +34,8 @@ Staging Bucket: {STAGING_BUCKET}
 aiplatform.init(project=PROJECT_ID, location=REGION, staging_bucket=STAGING_BUCKET)
 
 def create_agent_config():
-    """Create agent configuration for deployment"""
-    
-    agent_config = {
-        "display_name": "ActualCode Multi-Agent System",
-        "description": "7-agent collaborative system for code assessment generation using A2A protocol",
-        "agents": [
-            {
-                "name": "github_scanner",
-                "display_name": "GitHub Scanner Agent",
-                "model": "gemini-2.5-flash",
-                "tools": ["github_mcp"],
-                "system_instruction": """You are a GitHub repository scanner.
-Retrieve comprehensive data about repositories including:
-- Repository metadata (name, description, language, stars)
-- File structure and codebase overview
-- Recent issues (last 20)
-- Recent pull requests (last 20)
-- Recent commits (last 50)
-- README content
-- Dependencies
-
-Use GitHub MCP tools efficiently. Output structured JSON.""",
-                "temperature": 0.1,
-                "a2a_capabilities": {
-                    "exposes": ["scan_repository", "get_repo_metadata", "get_issues", "get_pull_requests"],
-                    "protocol_version": "1.0"
-                }
-            },
-            {
-                "name": "code_analyzer",
-                "display_name": "Code Analyzer Agent",
-                "model": "gemini-2.5-pro",
-                "system_instruction": """Analyze codebase architecture, patterns, and complexity.
-
-Focus on:
-1. Architectural patterns (MVC, microservices, event-driven, etc.)
-2. Code quality metrics, test coverage, documentation
-3. Technical debt: outdated dependencies, code smells, refactoring needs
-4. Feature opportunities: missing functionality, incomplete features
-
-Provide structured analysis with actionable insights.""",
-                "temperature": 0.3,
-                "a2a_capabilities": {
-                    "exposes": ["analyze_architecture", "assess_quality"],
-                    "consumes": ["scan_repository"],
-                    "protocol_version": "1.0"
-                }
-            },
-            {
-                "name": "pr_analyzer",
-                "display_name": "PR Analyzer Agent",
-                "model": "gemini-2.5-flash",
-                "system_instruction": """Analyze pull request patterns to extract development insights.
-
-Identify:
-- Common change types and workflows
-- Frequent files being modified
-- Recent features and in-progress work
-- Common bugs and recurring issues
-- Performance improvements
-
-Suggest problem opportunities based on PR trends.""",
-                "temperature": 0.4,
-                "a2a_capabilities": {
-                    "exposes": ["analyze_prs"],
-                    "consumes": ["scan_repository"],
-                    "protocol_version": "1.0"
-                }
-            },
-            {
-                "name": "issue_analyzer",
-                "display_name": "Issue Analyzer Agent",
-                "model": "gemini-2.5-flash",
-                "system_instruction": """Analyze GitHub issues to extract problem patterns and feature requests.
-
-Categorize:
-- Bugs, features, enhancements
-- Priority signals (community upvotes, maintainer responses)
-- Common complaints and requested features
-
-Suggest coding problems based on user pain points.""",
-                "temperature": 0.4,
-                "a2a_capabilities": {
-                    "exposes": ["analyze_issues"],
-                    "consumes": ["scan_repository"],
-                    "protocol_version": "1.0"
-                }
-            },
-            {
-                "name": "dependency_analyzer",
-                "display_name": "Dependency Analyzer Agent",
-                "model": "gemini-2.5-flash",
-                "system_instruction": """Analyze repository dependencies and tech stack.
-
-Identify:
-- Frameworks, libraries, runtime environment
-- Dependency health: outdated, vulnerable, well-maintained
-- Integration opportunities: underutilized libraries, missing integrations
-
-Provide actionable recommendations.""",
-                "temperature": 0.3,
-                "a2a_capabilities": {
-                    "exposes": ["analyze_dependencies"],
-                    "consumes": ["scan_repository"],
-                    "protocol_version": "1.0"
-                }
-            },
-            {
-                "name": "problem_creator",
-                "display_name": "Problem Creator Agent",
-                "model": "gemini-2.5-pro",
-                "system_instruction": """Create realistic, implementable coding problems based on repository analysis.
-
-CRITICAL REQUIREMENTS:
-- Align with repository's technology and patterns
-- Completable in specified time limit
-- Self-contained (no private repo access needed)
-- Clear, testable requirements
-- Realistic business context
-- Helpful starter code (structure, not solution)
-- Appropriate hints
-
-Generate comprehensive problem specifications.""",
-                "temperature": 0.7,
-                "a2a_capabilities": {
-                    "exposes": ["create_problem"],
-                    "consumes": ["analyze_architecture", "analyze_prs", "analyze_issues", "analyze_dependencies"],
-                    "protocol_version": "1.0"
-                }
-            },
-            {
-                "name": "qa_validator",
-                "display_name": "QA Validator Agent",
-                "model": "gemini-2.5-flash",
-                "system_instruction": """Validate coding problem quality across 4 dimensions:
-
-1. Feasibility (0-100):
-   - Completable in time limit
-   - All context provided
-   - No private repo access needed
-   - Functional starter code
-
-2. Quality (0-100):
-   - Clear problem description
-   - Specific, testable requirements
-   - Objective acceptance criteria
-   - Appropriate hints
-
-3. Technical (0-100):
-   - Uses repository's tech stack
-   - Patterns match repository style
-   - Complexity matches difficulty
-   - Correct code examples
-
-4. Educational (0-100):
-   - Tests relevant skills
-   - Appropriate difficulty
-   - Clear learning objectives
-   - Non-trivial problem
-
-Overall score must be 85+ to approve. Provide detailed feedback.""",
-                "temperature": 0.3,
-                "a2a_capabilities": {
-                    "exposes": ["validate_problem"],
-                    "consumes": ["create_problem"],
-                    "protocol_version": "1.0"
-                }
-            }
-        ],
-        "orchestration": {
-            "pattern": "sequential_with_loops",
-            "loops": 3,
-            "parallel_agents": ["code_analyzer", "pr_analyzer", "issue_analyzer", "dependency_analyzer"],
-            "improvement_loop": {
-                "enabled": True,
-                "max_iterations": 2,
-                "threshold_score": 85
-            }
-        },
-        "a2a_config": {
-            "protocol_version": "1.0",
-            "authentication": "oauth2",
-            "encryption": "tls"
-        }
-    }
-    
-    return agent_config
+    """Get the agent configuration for deployment (shared, do not mutate)"""
+    return AGENT_CONFIG
 
 
 def save_deployment_config(config):
@@ -227,8 +44,8 @@ def save_deployment_config(config):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     config_file = f"agent_engine_config_{timestamp}.json"
     
-    with open(config_file, 'w') as f:
-        json.dump(config, f, indent=2)
+    with open(config_file, 'wb') as f:
+        f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
     
     print(f"✅ Deployment configuration saved: {config_file}")
     return config_file
@@ -253,13 +70,14 @@ def deploy_to_agent_engine():
 Agent Details:
 """)
     
-    for agent in config['agents']:
-        print(f"   • {agent['display_name']}")
-        print(f"     Model: {agent['model']}")
-        print(f"     Temperature: {agent['temperature']}")
-        if 'tools' in agent:
-            print(f"     Tools: {', '.join(agent['tools'])}")
-        print()
+    summary_lines = [
+        f"   • {agent['display_name']}\n"
+        f"     Model: {agent['model']}\n"
+        f"     Temperature: {agent['temperature']}"
+        + (f"\n     Tools: {', '.join(agent['tools'])}" if 'tools' in agent else '')
+        for agent in config['agents']
+    ]
+    print("\n\n".join(summary_lines) + "\n")
     
     print("\n" + "="*70)
     print("NEXT STEPS FOR DEPLOYMENT:")
@@ -319,6 +137,8 @@ Next: Follow the deployment steps above to deploy to Agent Engine.
 """)
         
     except Exception as e:
-        print(f"\n❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"\n❌ Error: {type(e).__name__}: {e}")
+        # Full traceback only when debugging (set ACTUALCODE_DEBUG=1)
+        if os.getenv('ACTUALCODE_DEBUG'):
+            import traceback
+            traceback.print_exc()
@@ -5,6 +5,9 @@ Using Python SDK (no gcloud CLI required)
 """
 
 import os
+import orjson
+import asyncio
+import hashlib
 from google.cloud import aiplatform
 from datetime import datetime
 
@@ -12,6 +15,60 @@ from datetime import datetime
 PROJECT_ID = os.getenv('GOOGLE_CLOUD_PROJECT', 'true-ability-473715-b4')
 REGION = os.getenv('REGION', 'us-central1')
 
+# Post-deploy test responses are cached here; bump CACHE_VERSION to invalidate
+TEST_CACHE_DIR = 'test_cache'
+CACHE_VERSION = 1
+
+# Smoke tests run against the deployed engine, a few at a time
+TEST_CASES = [
+    {"repo_url": "https://github.com/google-gemini/example-chat-app", "difficulty": "medium", "problem_type": "feature", "time_limit": 180},
+    {"repo_url": "https://github.com/google-gemini/example-chat-app", "difficulty": "easy", "problem_type": "bug-fix", "time_limit": 120},
+    {"repo_url": "https://github.com/google-gemini/example-chat-app", "difficulty": "hard", "problem_type": "refactor", "time_limit": 240},
+]
+MAX_CONCURRENT_TESTS = 3
+
+
+def cached_query(engine, **query):
+    """Run engine.query(**query), reusing a cached response for identical
+    arguments against the same deployed engine"""
+    key = hashlib.sha256(
+        orjson.dumps(
+            {"version": CACHE_VERSION, "engine": engine.resource_name, **query},
+            option=orjson.OPT_SORT_KEYS
+        )
+    ).hexdigest()
+    cache_path = os.path.join(TEST_CACHE_DIR, f"{key}.json")
+    
+    if os.path.exists(cache_path):
+        print(f"   (cached response: {cache_path})")
+        with open(cache_path, 'rb') as f:
+            return orjson.loads(f.read())
+    
+    response = engine.query(**query)
+    
+    # Only passing responses are kept, so a failed smoke test runs again
+    if response.get('success'):
+        os.makedirs(TEST_CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            f.write(orjson.dumps(response))
+    
+    return response
+
+
+async def run_smoke_tests(engine, test_cases):
+    """Run the test queries concurrently (each blocking query in a worker thread)"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TESTS)
+    
+    async def run_one(query):
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(cached_query, engine, **query)
+            except Exception as e:
+                return {"success": False, "error": str(e)}
+    
+    return await asyncio.gather(*(run_one(query) for query in test_cases))
+
+
 print(f"""
 ╔═══════════════════════════════════════════════════════════════════╗
 ║              Deploying ActualCode to Vertex AI                    ║
@@ -76,27 +133,26 @@ https://console.cloud.google.com/vertex-ai/reasoning-engines?project={PROJECT_ID
 """)
     
     # Test the deployment
-    print("🧪 Testing deployed agent...")
+    print(f"🧪 Testing deployed agent ({len(TEST_CASES)} queries)...")
     
-    test_response = reasoning_engine.query(
-        repo_url="https://github.com/google-gemini/example-chat-app",
-        difficulty="medium",
-        problem_type="feature",
-        time_limit=180
-    )
+    test_responses = asyncio.run(run_smoke_tests(reasoning_engine, TEST_CASES))
     
-    if test_response.get('success'):
-        print(f"""
-✅ Deployment Test PASSED!
+    for test_case, test_response in zip(TEST_CASES, test_responses):
+        label = f"{test_case['difficulty']} {test_case['problem_type']}"
+        if test_response.get('success'):
+            print(f"""
+✅ Deployment Test PASSED ({label})
 
    Title: {test_response['assessment']['problem']['title']}
    Quality Score: {test_response['assessment']['validation']['overall_score']}/100
    Processing Time: {test_response['metadata']['processing_time']:.2f}s
    A2A Messages: {test_response['metadata'].get('a2a_messages', 'N/A')}
-
 """)
-    else:
-        print(f"⚠️  Test completed with warning: {test_response.get('error', 'Unknown')}\n")
+        else:
+            print(f"⚠️  Test ({label}) completed with warning: {test_response.get('error', 'Unknown')}\n")
+    
+    passed = sum(1 for test_response in test_responses if test_response.get('success'))
+    print(f"🧪 Smoke tests: {passed}/{len(TEST_CASES)} passed\n")
     
     # Save deployment info
     deployment_info = {
@@ -110,9 +166,8 @@ https://console.cloud.google.com/vertex-ai/reasoning-engines?project={PROJECT_ID
         "models": ["gemini-2.5-pro", "gemini-2.5-flash"]
     }
     
-    with open('deployment_info.json', 'w') as f:
-        import json
-        json.dump(deployment_info, f, indent=2)
+    with open('deployment_info.json', 'wb') as f:
+        f.write(orjson.dumps(deployment_info, option=orjson.OPT_INDENT_2))
     
     print("📄 Deployment info saved to: deployment_info.json")
     
@@ -159,8 +214,10 @@ For full troubleshooting, see DEPLOYMENT_GUIDE.md
 You can still demo the system locally! The deployment is optional for showing production readiness.
 """)
     
-    import traceback
-    traceback.print_exc()
+    # Full traceback only when debugging (set ACTUALCODE_DEBUG=1)
+    if os.getenv('ACTUALCODE_DEBUG'):
+        import traceback
+        traceback.print_exc()
     
     print("\n💡 TIP: You can still demo everything locally and show the deployment")
     print("    configuration to judges as proof of production-readiness!\n")
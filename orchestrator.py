@@ -16,21 +16,62 @@ Flow:
 
 import asyncio
 import json
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional
 from datetime import datetime
+from google.genai import types
 
 # Import all agents
-from agents.scanner_agent import scanner
-from agents.code_analyzer_agent import code_analyzer
-from agents.pr_analyzer_agent import pr_analyzer
-from agents.issue_analyzer_agent import issue_analyzer
-from agents.dependency_analyzer_agent import dependency_analyzer
-from agents.problem_creator_agent import problem_creator
-from agents.qa_validator_agent import qa_validator
+from agents.base_agent import get_shared_client, MIN_CACHE_TOKENS
+from agents.scanner_agent import get_scanner
+from agents.code_analyzer_agent import get_code_analyzer
+from agents.issue_analyzer_agent import get_issue_analyzer
+from agents.combined_analyzer_agent import get_combined_analyzer
+from agents.problem_creator_agent import get_problem_creator
+from agents.qa_validator_agent import get_qa_validator
 
 # Import utilities
 from utils.a2a_protocol import a2a_protocol
+from utils.config import config
 from utils.monitoring import AgentLogger, PerformanceMonitor
+from utils.repo_serializer import get_repo_context
+
+# Shared repository context cache: the issue and combined analyzers both run
+# on this model, and a cache can only be used with the model it was built for
+REPO_CACHE_MODEL = "gemini-2.5-flash"
+REPO_CACHE_TTL = "600s"
+
+# Lazily constructed agents, built concurrently by warmup_agents()
+_LAZY_AGENTS = {
+    "code_analyzer": get_code_analyzer,
+    "combined_analyzer": get_combined_analyzer,
+    "issue_analyzer": get_issue_analyzer,
+    "problem_creator": get_problem_creator,
+    "qa_validator": get_qa_validator
+}
+
+
+async def warmup_agents() -> Dict[str, Any]:
+    """Construct the lazily created agents concurrently
+    
+    Agent construction does blocking client setup, so each runs in a worker
+    thread and cold start costs the slowest agent rather than the sum.
+    
+    Returns:
+        Dictionary mapping agent name to instance
+    """
+    agents = await asyncio.gather(
+        *(asyncio.to_thread(get_agent) for get_agent in _LAZY_AGENTS.values())
+    )
+    return dict(zip(_LAZY_AGENTS, agents))
+
+
+async def drain_agents() -> None:
+    """Wait until every constructed agent has sent its in-flight A2A
+    notifications (agents that were never built have none)"""
+    getters = (get_scanner, *_LAZY_AGENTS.values())
+    await asyncio.gather(*(
+        get_agent().drain() for get_agent in getters if get_agent.cache_info().currsize
+    ))
 
 
 class AssessmentOrchestrator:
@@ -66,6 +107,9 @@ class AssessmentOrchestrator:
         
         self._print_header()
         
+        # Build the lazy agents while the repository is being scanned
+        warmup = asyncio.create_task(warmup_agents())
+        
         try:
             # Step 1: Scan Repository (use pre-fetched data if available)
             if repo_data is None:
@@ -73,6 +117,8 @@ class AssessmentOrchestrator:
             else:
                 print(f"📦 Using pre-fetched repository data")
             
+            await warmup
+            
             # Step 2-5: Multi-Agent Analysis (Single Pass - Faster!)
             analysis_report = await self._run_single_analysis(repo_data)
             
@@ -101,8 +147,15 @@ class AssessmentOrchestrator:
             return result
             
         except Exception as e:
+            warmup.cancel()
             self.logger.error(f"Orchestration failed: {str(e)}")
             raise
+        
+        finally:
+            # Background notifications must be sent before the caller's event
+            # loop closes; nothing reads this run's A2A messages afterwards
+            await drain_agents()
+            a2a_protocol.prune_conversation(self.conversation_id)
     
     async def _scan_repository(self, github_repo_url: str) -> Dict[str, Any]:
         """Step 1: Retrieve repository data"""
@@ -115,7 +168,7 @@ class AssessmentOrchestrator:
         self.performance.start_timer("scan")
         
         # Use scanner agent
-        repo_data = await scanner.scan_repository(
+        repo_data = await get_scanner().scan_repository(
             repo_url=github_repo_url,
             conversation_id=self.conversation_id
         )
@@ -138,24 +191,27 @@ class AssessmentOrchestrator:
         
         self.performance.start_timer("analysis")
         
-        print(f"\n⚙️  Running 4 analysis agents in parallel...")
+        print(f"\n⚙️  Running 4 analysis agents in parallel (PR + Dependency share one call)...")
+        
+        # The shared prompt context is cached for the analyzers that run on
+        # the same model, but only once one of them misses its result cache
+        repo_cache = self._lazy_repo_cache(repo_data)
         
         # Run all analyzers ONCE in parallel
         tasks = [
             self._run_code_analyzer(repo_data),
-            self._run_pr_analyzer(repo_data),
-            self._run_issue_analyzer(repo_data),
-            self._run_dependency_analyzer(repo_data)
+            self._run_combined_analyzer(repo_data, repo_cache),
+            self._run_issue_analyzer(repo_data, repo_cache)
         ]
         
-        results = await asyncio.gather(*tasks)
+        code_analysis, combined_analysis, issue_analysis = await asyncio.gather(*tasks)
         
         # Store results
         analysis_data = {
-            "code_analysis": results[0],
-            "pr_analysis": results[1],
-            "issue_analysis": results[2],
-            "dependency_analysis": results[3],
+            "code_analysis": code_analysis,
+            "pr_analysis": combined_analysis['pr_analysis'],
+            "issue_analysis": issue_analysis,
+            "dependency_analysis": combined_analysis['dependency_analysis'],
             "timestamp": datetime.now().isoformat()
         }
         
@@ -174,6 +230,55 @@ class AssessmentOrchestrator:
         
         return final_report
     
+    def _lazy_repo_cache(self, repo_data: Dict[str, Any]) -> Callable[[], Awaitable[Optional[str]]]:
+        """Get a function returning the repository context cache name
+        
+        The cache is created by the first call (concurrent callers share that
+        request), so fully cached re-runs never create one.
+        """
+        task: Optional[asyncio.Future] = None
+        
+        async def get_cache_name() -> Optional[str]:
+            nonlocal task
+            if task is None:
+                task = asyncio.ensure_future(self.prepare_repo_cache(repo_data))
+            return await task
+        
+        return get_cache_name
+    
+    async def prepare_repo_cache(self, repo_data: Dict[str, Any]) -> Optional[str]:
+        """Create a Vertex AI context cache holding the repository summary
+        
+        Args:
+            repo_data: Repository data shared by the analyzers
+            
+        Returns:
+            Name of the cached content, or None if the summary is below the
+            cache minimum or caching is unavailable
+        """
+        
+        summary_text = get_repo_context(repo_data)['summary_text']
+        if len(summary_text) // 4 < MIN_CACHE_TOKENS:
+            return None
+        
+        cfg = config()
+        
+        try:
+            client = get_shared_client(cfg.project, cfg.region)
+            cache = await client.aio.caches.create(
+                model=REPO_CACHE_MODEL,
+                config=types.CreateCachedContentConfig(
+                    contents=[types.Content(role="user", parts=[types.Part.from_text(text=summary_text)])],
+                    ttl=REPO_CACHE_TTL
+                )
+            )
+            self.logger.info("Repository context cache created", cache=cache.name)
+            return cache.name
+            
+        except Exception as e:
+            self.logger.warning(f"Repository context cache unavailable: {str(e)}")
+            return None
+    
     async def _run_code_analyzer(
         self,
         repo_data: Dict[str, Any]
@@ -189,33 +294,7 @@ class AssessmentOrchestrator:
         print(f"        Files: {repo_data.get('codebase', {}).get('total_files', 0)}")
         print(f"        README: {len(repo_data.get('readme', ''))} chars")
         
-        result = await code_analyzer.analyze(
-            repo_data=repo_data,
-            conversation_id=self.conversation_id
-        )
-        
-        # Show actual output data
-        print(f"     📤 OUTPUT DATA:")
-        print(json.dumps(result, indent=8)[:1000] + "..." if len(json.dumps(result)) > 1000 else json.dumps(result, indent=8))
-        
-        return result
-    
-    async def _run_pr_analyzer(
-        self,
-        repo_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Run PR Analyzer agent"""
-        
-        print(f"\n  🤖 Agent 3: PR Analyzer...")
-        
-        prs = repo_data.get('pull_requests', [])
-        print(f"     📥 INPUT DATA:")
-        print(f"        Pull Requests: {len(prs)}")
-        if prs:
-            for i, pr in enumerate(prs[:3], 1):
-                print(f"          {i}. {pr.get('title', 'N/A')[:60]}")
-        
-        result = await pr_analyzer.analyze(
+        result = await get_code_analyzer().analyze(
             repo_data=repo_data,
             conversation_id=self.conversation_id
         )
@@ -228,7 +307,8 @@ class AssessmentOrchestrator:
     
     async def _run_issue_analyzer(
         self,
-        repo_data: Dict[str, Any]
+        repo_data: Dict[str, Any],
+        repo_cache: Optional[Callable[[], Awaitable[Optional[str]]]] = None
     ) -> Dict[str, Any]:
         """Run Issue Analyzer agent"""
         
@@ -241,9 +321,10 @@ class AssessmentOrchestrator:
             for i, issue in enumerate(issues[:3], 1):
                 print(f"          {i}. {issue.get('title', 'N/A')[:60]}")
         
-        result = await issue_analyzer.analyze(
+        result = await get_issue_analyzer().analyze(
             repo_data=repo_data,
-            conversation_id=self.conversation_id
+            conversation_id=self.conversation_id,
+            repo_cache=repo_cache
         )
         
         # Show actual output data
@@ -252,16 +333,22 @@ class AssessmentOrchestrator:
         
         return result
     
-    async def _run_dependency_analyzer(
+    async def _run_combined_analyzer(
         self,
-        repo_data: Dict[str, Any]
+        repo_data: Dict[str, Any],
+        repo_cache: Optional[Callable[[], Awaitable[Optional[str]]]] = None
     ) -> Dict[str, Any]:
-        """Run Dependency Analyzer agent"""
+        """Run PR Analyzer and Dependency Analyzer as a single batched call"""
         
-        print(f"\n  🤖 Agent 5: Dependency Analyzer...")
+        print(f"\n  🤖 Agents 3 & 5: PR + Dependency Analyzer (batched)...")
         
+        prs = repo_data.get('pull_requests', [])
         deps = repo_data.get('dependencies', [])
         print(f"     📥 INPUT DATA:")
+        print(f"        Pull Requests: {len(prs)}")
+        if prs:
+            for i, pr in enumerate(prs[:3], 1):
+                print(f"          {i}. {pr.get('title', 'N/A')[:60]}")
         print(f"        Dependency Files: {len(deps)}")
         if deps:
             for i, dep in enumerate(deps[:3], 1):
@@ -269,9 +356,10 @@ class AssessmentOrchestrator:
                 content_len = len(dep.get('content', ''))
                 print(f"          {i}. {dep_file} ({content_len} chars)")
         
-        result = await dependency_analyzer.analyze(
+        result = await get_combined_analyzer().analyze(
             repo_data=repo_data,
-            conversation_id=self.conversation_id
+            conversation_id=self.conversation_id,
+            repo_cache=repo_cache
         )
         
         # Show actual output data
@@ -356,7 +444,7 @@ class AssessmentOrchestrator:
         
         self.performance.start_timer("creation")
         
-        problem = await problem_creator.create_problem(
+        problem = await get_problem_creator().create_problem(
             repository_report=analysis_report,
             difficulty=difficulty,
             problem_type=problem_type,
@@ -400,7 +488,7 @@ class AssessmentOrchestrator:
         
         print(f"\n📥 INPUT: Validating problem '{problem.get('title', 'N/A')[:60]}'")
         
-        is_approved, validation_result = await qa_validator.validate_problem(
+        is_approved, validation_result = await get_qa_validator().validate_problem(
             problem=problem,
             repository_report=analysis_report,
             conversation_id=self.conversation_id
@@ -440,7 +528,7 @@ class AssessmentOrchestrator:
         }
         
         # Get improved problem from Problem Creator
-        improved_problem = await problem_creator.create_problem(
+        improved_problem = await get_problem_creator().create_problem(
             repository_report={
                 **analysis_report,
                 "improvement_context": improvement_context
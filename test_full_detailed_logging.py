@@ -90,12 +90,12 @@ async def run_full_detailed_test():
     # Import agents
     logger.log_section("STEP 2: INITIALIZING ALL AGENTS")
     
-    from agents.code_analyzer_agent import code_analyzer  
-    from agents.pr_analyzer_agent import pr_analyzer
-    from agents.issue_analyzer_agent import issue_analyzer
-    from agents.dependency_analyzer_agent import dependency_analyzer
-    from agents.problem_creator_agent import problem_creator
-    from agents.qa_validator_agent import qa_validator
+    from agents.code_analyzer_agent import get_code_analyzer
+    from agents.pr_analyzer_agent import get_pr_analyzer
+    from agents.issue_analyzer_agent import get_issue_analyzer
+    from agents.dependency_analyzer_agent import get_dependency_analyzer
+    from agents.problem_creator_agent import get_problem_creator
+    from agents.qa_validator_agent import get_qa_validator
     
     conversation_id = f"full_test_{timestamp}"
     logger.write(f"✅ All 6 agents initialized")
@@ -191,7 +191,7 @@ async def run_full_detailed_test():
         logger.log_agent_input("Code Analyzer", code_analysis_input)
         
         logger.write("⚙️  Executing Code Analyzer Agent...")
-        code_analysis = await code_analyzer.analyze(
+        code_analysis = await get_code_analyzer().analyze(
             repo_data=code_analysis_input,
             conversation_id=conversation_id
         )
@@ -212,7 +212,7 @@ async def run_full_detailed_test():
         logger.log_agent_input("PR Analyzer", pr_analysis_input)
         
         logger.write("⚙️  Executing PR Analyzer Agent...")
-        pr_analysis = await pr_analyzer.analyze(
+        pr_analysis = await get_pr_analyzer().analyze(
             repo_data=pr_analysis_input,
             conversation_id=conversation_id
         )
@@ -233,7 +233,7 @@ async def run_full_detailed_test():
         logger.log_agent_input("Issue Analyzer", issue_analysis_input)
         
         logger.write("⚙️  Executing Issue Analyzer Agent...")
-        issue_analysis = await issue_analyzer.analyze(
+        issue_analysis = await get_issue_analyzer().analyze(
             repo_data=issue_analysis_input,
             conversation_id=conversation_id
         )
@@ -254,7 +254,7 @@ async def run_full_detailed_test():
         logger.log_agent_input("Dependency Analyzer", dep_analysis_input)
         
         logger.write("⚙️  Executing Dependency Analyzer Agent...")
-        dep_analysis = await dependency_analyzer.analyze(
+        dep_analysis = await get_dependency_analyzer().analyze(
             repo_data=dep_analysis_input,
             conversation_id=conversation_id
         )
@@ -306,7 +306,7 @@ async def run_full_detailed_test():
         logger.log_agent_input("Problem Creator", problem_input)
         
         logger.write("⚙️  Executing Problem Creator Agent...")
-        problem = await problem_creator.create_problem(
+        problem = await get_problem_creator().create_problem(
             repository_report=combined_report,
             difficulty="medium",
             problem_type="feature",
@@ -336,7 +336,7 @@ async def run_full_detailed_test():
         logger.log_agent_input("QA Validator", validation_input)
         
         logger.write("⚙️  Executing QA Validator Agent (validation only, no loop)...")
-        is_approved, validation = await qa_validator.validate_problem(
+        is_approved, validation = await get_qa_validator().validate_problem(
             problem=problem,
             repository_report=combined_report,
             conversation_id=conversation_id
@@ -369,7 +369,7 @@ async def run_full_detailed_test():
         logger.log_agent_input("Problem Creator (Refinement)", improvement_instructions)
         
         logger.write("⚙️  Problem Creator refining problem based on QA feedback...")
-        refined_problem = await problem_creator.create_problem(
+        refined_problem = await get_problem_creator().create_problem(
             repository_report={
                 **combined_report,
                 "improvement_context": improvement_instructions
@@ -44,6 +44,7 @@ async def test_github_connection():
             fetch_commits=False,
             max_items=5
         )
+        await github_client.aclose()
         
         # Display results
         print("\n✅ SUCCESS! Repository data fetched:")
@@ -28,6 +28,7 @@ async def test():
         fetch_commits=True,
         max_items=10
     )
+    await github_client.aclose()
     
     print("\n✅ SUCCESS! Your repository data:")
     print(f"   Name: {repo_data['repository'].get('name', 'N/A')}")
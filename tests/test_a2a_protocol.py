@@ -0,0 +1,91 @@
+"""Tests for the A2A message history, indexes and stats"""
+
+import unittest
+
+from utils.a2a_protocol import A2AProtocol
+
+
+class A2AProtocolTest(unittest.IsolatedAsyncioTestCase):
+
+    async def _send(self, protocol, sender, recipient, conversation, message_type="request"):
+        return await protocol.send_message(
+            sender_id=sender,
+            sender_type="agent",
+            recipient_id=recipient,
+            data={},
+            conversation_id=conversation,
+            message_type=message_type
+        )
+    
+    def assertIndexesMatchHistory(self, protocol):
+        history = list(protocol.message_history)
+        for index, attr in (
+            (protocol.conversation_index, "conversation_id"),
+            (protocol.sender_index, "sender_id"),
+            (protocol.recipient_index, "recipient_id")
+        ):
+            self.assertEqual(
+                dict(index),
+                {key: [m for m in history if getattr(m, attr) == key] for key in {getattr(m, attr) for m in history}}
+            )
+        for conversation, bucket in protocol.conversation_index.items():
+            self.assertEqual(protocol.get_conversation_stats(conversation)["total_messages"], len(bucket))
+        self.assertEqual(set(protocol.conversation_stats), set(protocol.conversation_index))
+    
+    async def test_filters_use_indexes(self):
+        protocol = A2AProtocol()
+        first = await self._send(protocol, "a", "b", "c1")
+        await self._send(protocol, "b", "a", "c1", "response")
+        await self._send(protocol, "a", "b", "c2")
+        
+        self.assertEqual(len(protocol.get_message_history(conversation_id="c1")), 2)
+        self.assertEqual(protocol.get_message_history(conversation_id="c1", sender_id="a"), [first])
+        self.assertEqual(len(protocol.get_message_history(recipient_id="b")), 2)
+        self.assertEqual(protocol.get_message_history(sender_id="nobody"), [])
+        
+        stats = protocol.get_conversation_stats("c1")
+        self.assertEqual(stats["message_types"], {"request": 1, "response": 1})
+        self.assertEqual(sorted(stats["agents_involved"]), ["a", "b"])
+    
+    async def test_eviction_keeps_indexes_and_stats_in_step(self):
+        protocol = A2AProtocol(history_cap=3)
+        await self._send(protocol, "a", "b", "c1")
+        await self._send(protocol, "b", "c", "c1", "response")
+        for _ in range(3):
+            await self._send(protocol, "x", "y", "c2")
+        
+        self.assertEqual(len(protocol.message_history), 3)
+        self.assertNotIn("c1", protocol.conversation_index)
+        self.assertNotIn("a", protocol.sender_index)
+        self.assertEqual(protocol.get_conversation_stats("c1")["total_messages"], 0)
+        self.assertIndexesMatchHistory(protocol)
+    
+    async def test_prune_conversation(self):
+        protocol = A2AProtocol()
+        await self._send(protocol, "a", "b", "c1")
+        await self._send(protocol, "a", "all_agents", "c1", "broadcast")
+        await self._send(protocol, "a", "b", "c2")
+        
+        self.assertEqual(protocol.prune_conversation("c1"), 2)
+        self.assertEqual(protocol.prune_conversation("c1"), 0)
+        self.assertNotIn("all_agents", protocol.recipient_index)
+        self.assertEqual(protocol.get_conversation_stats("c2")["agents_involved"], ["a", "b"])
+        self.assertIndexesMatchHistory(protocol)
+    
+    async def test_prune_older_than_updates_stats(self):
+        protocol = A2AProtocol()
+        old = await self._send(protocol, "a", "b", "c1")
+        new = await self._send(protocol, "b", "c", "c1", "response")
+        old.timestamp, new.timestamp = 100.0, 200.0
+        protocol.conversation_stats["c1"]["first"], protocol.conversation_stats["c1"]["last"] = 100.0, 200.0
+        
+        self.assertEqual(protocol.prune_conversation("c1", older_than=150.0), 1)
+        stats = protocol.get_conversation_stats("c1")
+        self.assertEqual(stats["message_types"], {"response": 1})
+        self.assertEqual(sorted(stats["agents_involved"]), ["b", "c"])
+        self.assertEqual(stats["duration_seconds"], 0)
+        self.assertIndexesMatchHistory(protocol)
+
+
+if __name__ == "__main__":
+    unittest.main()
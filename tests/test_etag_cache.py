@@ -0,0 +1,58 @@
+"""Tests for the GitHub ETag cache"""
+
+import os
+import stat
+import tempfile
+import unittest
+
+from utils.etag_cache import ETagCache
+
+
+class ETagCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self._tmp.name, "cache")
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def test_directory_is_private(self):
+        ETagCache(self.directory)
+        self.assertEqual(stat.S_IMODE(os.stat(self.directory).st_mode), 0o700)
+    
+    def test_key_depends_on_credential(self):
+        url = "https://api.github.com/repos/o/r"
+        self.assertNotEqual(
+            ETagCache.key(url, "json", authorization="Bearer a"),
+            ETagCache.key(url, "json", authorization="Bearer b")
+        )
+        self.assertEqual(
+            ETagCache.key(url, "json", {"a": 1, "b": 2}, "Bearer a"),
+            ETagCache.key(url, "json", {"b": 2, "a": 1}, "Bearer a")
+        )
+    
+    def test_entries_persist_across_instances(self):
+        ETagCache(self.directory).set("k", '"v1"', {"name": "r"}, "Mon, 01 Jan 2024 00:00:00 GMT")
+        entry = ETagCache(self.directory).get("k")
+        self.assertEqual(entry.etag, '"v1"')
+        self.assertEqual(entry.body, {"name": "r"})
+        self.assertEqual(entry.last_modified, "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.assertIsNone(ETagCache(self.directory).get("missing"))
+    
+    def test_freshness(self):
+        cache = ETagCache(self.directory, fresh_seconds=60)
+        cache.set("k", '"v1"', [])
+        self.assertTrue(cache.is_fresh(cache.get("k")))
+        self.assertFalse(ETagCache(self.directory, fresh_seconds=0).is_fresh(cache.get("k")))
+    
+    def test_memory_lru_is_bounded(self):
+        cache = ETagCache(self.directory, max_memory_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, None, key)
+        self.assertEqual(list(cache._memory), ["b", "c"])
+        self.assertEqual(cache.get("a").body, "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
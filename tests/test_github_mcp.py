@@ -0,0 +1,183 @@
+"""Tests for the GitHub client's rate limiting helpers"""
+
+import tempfile
+import time
+import unittest
+from email.utils import formatdate
+from types import SimpleNamespace
+from unittest import mock
+
+import orjson
+
+from utils.etag_cache import ETagCache
+from utils.github_mcp import CircuitBreaker, GitHubMCP, GitHubRateLimiter, TokenBucket, parse_retry_after
+
+
+def _response(status, headers):
+    return SimpleNamespace(status=status, headers=headers)
+
+
+class _FakeResponse:
+    """Just enough of an aiohttp response for GitHubMCP"""
+    
+    def __init__(self, status, body=None, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self.content_length = None
+        self._body = body
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return None
+    
+    async def json(self, loads=orjson.loads):
+        return self._body
+    
+    async def text(self):
+        return orjson.dumps(self._body).decode()
+
+
+class _FakeSession:
+    """Replays queued responses per (method, URL suffix), recording each request"""
+    
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+    
+    async def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        for (expected_method, suffix), queue in self.responses.items():
+            if method == expected_method and url.split("?")[0].endswith(suffix):
+                return queue.pop(0)
+        raise AssertionError(f"Unexpected request: {method} {url}")
+
+
+_GRAPHQL_REPOSITORY = {
+    "name": "repo",
+    "nameWithOwner": "owner/repo",
+    "description": "A repository",
+    "primaryLanguage": {"name": "Python"},
+    "stargazerCount": 1,
+    "forkCount": 0,
+    "openIssues": {"totalCount": 0},
+    "createdAt": None,
+    "updatedAt": None,
+    "repositoryTopics": {"nodes": []},
+    "defaultBranchRef": {"name": "main", "target": {"history": {"nodes": []}}},
+    "readme": {"text": "# Repo"},
+    "issues": {"nodes": []},
+    "pullRequests": {"nodes": []}
+}
+
+
+class TokenBucketTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_burst_is_not_delayed(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        with mock.patch("utils.github_mcp.asyncio.sleep") as sleep:
+            for _ in range(3):
+                await bucket.acquire()
+        sleep.assert_not_called()
+    
+    async def test_empty_bucket_sleeps_off_each_deficit(self):
+        bucket = TokenBucket(rate=2, capacity=1)
+        with mock.patch("utils.github_mcp.asyncio.sleep") as sleep:
+            for _ in range(3):
+                await bucket.acquire()
+        delays = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertAlmostEqual(delays[0], 0.5, delta=0.05)
+        self.assertAlmostEqual(delays[1], 1.0, delta=0.05)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(threshold=2, cooldown=60)
+        breaker.record_failure()
+        self.assertFalse(breaker.is_open)
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+    
+    def test_success_resets_the_count(self):
+        breaker = CircuitBreaker(threshold=2, cooldown=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertFalse(breaker.is_open)
+    
+    def test_closes_after_cooldown(self):
+        breaker = CircuitBreaker(threshold=1, cooldown=0)
+        breaker.record_failure()
+        self.assertFalse(breaker.is_open)
+
+
+class RetryAfterTest(unittest.TestCase):
+
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+    
+    def test_http_date(self):
+        delay = parse_retry_after(formatdate(time.time() + 90, usegmt=True))
+        self.assertAlmostEqual(delay, 90, delta=2)
+    
+    def test_past_date_is_zero(self):
+        self.assertEqual(parse_retry_after(formatdate(time.time() - 90, usegmt=True)), 0.0)
+    
+    def test_invalid(self):
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(""))
+    
+    def test_retry_delay_accepts_http_date(self):
+        limiter = GitHubRateLimiter()
+        headers = {"Retry-After": formatdate(time.time() + 30, usegmt=True)}
+        self.assertAlmostEqual(limiter.retry_delay(_response(429, headers), 0), 30, delta=2)
+
+
+class RateLimitWaitTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_distant_reset_raises_instead_of_sleeping(self):
+        limiter = GitHubRateLimiter()
+        limiter.update({"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": str(time.time() + 3600)})
+        with self.assertRaises(RuntimeError):
+            await limiter.wait()
+
+
+class FetchRetryTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.client = GitHubMCP("token")
+        self.client.etag_cache = ETagCache(self._tmp.name)
+        self.client.bare_repo_cache = None
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    async def test_retried_5xx_and_429_recover(self):
+        session = _FakeSession({
+            ("POST", "/graphql"): [
+                _FakeResponse(502, {"message": "Bad Gateway"}),
+                _FakeResponse(200, {"data": {"repository": _GRAPHQL_REPOSITORY}})
+            ],
+            ("GET", "/git/trees/HEAD"): [
+                _FakeResponse(429, {"message": "Too Many Requests"}, {"Retry-After": "1"}),
+                _FakeResponse(200, {"tree": [{"path": "README.md", "type": "blob", "size": 6}]})
+            ]
+        })
+        
+        with mock.patch.object(self.client, "_session", return_value=session), \
+                mock.patch("utils.github_mcp.asyncio.sleep") as sleep:
+            data = await self.client.fetch_repository_data("owner/repo")
+        
+        self.assertEqual(data["repository"]["full_name"], "owner/repo")
+        self.assertEqual(data["readme"], "# Repo")
+        self.assertEqual(data["codebase"]["file_tree"], [{"path": "README.md", "type": "blob", "size": 6}])
+        self.assertEqual(len(session.requests), 4)
+        self.assertEqual(sleep.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+"""Tests for extracting JSON from model responses"""
+
+import unittest
+
+from utils.json_parser import extract_json_from_response
+
+
+class ExtractJsonTest(unittest.TestCase):
+
+    def test_bare_object(self):
+        self.assertEqual(extract_json_from_response('{"a": 1}'), {"a": 1})
+    
+    def test_fenced_object(self):
+        self.assertEqual(extract_json_from_response('Here:\n```json\n{"a": 1}\n```'), {"a": 1})
+    
+    def test_trailing_text_is_dropped(self):
+        self.assertEqual(extract_json_from_response('Result: {"a": {"b": 2}} hope this helps'), {"a": {"b": 2}})
+    
+    def test_braces_inside_strings_are_not_counted(self):
+        response = '{"code": "if (x) { return \\"}\\"; }", "n": 1} trailing }'
+        self.assertEqual(
+            extract_json_from_response(response),
+            {"code": 'if (x) { return "}"; }', "n": 1}
+        )
+    
+    def test_truncated_object(self):
+        self.assertIsNone(extract_json_from_response('{"a": {"b": "unterminated'))
+
+
+if __name__ == "__main__":
+    unittest.main()
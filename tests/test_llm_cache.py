@@ -0,0 +1,90 @@
+"""Tests for the LLM response cache"""
+
+import os
+import stat
+import tempfile
+import unittest
+
+from utils.llm_cache import LLMCache, SQLiteStore, make_cache_key
+
+
+class SQLiteStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = SQLiteStore(os.path.join(self._tmp.name, "cache.db"))
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def test_round_trip(self):
+        self.store.set("k", "v", expire=60)
+        self.assertEqual(self.store.get("k"), "v")
+        self.store.set("k", "v2", expire=60)
+        self.assertEqual(self.store.get("k"), "v2")
+        self.assertIsNone(self.store.get("missing"))
+    
+    def test_expired_entries_are_misses(self):
+        self.store.set("k", "v", expire=-1)
+        self.assertIsNone(self.store.get("k"))
+    
+    def test_set_purges_expired_rows(self):
+        self.store.set("old", "v", expire=-1)
+        self.store.set("k", "v", expire=60)
+        rows = self.store._conn.execute("SELECT key FROM cache").fetchall()
+        self.assertEqual(rows, [("k",)])
+    
+    def test_size_limit_evicts_oldest(self):
+        self.store.size_limit = 10
+        self.store.set("a", "x" * 4, expire=60)
+        self.store.set("b", "x" * 4, expire=120)
+        self.store.set("c", "x" * 4, expire=180)
+        self.assertIsNone(self.store.get("a"))
+        self.assertEqual(self.store.get("b"), "xxxx")
+        self.assertEqual(self.store.get("c"), "xxxx")
+
+
+class LLMCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def test_disk_round_trip(self):
+        LLMCache(self._tmp.name).set("k", "response")
+        self.assertEqual(LLMCache(self._tmp.name).get("k"), "response")
+    
+    def test_directory_is_private(self):
+        directory = os.path.join(self._tmp.name, "cache")
+        LLMCache(directory)
+        self.assertEqual(stat.S_IMODE(os.stat(directory).st_mode), 0o700)
+    
+    def test_memory_fallback(self):
+        cache = LLMCache(self._tmp.name, max_memory_entries=2)
+        cache._disk = None
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        cache.set("d", "4", expire=-1)
+        self.assertIsNone(cache.get("d"))
+    
+    def test_unusable_directory_falls_back_to_memory(self):
+        path = os.path.join(self._tmp.name, "file")
+        open(path, "w").close()
+        cache = LLMCache(path)
+        self.assertIsNone(cache._disk)
+        cache.set("k", "response")
+        self.assertEqual(cache.get("k"), "response")
+    
+    def test_cache_key(self):
+        self.assertEqual(make_cache_key("m", 0.2, "p"), make_cache_key("m", 0.2, "p"))
+        self.assertNotEqual(make_cache_key("m", 0.2, "p"), make_cache_key("m", 0.3, "p"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+"""Tests for the repository prompt serializer"""
+
+import unittest
+
+import orjson
+
+from utils.repo_serializer import dumps_truncated
+
+
+class DumpsTruncatedTest(unittest.TestCase):
+
+    ITEMS = [{"name": "flask", "version": "2.3"}, "text with \"quotes\"", 42, [1, 2], None]
+    
+    def test_matches_truncated_full_dump(self):
+        full = orjson.dumps(self.ITEMS).decode()
+        for limit in range(0, len(full) + 5):
+            self.assertEqual(dumps_truncated(self.ITEMS, limit), full[:limit], limit)
+    
+    def test_empty_list(self):
+        self.assertEqual(dumps_truncated([], 100), "[]")
+        self.assertEqual(dumps_truncated([], 1), "[")
+
+
+if __name__ == "__main__":
+    unittest.main()
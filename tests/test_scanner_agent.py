@@ -0,0 +1,23 @@
+"""Tests for the repository scanner agent"""
+
+import unittest
+
+from agents.scanner_agent import ScannerAgent
+
+
+class ScannerAgentTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_mock_scanner_returns_readme(self):
+        scanner = ScannerAgent(use_real_data=False)
+        repo_data = await scanner.scan_repository("https://github.com/octo/demo")
+        self.assertTrue(repo_data["readme"])
+        self.assertEqual(repo_data["repository"]["full_name"], "octo/demo")
+    
+    async def test_mock_scanner_accepts_git_urls(self):
+        scanner = ScannerAgent(use_real_data=False)
+        repo_data = await scanner.scan_repository("https://github.com/octo/demo.git")
+        self.assertEqual(repo_data["repository"]["full_name"], "octo/demo")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,14 +4,21 @@ This module implements Google's Agent-to-Agent (A2A) protocol for
 enabling interoperability and communication between AI agents.
 """
 
-import uuid
+import os
 import time
-from typing import Any, Dict, Optional, List
+from collections import Counter, defaultdict, deque
+from typing import Any, Dict, Iterable, Optional, List
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 
+import orjson
 
-@dataclass
+# Maximum number of messages kept in history; the oldest are evicted (and
+# dropped from the indexes) beyond this, so a long-lived process stays bounded
+HISTORY_CAP = int(os.getenv("A2A_HISTORY_CAP", "100000"))
+
+
+@dataclass(slots=True)
 class A2AMessage:
     """A2A Protocol Message Structure
     
@@ -19,14 +26,19 @@ class A2AMessage:
     """
     
     protocol_version: str = "1.0"
-    message_id: str = field(default_factory=lambda: f"msg_{uuid.uuid4().hex[:12]}")
+    message_id: str = field(default_factory=lambda: f"msg_{os.urandom(6).hex()}")
     sender_id: str = ""
     sender_type: str = ""
     recipient_id: str = ""
-    message_type: str = "request"  # request, response, broadcast, notification
+    message_type: str = "request"  # request, response, broadcast, notification, partial
     timestamp: float = field(default_factory=time.time)
     payload: Dict[str, Any] = field(default_factory=dict)
     conversation_id: str = ""
+    # ISO 8601 form of `timestamp`, formatted once at construction
+    timestamp_iso: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.timestamp_iso = datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat()
     
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization"""
@@ -46,17 +58,21 @@ class A2AMessage:
                 "data": self.payload.get("data", {}),
                 "metadata": {
                     "conversation_id": self.conversation_id,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": self.timestamp_iso
                 }
             }
         }
     
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes (only done when a message leaves the process)"""
+        return orjson.dumps(self.to_dict())
+    
     @classmethod
     def from_dict(cls, data: dict) -> 'A2AMessage':
         """Create A2AMessage from dictionary"""
         return cls(
             protocol_version=data.get("protocol_version", "1.0"),
-            message_id=data.get("message_id", f"msg_{uuid.uuid4().hex[:12]}"),
+            message_id=data.get("message_id", f"msg_{os.urandom(6).hex()}"),
             sender_id=data.get("sender", {}).get("agent_id", ""),
             sender_type=data.get("sender", {}).get("agent_type", ""),
             recipient_id=data.get("recipient", {}).get("agent_id", ""),
@@ -73,9 +89,13 @@ class A2AProtocol:
     Manages agent-to-agent communication, message routing, and history tracking.
     """
     
-    def __init__(self):
-        self.message_history: List[A2AMessage] = []
+    def __init__(self, history_cap: int = HISTORY_CAP):
+        self.message_history: "deque[A2AMessage]" = deque(maxlen=history_cap)
         self.conversation_index: Dict[str, List[A2AMessage]] = {}
+        self.sender_index: Dict[str, List[A2AMessage]] = defaultdict(list)
+        self.recipient_index: Dict[str, List[A2AMessage]] = defaultdict(list)
+        # Running per-conversation stats, updated as messages are logged
+        self.conversation_stats: Dict[str, Dict[str, Any]] = {}
     
     async def send_message(
         self,
@@ -94,7 +114,7 @@ class A2AProtocol:
             recipient_id: ID of the receiving agent
             data: Message payload data
             conversation_id: ID of the conversation
-            message_type: Type of message ('request', 'response', 'broadcast', 'notification')
+            message_type: Type of message ('request', 'response', 'broadcast', 'notification', 'partial')
             
         Returns:
             A2AMessage: The created and logged message
@@ -181,14 +201,85 @@ class A2AProtocol:
         )
     
     def _log_message(self, message: A2AMessage) -> None:
-        """Log a message to history and index it by conversation"""
+        """Log a message to history and index it by conversation, sender and recipient"""
         
+        if len(self.message_history) == self.message_history.maxlen:
+            self._evict(self.message_history[0])
         self.message_history.append(message)
         
         # Index by conversation ID
         if message.conversation_id not in self.conversation_index:
             self.conversation_index[message.conversation_id] = []
         self.conversation_index[message.conversation_id].append(message)
+        
+        self.sender_index[message.sender_id].append(message)
+        self.recipient_index[message.recipient_id].append(message)
+        
+        self._update_stats(message)
+    
+    def _evict(self, message: A2AMessage) -> None:
+        """Drop the oldest message (about to fall out of history) from the indexes
+        
+        Being the oldest message overall, it is also first in each of its buckets.
+        """
+        for index, key in (
+            (self.conversation_index, message.conversation_id),
+            (self.sender_index, message.sender_id),
+            (self.recipient_index, message.recipient_id)
+        ):
+            bucket = index[key]
+            del bucket[0]
+            if not bucket:
+                del index[key]
+        
+        self._discount_stats(message.conversation_id, [message])
+    
+    @staticmethod
+    def _agents_of(message: A2AMessage) -> List[str]:
+        """Agents taking part in a message (a broadcast names no recipient)"""
+        if message.recipient_id == "all_agents":
+            return [message.sender_id]
+        return [message.sender_id, message.recipient_id]
+    
+    def _update_stats(self, message: A2AMessage) -> None:
+        """Fold a message into its conversation's running stats"""
+        stats = self.conversation_stats.get(message.conversation_id)
+        if stats is None:
+            stats = self.conversation_stats[message.conversation_id] = {
+                "total_messages": 0,
+                "message_types": Counter(),
+                "agents": Counter(),
+                "first": message.timestamp,
+                "last": message.timestamp
+            }
+        
+        stats["total_messages"] += 1
+        stats["message_types"][message.message_type] += 1
+        stats["agents"].update(self._agents_of(message))
+        stats["first"] = min(stats["first"], message.timestamp)
+        stats["last"] = max(stats["last"], message.timestamp)
+    
+    def _discount_stats(self, conversation_id: str, removed: List[A2AMessage]) -> None:
+        """Take messages that left the history out of their conversation's stats
+        
+        Must be called after they were removed from the conversation index.
+        """
+        bucket = self.conversation_index.get(conversation_id)
+        if not bucket:
+            self.conversation_stats.pop(conversation_id, None)
+            return
+        
+        stats = self.conversation_stats[conversation_id]
+        stats["total_messages"] -= len(removed)
+        stats["message_types"].subtract(msg.message_type for msg in removed)
+        stats["agents"].subtract(agent for msg in removed for agent in self._agents_of(msg))
+        # Unary + drops the counts that reached zero
+        stats["message_types"] = +stats["message_types"]
+        stats["agents"] = +stats["agents"]
+        
+        # Messages are logged as they are created, so buckets are in time order
+        stats["first"] = bucket[0].timestamp
+        stats["last"] = bucket[-1].timestamp
     
     def get_message_history(
         self, 
@@ -207,20 +298,29 @@ class A2AProtocol:
             List[A2AMessage]: Filtered list of messages
         """
         
-        # Start with conversation filter if provided (most efficient)
+        # Start from the smallest index bucket among the requested filters
+        candidates = []
         if conversation_id:
-            messages = self.conversation_index.get(conversation_id, [])
-        else:
-            messages = self.message_history
-        
-        # Apply additional filters
+            candidates.append(self.conversation_index.get(conversation_id, []))
         if sender_id:
-            messages = [msg for msg in messages if msg.sender_id == sender_id]
-        
+            candidates.append(self.sender_index.get(sender_id, []))
         if recipient_id:
-            messages = [msg for msg in messages if msg.recipient_id == recipient_id]
-        
-        return messages
+            candidates.append(self.recipient_index.get(recipient_id, []))
+        
+        if not candidates:
+            return list(self.message_history)
+        
+        messages = min(candidates, key=len)
+        if len(candidates) == 1:
+            return messages
+        
+        # Apply the remaining filters to that bucket only
+        return [
+            msg for msg in messages
+            if (not conversation_id or msg.conversation_id == conversation_id)
+            and (not sender_id or msg.sender_id == sender_id)
+            and (not recipient_id or msg.recipient_id == recipient_id)
+        ]
     
     def get_conversation_stats(self, conversation_id: str) -> Dict[str, Any]:
         """Get statistics for a conversation
@@ -232,9 +332,9 @@ class A2AProtocol:
             Dict containing conversation statistics
         """
         
-        messages = self.get_message_history(conversation_id=conversation_id)
+        stats = self.conversation_stats.get(conversation_id)
         
-        if not messages:
+        if stats is None:
             return {
                 "total_messages": 0,
                 "message_types": {},
@@ -242,32 +342,56 @@ class A2AProtocol:
                 "duration": 0
             }
         
-        # Calculate statistics
-        message_types = {}
-        agents = set()
+        return {
+            "total_messages": stats["total_messages"],
+            "message_types": dict(stats["message_types"]),
+            "agents_involved": list(stats["agents"]),
+            "duration_seconds": stats["last"] - stats["first"],
+            "start_time": datetime.fromtimestamp(stats["first"], timezone.utc).isoformat(),
+            "end_time": datetime.fromtimestamp(stats["last"], timezone.utc).isoformat()
+        }
+    
+    def prune_conversation(self, conversation_id: str, older_than: Optional[float] = None) -> int:
+        """Discard a conversation's messages, e.g. once its assessment is done
         
-        for msg in messages:
-            # Count message types
-            message_types[msg.message_type] = message_types.get(msg.message_type, 0) + 1
+        Args:
+            conversation_id: ID of the conversation
+            older_than: If provided, only discard messages logged before this
+                Unix timestamp
             
-            # Track agents
-            agents.add(msg.sender_id)
-            if msg.recipient_id != "all_agents":
-                agents.add(msg.recipient_id)
+        Returns:
+            Number of messages removed
+        """
         
-        # Calculate duration
-        start_time = min(msg.timestamp for msg in messages)
-        end_time = max(msg.timestamp for msg in messages)
-        duration = end_time - start_time
+        messages = self.conversation_index.get(conversation_id)
+        if not messages:
+            return 0
         
-        return {
-            "total_messages": len(messages),
-            "message_types": message_types,
-            "agents_involved": list(agents),
-            "duration_seconds": duration,
-            "start_time": datetime.fromtimestamp(start_time).isoformat(),
-            "end_time": datetime.fromtimestamp(end_time).isoformat()
-        }
+        if older_than is None:
+            removed = messages
+        else:
+            removed = [msg for msg in messages if msg.timestamp < older_than]
+            if not removed:
+                return 0
+        removed_ids = {id(msg) for msg in removed}
+        
+        # Remove from main history
+        self.message_history = deque(
+            (msg for msg in self.message_history if id(msg) not in removed_ids),
+            maxlen=self.message_history.maxlen
+        )
+        
+        # Remove from indexes (only the buckets its messages are in)
+        remaining = [msg for msg in messages if id(msg) not in removed_ids]
+        if remaining:
+            self.conversation_index[conversation_id] = remaining
+        else:
+            del self.conversation_index[conversation_id]
+        self._discount_stats(conversation_id, removed)
+        self._remove_from_index(self.sender_index, {msg.sender_id for msg in removed}, removed_ids)
+        self._remove_from_index(self.recipient_index, {msg.recipient_id for msg in removed}, removed_ids)
+        
+        return len(removed)
     
     def clear_history(self, conversation_id: Optional[str] = None) -> None:
         """Clear message history
@@ -278,18 +402,24 @@ class A2AProtocol:
         
         if conversation_id:
             # Clear specific conversation
-            if conversation_id in self.conversation_index:
-                # Remove from main history
-                self.message_history = [
-                    msg for msg in self.message_history 
-                    if msg.conversation_id != conversation_id
-                ]
-                # Remove from index
-                del self.conversation_index[conversation_id]
+            self.prune_conversation(conversation_id)
         else:
             # Clear all history
-            self.message_history = []
+            self.message_history.clear()
             self.conversation_index = {}
+            self.sender_index = defaultdict(list)
+            self.recipient_index = defaultdict(list)
+            self.conversation_stats = {}
+    
+    @staticmethod
+    def _remove_from_index(index: Dict[str, List[A2AMessage]], keys: Iterable[str], removed_ids: set) -> None:
+        """Drop removed messages (by id()) from the given buckets of an index"""
+        for key in keys:
+            bucket = [msg for msg in index[key] if id(msg) not in removed_ids]
+            if bucket:
+                index[key] = bucket
+            else:
+                del index[key]
 
 
 # Global A2A protocol instance for the application
@@ -360,6 +490,7 @@ if __name__ == "__main__":
         print("\n6. Testing message serialization...")
         msg_dict = msg1.to_dict()
         print(f"✅ Message serialized to dict: {list(msg_dict.keys())}")
+        print(f"✅ Message serialized to JSON: {len(msg1.to_json())} bytes")
         
         print("\n" + "=" * 60)
         print("✅ All A2A Protocol tests passed!")
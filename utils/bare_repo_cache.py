@@ -0,0 +1,122 @@
+"""Bare Repository Mirror Cache
+
+Keeps bare mirrors of scanned repositories on local disk so commit history
+can be read with pygit2 instead of through the rate-limited GitHub API.
+The first scan of a repository clones its mirror in the background (and
+still reads commits from the API); later scans fetch the mirror, which is
+incremental, and walk it locally.
+
+Optional: needs `pygit2` and is enabled by pointing ACTUALCODE_BARE_REPO_DIR
+at a directory (a RAM disk such as /dev/shm/actualcode works well).
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+import threading
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BARE_REPO_DIR = os.getenv("ACTUALCODE_BARE_REPO_DIR")
+
+
+class BareRepoCache:
+    """Bare mirrors of GitHub repositories under one directory"""
+    
+    def __init__(self, directory: str, github_token: str):
+        import pygit2  # ImportError when the optional dependency is missing
+        
+        self._pygit2 = pygit2
+        self.directory = directory
+        self.github_token = github_token
+        self._cloning: set = set()
+        self._lock = threading.Lock()
+    
+    def _path(self, owner: str, repo: str) -> str:
+        return os.path.join(self.directory, owner, f"{repo}.git")
+    
+    def _callbacks(self):
+        """Credentials for private repositories"""
+        return self._pygit2.RemoteCallbacks(
+            credentials=self._pygit2.UserPass("x-access-token", self.github_token)
+        )
+    
+    def recent_commits(self, owner: str, repo: str, max_items: int) -> Optional[List[Dict[str, Any]]]:
+        """Update a repository's mirror and read its latest commits (blocking)
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            max_items: Maximum number of commits to return
+        
+        Returns:
+            Commits in the same shape as the GitHub API fetch, or None if there
+            is no mirror yet (one is then cloned in the background)
+        """
+        path = self._path(owner, repo)
+        if not os.path.isdir(path):
+            self._start_clone(owner, repo)
+            return None
+        
+        pygit2 = self._pygit2
+        mirror = pygit2.Repository(path)
+        mirror.remotes["origin"].fetch(callbacks=self._callbacks())
+        
+        return [
+            {
+                "sha": str(commit.id)[:8],
+                "message": commit.message.split('\n')[0][:100],
+                "author": commit.author.name,
+                "date": datetime.fromtimestamp(commit.author.time, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            }
+            for commit in islice(mirror.walk(mirror.head.target, pygit2.GIT_SORT_TIME), max_items)
+        ]
+    
+    def _start_clone(self, owner: str, repo: str) -> None:
+        """Clone a mirror in a daemon thread, unless one is already being cloned"""
+        key = (owner, repo)
+        with self._lock:
+            if key in self._cloning:
+                return
+            self._cloning.add(key)
+        
+        threading.Thread(target=self._clone, args=(owner, repo), daemon=True).start()
+    
+    def _clone(self, owner: str, repo: str) -> None:
+        """Clone into a temporary directory and move it into place when complete,
+        so an interrupted clone never leaves a broken mirror behind"""
+        path = self._path(owner, repo)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        staging = tempfile.mkdtemp(dir=os.path.dirname(path), prefix=f".{repo}-")
+        try:
+            self._pygit2.clone_repository(
+                f"https://github.com/{owner}/{repo}.git",
+                staging,
+                bare=True,
+                # Mirror branches onto local heads so later fetches move HEAD
+                remote=lambda mirror, name, url: mirror.remotes.create(name, url, "+refs/heads/*:refs/heads/*"),
+                callbacks=self._callbacks()
+            )
+            os.rename(staging, path)
+            logger.info(f"Cloned bare mirror of {owner}/{repo}")
+        except Exception as e:
+            logger.warning(f"Could not clone bare mirror of {owner}/{repo}: {e}")
+            shutil.rmtree(staging, ignore_errors=True)
+        finally:
+            with self._lock:
+                self._cloning.discard((owner, repo))
+
+
+def create_bare_repo_cache(github_token: str) -> Optional[BareRepoCache]:
+    """Create a mirror cache if ACTUALCODE_BARE_REPO_DIR is set and pygit2 is installed"""
+    if not BARE_REPO_DIR:
+        return None
+    try:
+        return BareRepoCache(BARE_REPO_DIR, github_token)
+    except ImportError:
+        logger.warning("ACTUALCODE_BARE_REPO_DIR is set but pygit2 is not installed; reading commits from the API")
+        return None
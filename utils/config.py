@@ -0,0 +1,30 @@
+"""Runtime Configuration
+
+Reads the environment (and `.env`) once and exposes it as an immutable
+config object shared by agents and entry points.
+"""
+
+import os
+import functools
+from dataclasses import dataclass
+from typing import Optional
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Environment-derived settings"""
+    project: Optional[str]
+    region: str
+    github_token: Optional[str]
+
+
+@functools.cache
+def config() -> Config:
+    """Get the process-wide configuration, loading `.env` on first call"""
+    load_dotenv()
+    return Config(
+        project=os.getenv("GOOGLE_CLOUD_PROJECT"),
+        region=os.getenv("GOOGLE_CLOUD_REGION", "us-central1"),
+        github_token=os.getenv("GITHUB_TOKEN") or os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN")
+    )
@@ -0,0 +1,116 @@
+"""GitHub ETag Cache
+
+Persists GitHub REST response bodies together with their validators (ETag and
+Last-Modified), so repeated scans can send conditional requests: an unchanged
+resource comes back as an empty 304 Not Modified, which does not count
+against the rate limit. Entries fetched or revalidated within the last few
+minutes are served without any request, and recently used entries are kept
+decoded in an in-process LRU in front of SQLite.
+"""
+
+import os
+import time
+import sqlite3
+import functools
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+import orjson
+
+from utils.llm_cache import CACHE_DIR, MEMORY_CACHE_SIZE, SQLiteStore, make_cache_key
+
+# Entries are revalidated before reuse, so they can be kept for a long time
+ETAG_EXPIRE_SECONDS = 7 * 86400
+
+# Entries younger than this are served without revalidating (0 = always revalidate)
+FRESH_SECONDS = int(os.getenv("ACTUALCODE_ETAG_FRESH_SECONDS", "300"))
+
+
+class CachedResponse(NamedTuple):
+    """A stored response body and the validators it was served with"""
+    etag: Optional[str]
+    body: Any
+    stored_at: float
+    last_modified: Optional[str] = None
+
+
+class ETagCache:
+    """Response store in a SQLite file behind an in-memory LRU (memory only
+    if the cache directory is not writable)"""
+    
+    def __init__(
+        self,
+        directory: str = CACHE_DIR,
+        fresh_seconds: int = FRESH_SECONDS,
+        max_memory_entries: int = MEMORY_CACHE_SIZE
+    ):
+        self.fresh_seconds = fresh_seconds
+        self.max_memory_entries = max_memory_entries
+        self._store: Optional[SQLiteStore] = None
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        try:
+            # Bodies can come from private repositories, so keep the directory
+            # private (chmod also fails, falling back to memory, if another
+            # user owns it)
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            os.chmod(directory, 0o700)
+            self._store = SQLiteStore(os.path.join(directory, "etags.db"))
+        except (OSError, sqlite3.Error):
+            pass
+    
+    @staticmethod
+    def key(
+        url: str,
+        accept: str,
+        params: Optional[Dict[str, Any]] = None,
+        authorization: str = ""
+    ) -> str:
+        """Build the cache key for a request
+        
+        The Accept header selects the body format, and the credential is part
+        of the (hashed) key so a body is only served back to the token that
+        was allowed to read it.
+        """
+        return make_cache_key("etag", url, accept, sorted((params or {}).items()), authorization)
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Get the stored response for a key, or None on a miss"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        
+        raw = self._store.get(key) if self._store is not None else None
+        if raw is None:
+            return None
+        
+        entry = CachedResponse(*orjson.loads(raw))
+        self._remember(key, entry)
+        return entry
+    
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Whether an entry can be used without revalidating it"""
+        return time.time() - entry.stored_at < self.fresh_seconds
+    
+    def set(self, key: str, etag: Optional[str], body: Any, last_modified: Optional[str] = None) -> None:
+        """Store a response body under its validators"""
+        entry = CachedResponse(etag, body, time.time(), last_modified)
+        self._remember(key, entry)
+        if self._store is not None:
+            self._store.set(key, orjson.dumps(list(entry)).decode(), expire=ETAG_EXPIRE_SECONDS)
+    
+    def touch(self, key: str, entry: CachedResponse) -> None:
+        """Restart an entry's fresh window after a 304 revalidated it"""
+        self.set(key, entry.etag, entry.body, entry.last_modified)
+    
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+
+@functools.cache
+def get_etag_cache() -> ETagCache:
+    """Get the process-wide GitHub ETag cache"""
+    return ETagCache()
@@ -4,14 +4,295 @@ Integrates with GitHub's Model Context Protocol server to fetch real repository
 """
 
 import os
-import json
+import re
+import time
+import random
+import functools
 import asyncio
+import weakref
 import subprocess
-from typing import Dict, Any, List, Optional
+from email.utils import parsedate_to_datetime
+from collections import Counter
+from itertools import islice
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Any, List, Optional
 import logging
 
+import orjson
+
+from utils.config import config
+from utils.etag_cache import get_etag_cache
+from utils.bare_repo_cache import create_bare_repo_cache
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of GitHub requests in flight per fetch_repository_data call
+MAX_CONCURRENT_REQUESTS = 64
+
+# Maximum number of file tree entries kept per repository
+FILE_TREE_LIMIT = 500
+
+# Maximum number of raw file fetches in flight (stays under GitHub's
+# secondary rate limits)
+RAW_FETCH_CONCURRENCY = 8
+
+# Connection pool of the shared HTTP session (keep-alive connections are
+# reused across requests and scans instead of redoing TCP/TLS each time)
+POOL_LIMIT = 20
+POOL_LIMIT_PER_HOST = 10
+KEEPALIVE_TIMEOUT_SECONDS = 75
+DNS_CACHE_TTL_SECONDS = 300
+
+# Timeout of a single request attempt (the session applies it to each retry)
+REQUEST_TIMEOUT_SECONDS = 10
+
+# Repository metadata, README and recent issues/PRs/commits in one round trip
+# (file tree and dependency files still come from the REST API)
+GRAPHQL_URL = "https://api.github.com/graphql"
+REPOSITORY_QUERY = """
+query($owner: String!, $name: String!, $count: Int!, $withIssues: Boolean!, $withPRs: Boolean!, $withCommits: Boolean!) {
+  repository(owner: $owner, name: $name) {
+    name
+    nameWithOwner
+    description
+    primaryLanguage { name }
+    stargazerCount
+    forkCount
+    openIssues: issues(states: OPEN) { totalCount }
+    createdAt
+    updatedAt
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    defaultBranchRef {
+      name
+      target {
+        ... on Commit {
+          history(first: $count) @include(if: $withCommits) {
+            nodes { oid messageHeadline author { name date } }
+          }
+        }
+      }
+    }
+    readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+    issues(first: $count, orderBy: {field: UPDATED_AT, direction: DESC}) @include(if: $withIssues) {
+      nodes { number title body state createdAt updatedAt labels(first: 10) { nodes { name } } }
+    }
+    pullRequests(first: $count, orderBy: {field: UPDATED_AT, direction: DESC}) @include(if: $withPRs) {
+      nodes { number title body state createdAt updatedAt mergedAt }
+    }
+  }
+}
+"""
+
+# Rate limiting: wait for the quota reset below this many remaining requests,
+# and retry rate-limited, 5xx and connection failures with jittered
+# exponential backoff (1s, then 2s)
+RATE_LIMIT_LOW_WATERMARK = 100
+MAX_ATTEMPTS = 3
+BACKOFF_BASE_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 4.0
+RETRYABLE_STATUSES = (500, 502, 503, 504)
+
+# Longest rate-limit wait (quota reset or Retry-After) slept off before a
+# request is given up on, so an interactive run is not silently stalled
+MAX_RATE_LIMIT_WAIT_SECONDS = float(os.getenv("ACTUALCODE_GITHUB_MAX_WAIT_SECONDS", "10"))
+
+# Time budget per repository section, so one slow endpoint cannot stall the
+# whole scan (a timed-out section comes back empty). It covers every attempt
+# of a request and the waits between them, so retries are never cut short.
+SECTION_TIMEOUT_SECONDS = (
+    MAX_ATTEMPTS * REQUEST_TIMEOUT_SECONDS
+    + (MAX_ATTEMPTS - 1) * max(MAX_RATE_LIMIT_WAIT_SECONDS, MAX_BACKOFF_SECONDS + 1)
+)
+
+# Only the start of these files is used, so larger bodies are not read off
+# the socket in full (the README feeds summaries of up to 6000 characters;
+# dependency files are cut to 1000 characters, at most 4 bytes each)
+README_MAX_BYTES = 64 * 1024
+DEPENDENCY_FILE_MAX_BYTES = 4 * 1024
+
+# owner/repo in https://github.com/owner/repo(.git), github.com/owner/repo
+# or owner/repo, ignoring anything after the repository name
+_REPO_URL_RE = re.compile(r'(?:https?://)?(?:www\.)?(?:github\.com/)?([^/\s]+)/([^/\s]+?)(?:\.git)?(?:/.*)?$')
+
+# Headers sent with every GitHub request (Authorization is added per client)
+_STATIC_HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "User-Agent": "ActualCode-CLI/1.0",
+    "X-GitHub-Api-Version": "2022-11-28"
+}
+
+# Request budget per token: GitHub's 5000 requests/hour on average, with
+# bursts of up to TOKEN_BUCKET_BURST (a normal scan never waits)
+TOKEN_BUCKET_RATE = 5000 / 3600
+TOKEN_BUCKET_BURST = 100
+
+# Circuit breaker: after this many consecutive failed requests, stop calling
+# GitHub for a while instead of burning quota during an outage
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN_SECONDS = 60
+
+
+def extension_histogram(file_tree: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Count the files in a tree per extension, most common first"""
+    return dict(Counter(
+        os.path.splitext(item["path"])[1].lower() or "(none)"
+        for item in file_tree
+        if item.get("type") == "blob"
+    ).most_common())
+
+
+@functools.lru_cache(maxsize=256)
+def parse_repo_url(repo_url: str) -> tuple[str, str]:
+    """Extract (owner, repo name) from a GitHub repository URL
+    
+    Accepts https://github.com/owner/repo, github.com/owner/repo and
+    owner/repo, with or without a .git suffix or trailing path.
+    
+    Raises:
+        ValueError: If the URL has no owner/repo part
+    """
+    match = _REPO_URL_RE.match(repo_url.strip())
+    if match is None:
+        raise ValueError(f"Invalid GitHub repository URL: {repo_url}")
+    return match.group(1), match.group(2)
+
+
+def empty_section(section: str) -> Any:
+    """Placeholder for a repository section that could not be fetched"""
+    return {} if section == "repository" else "" if section == "readme" else []
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for a zero-based attempt number"""
+    return min(MAX_BACKOFF_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt) + random.uniform(0, 1)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Get the delay in seconds from a Retry-After header, which holds either
+    a number of seconds or an HTTP date (None if it is neither)"""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, in bursts of up to `capacity`"""
+    
+    def __init__(self, rate: float = TOKEN_BUCKET_RATE, capacity: float = TOKEN_BUCKET_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    async def acquire(self) -> None:
+        """Take a token, sleeping until it is available if the bucket is empty"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        
+        # Concurrent callers each reserve their own token and sleep off the deficit
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+
+class GitHubRateLimiter:
+    """Paces GitHub requests with a token bucket and the rate-limit headers
+    of earlier responses"""
+    
+    def __init__(self, low_watermark: int = RATE_LIMIT_LOW_WATERMARK):
+        self.low_watermark = low_watermark
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.bucket = TokenBucket()
+    
+    async def wait(self) -> None:
+        """Take a token, then sleep until the quota resets if it is nearly used up
+        
+        Raises:
+            RuntimeError: If the reset is more than MAX_RATE_LIMIT_WAIT_SECONDS away
+        """
+        await self.bucket.acquire()
+        
+        if self.remaining is None or self.remaining >= self.low_watermark:
+            return
+        
+        delay = self.reset_at - time.time()
+        if delay > MAX_RATE_LIMIT_WAIT_SECONDS:
+            raise RuntimeError(
+                f"GitHub rate limit nearly exhausted ({self.remaining} left), "
+                f"quota resets in {delay:.0f}s"
+            )
+        if delay > 0:
+            logger.warning(f"GitHub rate limit nearly exhausted ({self.remaining} left), waiting {delay:.0f}s for reset")
+            await asyncio.sleep(delay)
+        self.remaining = None
+    
+    def update(self, headers) -> None:
+        """Record the quota reported by a response"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = float(reset)
+    
+    def retry_delay(self, response, attempt: int) -> Optional[float]:
+        """Get the seconds to wait before retrying a response
+        
+        Args:
+            response: aiohttp response
+            attempt: Zero-based attempt number
+            
+        Returns:
+            Delay in seconds, or None if the response is not rate limited
+        """
+        if response.status in RETRYABLE_STATUSES:
+            return backoff_delay(attempt)
+        if response.status not in (403, 429):
+            return None
+        
+        retry_after = parse_retry_after(response.headers.get("Retry-After") or "")
+        if retry_after is not None:
+            return retry_after
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            return max(0.0, self.reset_at - time.time())
+        if response.status == 429:
+            return backoff_delay(attempt)
+        
+        # A plain 403 is a permissions error, retrying will not help
+        return None
+
+
+class CircuitBreaker:
+    """Fails fast for `cooldown` seconds after `threshold` consecutive failures"""
+    
+    def __init__(self, threshold: int = CIRCUIT_FAILURE_THRESHOLD, cooldown: float = CIRCUIT_COOLDOWN_SECONDS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether requests should be skipped"""
+        return time.time() < self.open_until
+    
+    def record_success(self) -> None:
+        self.failures = 0
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            logger.warning(f"{self.failures} consecutive GitHub failures, pausing requests for {self.cooldown:.0f}s")
+            self.open_until = time.time() + self.cooldown
+            self.failures = 0
+
 
 class GitHubMCP:
     """GitHub Model Context Protocol client for fetching repository data"""
@@ -23,7 +304,7 @@ class GitHubMCP:
         Args:
             github_token: GitHub Personal Access Token. If None, reads from env.
         """
-        self.github_token = github_token or os.getenv('GITHUB_TOKEN') or os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')
+        self.github_token = github_token or config().github_token
         
         if not self.github_token:
             raise ValueError(
@@ -32,8 +313,170 @@ class GitHubMCP:
             )
         
         self.mcp_process = None
+        # Built once and shared by every request (_get_body copies before adding headers)
+        self._headers_json = {**_STATIC_HEADERS, "Authorization": f"Bearer {self.github_token}"}
+        self._headers_raw = {**self._headers_json, "Accept": "application/vnd.github.raw"}
+        self.rate_limiter = GitHubRateLimiter()
+        self.circuit_breaker = CircuitBreaker()
+        self.bare_repo_cache = create_bare_repo_cache(self.github_token)
+        self.etag_cache = get_etag_cache()
+        # aiohttp sessions are bound to an event loop, so keep one per loop
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
         logger.info("GitHub MCP client initialized")
     
+    def _session(self):
+        """Get the running loop's shared aiohttp session, creating it on first use"""
+        import aiohttp
+        
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=POOL_LIMIT,
+                    limit_per_host=POOL_LIMIT_PER_HOST,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS,
+                    ttl_dns_cache=DNS_CACHE_TTL_SECONDS
+                ),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
+            )
+            self._sessions[loop] = session
+        return session
+    
+    async def aclose(self) -> None:
+        """Close the running loop's shared session (call before the loop ends)"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+    
+    async def __aenter__(self) -> "GitHubMCP":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    @asynccontextmanager
+    async def _request(self, session, method: str, url: str, **kwargs):
+        """Send a request on `session`, retrying rate limits and transient failures
+        
+        Raises:
+            RuntimeError: If the circuit breaker is open
+        """
+        import aiohttp
+        
+        for attempt in range(MAX_ATTEMPTS):
+            if self.circuit_breaker.is_open:
+                raise RuntimeError("GitHub requests paused after repeated failures")
+            await self.rate_limiter.wait()
+            
+            try:
+                response = await session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == MAX_ATTEMPTS - 1:
+                    self.circuit_breaker.record_failure()
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"GitHub request failed ({e!r}), retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                continue
+            
+            async with response:
+                self.rate_limiter.update(response.headers)
+                delay = self.rate_limiter.retry_delay(response, attempt)
+                if delay is not None and delay > MAX_RATE_LIMIT_WAIT_SECONDS:
+                    logger.warning(f"GitHub request failed ({response.status}), not retrying: {delay:.0f}s wait requested")
+                if delay is None or delay > MAX_RATE_LIMIT_WAIT_SECONDS or attempt == MAX_ATTEMPTS - 1:
+                    if delay is None:
+                        self.circuit_breaker.record_success()
+                    else:
+                        self.circuit_breaker.record_failure()
+                    yield response
+                    return
+            
+            logger.warning(f"GitHub request failed ({response.status}), retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+    
+    def _get(self, session, url: str, **kwargs):
+        """GET `url` on `session` (see _request)"""
+        return self._request(session, "GET", url, **kwargs)
+    
+    async def _get_body(
+        self,
+        session,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        raw: bool = False,
+        transform: Optional[Callable[[Any], Any]] = None,
+        max_bytes: Optional[int] = None
+    ) -> tuple[int, Any]:
+        """GET `url` and read its body, revalidating against the ETag cache
+        
+        A cached body is sent with If-None-Match / If-Modified-Since; a 304
+        Not Modified reply is served from the cache and does not count
+        against the rate limit. Bodies stored within the cache's fresh
+        window are returned without a request.
+        
+        Args:
+            session: aiohttp session
+            url: Request URL
+            headers: Request headers
+            params: Query parameters
+            raw: Return the body as text instead of decoding JSON
+            transform: Applied to a fresh body before it is cached, so only
+                the part the caller keeps is stored
+            max_bytes: Read at most this many bytes of a raw body
+            
+        Returns:
+            Tuple of (status, body); the body is the error text on failure
+        """
+        key = self.etag_cache.key(url, headers.get("Accept", ""), params, headers.get("Authorization", ""))
+        cached = self.etag_cache.get(key)
+        if cached is not None:
+            if self.etag_cache.is_fresh(cached):
+                return 200, cached.body
+            headers = dict(headers)
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        
+        async with self._get(session, url, headers=headers, params=params) as response:
+            if response.status == 304 and cached is not None:
+                self.etag_cache.touch(key, cached)
+                return 200, cached.body
+            if response.status != 200:
+                return response.status, await response.text()
+            
+            body = await self._read_text(response, max_bytes) if raw else await response.json(loads=orjson.loads)
+            if transform is not None:
+                body = transform(body)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.etag_cache.set(key, etag, body, last_modified)
+            return 200, body
+    
+    @staticmethod
+    async def _read_text(response, max_bytes: Optional[int] = None) -> str:
+        """Read a text body, stopping after `max_bytes`
+        
+        A body known to fit is read normally. Otherwise reading stops early and
+        the connection is closed rather than drained when the response is
+        released.
+        """
+        if max_bytes is None or (response.content_length is not None and response.content_length <= max_bytes):
+            return await response.text()
+        
+        data = bytearray()
+        while len(data) < max_bytes:
+            chunk = await response.content.read(max_bytes - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data.decode("utf-8", errors="replace")
+    
     def _parse_repo_url(self, repo_url: str) -> tuple[str, str]:
         """
         Parse GitHub repository URL to extract owner and repo name
@@ -44,26 +487,7 @@ class GitHubMCP:
         Returns:
             Tuple of (owner, repo_name)
         """
-        # Handle different URL formats
-        # https://github.com/owner/repo
-        # github.com/owner/repo
-        # owner/repo
-        
-        url = repo_url.strip().rstrip('/')
-        
-        if url.startswith('http'):
-            # Extract from full URL
-            parts = url.split('github.com/')[-1].split('/')
-        elif 'github.com/' in url:
-            parts = url.split('github.com/')[-1].split('/')
-        else:
-            # Assume format is owner/repo
-            parts = url.split('/')
-        
-        if len(parts) >= 2:
-            return parts[0], parts[1]
-        else:
-            raise ValueError(f"Invalid GitHub repository URL: {repo_url}")
+        return parse_repo_url(repo_url)
     
     async def fetch_repository_data(
         self,
@@ -71,7 +495,8 @@ class GitHubMCP:
         fetch_issues: bool = True,
         fetch_prs: bool = True,
         fetch_commits: bool = True,
-        max_items: int = 20
+        max_items: int = 20,
+        queue: Optional[asyncio.Queue] = None
     ) -> Dict[str, Any]:
         """
         Fetch comprehensive repository data from GitHub
@@ -82,6 +507,8 @@ class GitHubMCP:
             fetch_prs: Whether to fetch pull requests
             fetch_commits: Whether to fetch commits
             max_items: Maximum number of items to fetch for lists
+            queue: Optional queue that receives (section, data) tuples as each
+                fetch completes, so callers can consume data while the rest loads
             
         Returns:
             Dictionary containing all repository data
@@ -91,37 +518,110 @@ class GitHubMCP:
         logger.info(f"Fetching data for {owner}/{repo}")
         
         try:
-            # Fetch repository metadata
-            repo_data = await self._fetch_repo_metadata(owner, repo)
+            # Stand-in for optional fetches (issues, PRs, commits) that are turned off
+            async def skipped() -> List[Dict[str, Any]]:
+                return []
+            
+            # The fetches are independent, so overlap their round trips
+            # (bounded so a large fan-out stays under GitHub's abuse limits)
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
             
-            # Fetch file structure
-            file_tree = await self._fetch_file_tree(owner, repo)
+            # A failed section comes back empty instead of discarding the others
+            failures: List[BaseException] = []
             
-            # Fetch README
-            readme = await self._fetch_readme(owner, repo)
+            async def bounded(section, coro):
+                async with semaphore:
+                    try:
+                        result = await asyncio.wait_for(coro, SECTION_TIMEOUT_SECONDS)
+                    except asyncio.TimeoutError:
+                        logger.warning(f"Timed out fetching {section} after {SECTION_TIMEOUT_SECONDS:.0f}s")
+                        result = empty_section(section)
+                    except Exception as e:
+                        logger.error(f"Failed to fetch {section}: {e}")
+                        failures.append(e)
+                        result = empty_section(section)
+                if queue is not None:
+                    queue.put_nowait((section, result))
+                return result
             
-            # Fetch dependencies
-            dependencies = await self._fetch_dependencies(owner, repo)
+            # With a bare mirror configured, commits are read from it instead
+            mirror_commits = fetch_commits and self.bare_repo_cache is not None
+            core_names = ("repository", "readme", "issues", "pull_requests")
+            if not mirror_commits:
+                core_names += ("commits",)
+            
+            async def core_sections() -> Dict[str, Any]:
+                """Metadata, README, issues, PRs and commits: one GraphQL query,
+                or the individual REST endpoints if that fails"""
+                async with semaphore:
+                    try:
+                        sections = await asyncio.wait_for(
+                            self._fetch_graphql(
+                                owner, repo, max_items, fetch_issues, fetch_prs, fetch_commits and not mirror_commits
+                            ),
+                            SECTION_TIMEOUT_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        logger.warning(f"GraphQL query timed out after {SECTION_TIMEOUT_SECONDS:.0f}s")
+                        sections = None
+                if sections is None:
+                    coros = [
+                        bounded("repository", self._fetch_repo_metadata(owner, repo)),
+                        bounded("readme", self._fetch_readme(owner, repo)),
+                        bounded("issues", self._fetch_issues(owner, repo, max_items) if fetch_issues else skipped()),
+                        bounded("pull_requests", self._fetch_pull_requests(owner, repo, max_items) if fetch_prs else skipped())
+                    ]
+                    if not mirror_commits:
+                        coros.append(bounded("commits", self._fetch_commits(owner, repo, max_items) if fetch_commits else skipped()))
+                    return dict(zip(core_names, await asyncio.gather(*coros)))
+                
+                # The query only looks for README.md; let REST resolve other names
+                if not sections["readme"]:
+                    sections["readme"] = await bounded("readme", self._fetch_readme(owner, repo))
+                elif queue is not None:
+                    queue.put_nowait(("readme", sections["readme"]))
+                
+                if queue is not None:
+                    for section in core_names:
+                        if section != "readme":
+                            queue.put_nowait((section, sections[section]))
+                return sections
             
-            # Optionally fetch issues, PRs, commits
-            issues = []
-            pull_requests = []
-            commits = []
+            file_tree_task = asyncio.ensure_future(bounded("file_tree", self._fetch_file_tree(owner, repo)))
             
-            if fetch_issues:
-                issues = await self._fetch_issues(owner, repo, max_items)
+            async def dependencies_section() -> List[Dict[str, Any]]:
+                """Dependency manifests, looked up once the file tree shows which exist"""
+                file_tree = await file_tree_task
+                return await bounded("dependencies", self._fetch_dependencies(owner, repo, file_tree))
             
-            if fetch_prs:
-                pull_requests = await self._fetch_pull_requests(owner, repo, max_items)
+            core, file_tree, dependencies, mirrored_commits = await asyncio.gather(
+                core_sections(),
+                file_tree_task,
+                dependencies_section(),
+                bounded("commits", self._fetch_mirror_commits(owner, repo, max_items)) if mirror_commits else skipped(),
+                return_exceptions=True
+            )
+            if isinstance(core, BaseException):
+                logger.error(f"Failed to fetch repository sections: {core}")
+                failures.append(core)
+                core = {section: empty_section(section) for section in core_names}
             
-            if fetch_commits:
-                commits = await self._fetch_commits(owner, repo, max_items)
+            # Only fail the whole fetch if nothing came back (e.g. GitHub is
+            # unreachable), so callers can fall back
+            if failures and not any((*core.values(), file_tree, dependencies, mirrored_commits)):
+                raise failures[0]
+            repo_data = core["repository"]
+            readme = core["readme"]
+            issues = core["issues"]
+            pull_requests = core["pull_requests"]
+            commits = mirrored_commits if mirror_commits else core["commits"]
             
             return {
                 "repository": repo_data,
                 "codebase": {
                     "file_tree": file_tree,
-                    "total_files": len(file_tree) if isinstance(file_tree, list) else 0
+                    "total_files": len(file_tree) if isinstance(file_tree, list) else 0,
+                    "file_extensions": extension_histogram(file_tree)
                 },
                 "readme": readme,
                 "dependencies": dependencies,
@@ -140,95 +640,187 @@ class GitHubMCP:
             logger.error(f"Error fetching repository data: {e}")
             raise
     
-    async def _fetch_repo_metadata(self, owner: str, repo: str) -> Dict[str, Any]:
-        """Fetch basic repository metadata using GitHub API"""
+    async def _fetch_graphql(
+        self,
+        owner: str,
+        repo: str,
+        max_items: int,
+        fetch_issues: bool,
+        fetch_prs: bool,
+        fetch_commits: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch metadata, README, issues, PRs and commits in one GraphQL query
+        
+        Returns:
+            Dictionary with repository, readme, issues, pull_requests and commits
+            in the same shapes as the REST fetchers, or None if the query failed
+        """
         import aiohttp
         
-        url = f"https://api.github.com/repos/{owner}/{repo}"
-        headers = {
-            "Authorization": f"Bearer {self.github_token}",
-            "Accept": "application/vnd.github+json",
-            "User-Agent": "ActualCode-CLI/1.0",
-            "X-GitHub-Api-Version": "2022-11-28"
+        headers = self._headers_json
+        payload = {
+            "query": REPOSITORY_QUERY,
+            "variables": {
+                "owner": owner,
+                "name": repo,
+                "count": min(max_items, 100),
+                "withIssues": fetch_issues,
+                "withPRs": fetch_prs,
+                "withCommits": fetch_commits
+            }
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {
-                        "name": data.get("name"),
-                        "full_name": data.get("full_name"),
-                        "description": data.get("description"),
-                        "language": data.get("language"),
-                        "stars": data.get("stargazers_count", 0),
-                        "forks": data.get("forks_count", 0),
-                        "open_issues": data.get("open_issues_count", 0),
-                        "created_at": data.get("created_at"),
-                        "updated_at": data.get("updated_at"),
-                        "topics": data.get("topics", []),
-                        "default_branch": data.get("default_branch", "main")
-                    }
-                else:
+        try:
+            async with self._request(self._session(), "POST", GRAPHQL_URL, json=payload, headers=headers) as response:
+                if response.status != 200:
                     error_text = await response.text()
-                    logger.error(f"Failed to fetch repo metadata: {response.status} - {error_text[:200]}")
-                    return {}
+                    logger.warning(f"GraphQL query failed: {response.status} - {error_text[:200]}")
+                    return None
+                result = await response.json(loads=orjson.loads)
+        except aiohttp.ClientError as e:
+            logger.warning(f"GraphQL query failed: {e}")
+            return None
+        
+        node = (result.get("data") or {}).get("repository")
+        if node is None:
+            logger.warning(f"GraphQL query returned no repository: {result.get('errors')}")
+            return None
+        
+        branch = node.get("defaultBranchRef") or {}
+        history = ((branch.get("target") or {}).get("history") or {}).get("nodes", [])
+        
+        return {
+            "repository": {
+                "name": node.get("name"),
+                "full_name": node.get("nameWithOwner"),
+                "description": node.get("description"),
+                "language": (node.get("primaryLanguage") or {}).get("name"),
+                "stars": node.get("stargazerCount", 0),
+                "forks": node.get("forkCount", 0),
+                "open_issues": node["openIssues"]["totalCount"],
+                "created_at": node.get("createdAt"),
+                "updated_at": node.get("updatedAt"),
+                "topics": [t["topic"]["name"] for t in node["repositoryTopics"]["nodes"]],
+                "default_branch": branch.get("name", "main")
+            },
+            "readme": (node.get("readme") or {}).get("text", ""),
+            "issues": [
+                {
+                    "number": issue["number"],
+                    "title": issue["title"],
+                    "body": (issue.get("body") or "")[:500],
+                    "state": issue["state"].lower(),
+                    "created_at": issue["createdAt"],
+                    "updated_at": issue["updatedAt"],
+                    "labels": [label["name"] for label in issue["labels"]["nodes"]]
+                }
+                for issue in (node.get("issues") or {}).get("nodes", [])
+            ],
+            "pull_requests": [
+                {
+                    "number": pr["number"],
+                    "title": pr["title"],
+                    "body": (pr.get("body") or "")[:500],
+                    # REST reports merged PRs as closed
+                    "state": "closed" if pr["state"] == "MERGED" else pr["state"].lower(),
+                    "created_at": pr["createdAt"],
+                    "updated_at": pr["updatedAt"],
+                    "merged_at": pr.get("mergedAt")
+                }
+                for pr in (node.get("pullRequests") or {}).get("nodes", [])
+            ],
+            "commits": [
+                {
+                    "sha": commit["oid"][:8],
+                    "message": commit["messageHeadline"][:100],
+                    "author": (commit.get("author") or {}).get("name", "Unknown"),
+                    "date": (commit.get("author") or {}).get("date")
+                }
+                for commit in history
+            ]
+        }
+    
+    async def _fetch_repo_metadata(self, owner: str, repo: str) -> Dict[str, Any]:
+        """Fetch basic repository metadata using GitHub API"""
+        
+        url = f"https://api.github.com/repos/{owner}/{repo}"
+        headers = self._headers_json
+        
+        session = self._session()
+        status, data = await self._get_body(session, url, headers)
+        if status == 200:
+            return {
+                "name": data.get("name"),
+                "full_name": data.get("full_name"),
+                "description": data.get("description"),
+                "language": data.get("language"),
+                "stars": data.get("stargazers_count", 0),
+                "forks": data.get("forks_count", 0),
+                "open_issues": data.get("open_issues_count", 0),
+                "created_at": data.get("created_at"),
+                "updated_at": data.get("updated_at"),
+                "topics": data.get("topics", []),
+                "default_branch": data.get("default_branch", "main")
+            }
+        else:
+            logger.error(f"Failed to fetch repo metadata: {status} - {data[:200]}")
+            return {}
     
     async def _fetch_file_tree(self, owner: str, repo: str) -> List[Dict[str, Any]]:
         """Fetch file tree using GitHub API"""
-        import aiohttp
         
         url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/HEAD?recursive=1"
-        headers = {
-            "Authorization": f"Bearer {self.github_token}",
-            "Accept": "application/vnd.github+json",
-            "User-Agent": "ActualCode-CLI/1.0",
-            "X-GitHub-Api-Version": "2022-11-28"
-        }
+        headers = self._headers_json
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    tree = data.get("tree", [])
-                    # Return simplified file list
-                    return [
-                        {
-                            "path": item["path"],
-                            "type": item["type"],
-                            "size": item.get("size", 0)
-                        }
-                        for item in tree[:500]  # Limit to 500 files
-                    ]
-                else:
-                    logger.error(f"Failed to fetch file tree: {response.status}")
-                    return []
+        def simplify(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+            # Large monorepos return tens of thousands of entries; keep only
+            # the first FILE_TREE_LIMIT, reduced to the fields we use
+            if data.get("truncated"):
+                logger.info(f"GitHub truncated the file tree of {owner}/{repo}")
+            return [
+                {
+                    "path": item["path"],
+                    "type": item["type"],
+                    "size": item.get("size", 0)
+                }
+                for item in islice(data.get("tree", []), FILE_TREE_LIMIT)
+            ]
+        
+        session = self._session()
+        status, tree = await self._get_body(session, url, headers, transform=simplify)
+        if status == 200:
+            return tree
+        else:
+            logger.error(f"Failed to fetch file tree: {status}")
+            return []
     
     async def _fetch_readme(self, owner: str, repo: str) -> str:
         """Fetch README content"""
-        import aiohttp
         
         url = f"https://api.github.com/repos/{owner}/{repo}/readme"
-        headers = {
-            "Authorization": f"Bearer {self.github_token}",
-            "Accept": "application/vnd.github.raw",
-            "User-Agent": "ActualCode-CLI/1.0",
-            "X-GitHub-Api-Version": "2022-11-28"
-        }
+        headers = self._headers_raw
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    logger.warning(f"README not found or inaccessible: {response.status}")
-                    return ""
+        session = self._session()
+        status, text = await self._get_body(session, url, headers, raw=True, max_bytes=README_MAX_BYTES)
+        if status == 200:
+            return text
+        else:
+            logger.warning(f"README not found or inaccessible: {status}")
+            return ""
     
-    async def _fetch_dependencies(self, owner: str, repo: str) -> List[Dict[str, Any]]:
-        """Fetch dependencies from common dependency files"""
-        import aiohttp
+    async def _fetch_dependencies(
+        self,
+        owner: str,
+        repo: str,
+        file_tree: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch dependencies from common dependency files
         
-        dependencies = []
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            file_tree: Repository file tree, used to skip files that do not exist
+        """
         
         # Common dependency files to check
         dep_files = [
@@ -241,143 +833,197 @@ class GitHubMCP:
             "Cargo.toml"  # Rust
         ]
         
-        async with aiohttp.ClientSession() as session:
-            for file in dep_files:
-                url = f"https://api.github.com/repos/{owner}/{repo}/contents/{file}"
-                headers = {
-                    "Authorization": f"Bearer {self.github_token}",
-                    "Accept": "application/vnd.github.raw",
-                    "User-Agent": "ActualCode-CLI/1.0",
-                    "X-GitHub-Api-Version": "2022-11-28"
-                }
-                
-                try:
-                    async with session.get(url, headers=headers) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            dependencies.append({
-                                "file": file,
-                                "content": content[:1000]  # First 1000 chars
-                            })
-                except Exception as e:
-                    logger.debug(f"Could not fetch {file}: {e}")
-        
-        return dependencies
+        # Only request files the tree shows exist (each miss is a 404 round
+        # trip); a missing or truncated tree cannot rule anything out
+        if file_tree and len(file_tree) < FILE_TREE_LIMIT:
+            paths = {item["path"] for item in file_tree}
+            dep_files = [file for file in dep_files if file in paths]
+            if not dep_files:
+                return []
+        
+        contents = await self._fetch_raw_files(owner, repo, dep_files, max_bytes=DEPENDENCY_FILE_MAX_BYTES)
+        if contents is None:
+            return []
+        
+        return [
+            {
+                "file": file,
+                "content": contents[file][:1000]  # First 1000 chars
+            }
+            for file in dep_files
+            if file in contents
+        ]
+    
+    async def _fetch_raw_files(
+        self,
+        owner: str,
+        repo: str,
+        paths: List[str],
+        max_bytes: Optional[int] = None
+    ) -> Optional[Dict[str, str]]:
+        """Fetch the raw contents of several files concurrently
+        
+        At most RAW_FETCH_CONCURRENCY requests are in flight at once. Results
+        are buffered and only returned if every fetch succeeded, so callers
+        never see a partial set; files that do not exist (404) are left out.
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            paths: File paths relative to the repository root
+            max_bytes: Read at most this many bytes of each file
+            
+        Returns:
+            Dictionary mapping path to file content, or None if any file could
+            not be fetched
+        """
+        import aiohttp
+        
+        session = self._session()
+        semaphore = asyncio.Semaphore(RAW_FETCH_CONCURRENCY)
+        headers = self._headers_raw
+        
+        async def fetch(path: str) -> tuple[int, str]:
+            async with semaphore:
+                url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
+                return await self._get_body(session, url, headers, raw=True, max_bytes=max_bytes)
+        
+        results = await asyncio.gather(*(fetch(path) for path in paths), return_exceptions=True)
+        
+        contents = {}
+        complete = True
+        for path, result in zip(paths, results):
+            if isinstance(result, aiohttp.ClientError):
+                logger.warning(f"Failed to fetch {owner}/{repo}/{path}: {result}")
+                complete = False
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            
+            status, body = result
+            if status == 200:
+                contents[path] = body
+            elif status != 404:
+                logger.debug(f"Failed to fetch {owner}/{repo}/{path}: {status}")
+                complete = False
+        return contents if complete else None
     
     async def _fetch_issues(self, owner: str, repo: str, max_items: int) -> List[Dict[str, Any]]:
         """Fetch recent issues"""
-        import aiohttp
         
         url = f"https://api.github.com/repos/{owner}/{repo}/issues"
-        headers = {
-            "Authorization": f"Bearer {self.github_token}",
-            "Accept": "application/vnd.github+json",
-            "User-Agent": "ActualCode-CLI/1.0",
-            "X-GitHub-Api-Version": "2022-11-28"
-        }
+        headers = self._headers_json
         params = {
             "state": "all",
             "per_page": max_items,
             "sort": "updated"
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return [
-                        {
-                            "number": issue["number"],
-                            "title": issue["title"],
-                            "body": (issue.get("body") or "")[:500],  # Handle None
-                            "state": issue["state"],
-                            "created_at": issue["created_at"],
-                            "updated_at": issue["updated_at"],
-                            "labels": [label["name"] for label in issue.get("labels", [])]
-                        }
-                        for issue in data
-                        if "pull_request" not in issue  # Filter out PRs
-                    ]
-                else:
-                    logger.error(f"Failed to fetch issues: {response.status}")
-                    return []
+        session = self._session()
+        status, data = await self._get_body(session, url, headers, params=params)
+        if status == 200:
+            return [
+                {
+                    "number": issue["number"],
+                    "title": issue["title"],
+                    "body": (issue.get("body") or "")[:500],  # Handle None
+                    "state": issue["state"],
+                    "created_at": issue["created_at"],
+                    "updated_at": issue["updated_at"],
+                    "labels": [label["name"] for label in issue.get("labels", [])]
+                }
+                for issue in data
+                if "pull_request" not in issue  # Filter out PRs
+            ]
+        else:
+            logger.error(f"Failed to fetch issues: {status}")
+            return []
     
     async def _fetch_pull_requests(self, owner: str, repo: str, max_items: int) -> List[Dict[str, Any]]:
         """Fetch recent pull requests"""
-        import aiohttp
         
         url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
-        headers = {
-            "Authorization": f"Bearer {self.github_token}",
-            "Accept": "application/vnd.github+json",
-            "User-Agent": "ActualCode-CLI/1.0",
-            "X-GitHub-Api-Version": "2022-11-28"
-        }
+        headers = self._headers_json
         params = {
             "state": "all",
             "per_page": max_items,
             "sort": "updated"
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return [
-                        {
-                            "number": pr["number"],
-                            "title": pr["title"],
-                            "body": (pr.get("body") or "")[:500],  # Handle None
-                            "state": pr["state"],
-                            "created_at": pr["created_at"],
-                            "updated_at": pr["updated_at"],
-                            "merged_at": pr.get("merged_at")
-                        }
-                        for pr in data
-                    ]
-                else:
-                    logger.error(f"Failed to fetch pull requests: {response.status}")
-                    return []
+        session = self._session()
+        status, data = await self._get_body(session, url, headers, params=params)
+        if status == 200:
+            return [
+                {
+                    "number": pr["number"],
+                    "title": pr["title"],
+                    "body": (pr.get("body") or "")[:500],  # Handle None
+                    "state": pr["state"],
+                    "created_at": pr["created_at"],
+                    "updated_at": pr["updated_at"],
+                    "merged_at": pr.get("merged_at")
+                }
+                for pr in data
+            ]
+        else:
+            logger.error(f"Failed to fetch pull requests: {status}")
+            return []
+    
+    async def _fetch_mirror_commits(self, owner: str, repo: str, max_items: int) -> List[Dict[str, Any]]:
+        """Read recent commits from the bare mirror, or the API until it exists"""
+        try:
+            commits = await asyncio.to_thread(self.bare_repo_cache.recent_commits, owner, repo, max_items)
+        except Exception as e:
+            logger.warning(f"Could not read commits from bare mirror: {e}")
+            commits = None
+        
+        if commits is None:
+            return await self._fetch_commits(owner, repo, max_items)
+        return commits
     
     async def _fetch_commits(self, owner: str, repo: str, max_items: int) -> List[Dict[str, Any]]:
         """Fetch recent commits"""
-        import aiohttp
         
         url = f"https://api.github.com/repos/{owner}/{repo}/commits"
-        headers = {
-            "Authorization": f"Bearer {self.github_token}",
-            "Accept": "application/vnd.github+json",
-            "User-Agent": "ActualCode-CLI/1.0",
-            "X-GitHub-Api-Version": "2022-11-28"
-        }
+        headers = self._headers_json
         params = {
             "per_page": min(max_items, 100)  # GitHub API max is 100
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return [
-                        {
-                            "sha": commit["sha"][:8],
-                            "message": (commit["commit"]["message"] or "").split('\n')[0][:100],
-                            "author": commit["commit"]["author"]["name"],
-                            "date": commit["commit"]["author"]["date"]
-                        }
-                        for commit in data
-                    ]
-                else:
-                    logger.error(f"Failed to fetch commits: {response.status}")
-                    return []
+        session = self._session()
+        status, data = await self._get_body(session, url, headers, params=params)
+        if status == 200:
+            return [
+                {
+                    "sha": commit["sha"][:8],
+                    "message": (commit["commit"]["message"] or "").split('\n')[0][:100],
+                    "author": commit["commit"]["author"]["name"],
+                    "date": commit["commit"]["author"]["date"]
+                }
+                for commit in data
+            ]
+        else:
+            logger.error(f"Failed to fetch commits: {status}")
+            return []
+
 
+# Shared clients by token (each holds per-loop HTTP sessions, closed by aclose_all)
+_clients: Dict[str, GitHubMCP] = {}
 
-# Create singleton instance
-github_mcp = None
 
 def get_github_mcp(github_token: Optional[str] = None) -> GitHubMCP:
-    """Get or create GitHub MCP instance"""
-    global github_mcp
-    if github_mcp is None:
-        github_mcp = GitHubMCP(github_token)
-    return github_mcp
+    """Get the shared GitHub MCP client for a token (default: configured token)
+    
+    One client is kept per token, so repeated runs reuse it instead of
+    rebuilding it.
+    """
+    github_token = github_token or config().github_token
+    client = _clients.get(github_token)
+    if client is None:
+        client = _clients[github_token] = GitHubMCP(github_token)
+    return client
+
+
+async def aclose_all() -> None:
+    """Close the running loop's sessions of every shared client (call before the loop ends)"""
+    await asyncio.gather(*(client.aclose() for client in list(_clients.values())))
@@ -7,10 +7,18 @@ Handles common issues with JSON parsing from LLM outputs:
 - Partial JSON responses
 """
 
-import json
 import re
+import orjson
 from typing import Any, Dict, Optional
 
+# Markdown code fences around the JSON (with and without a language tag)
+_FENCED_JSON = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+_FENCED_ANY = re.compile(r'```\s*(.*?)\s*```', re.DOTALL)
+
+# Braces and string literals (an unterminated string runs to the end), so
+# braces inside strings are skipped by the regex engine rather than counted
+_BRACE_OR_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"?|[{}]')
+
 
 def extract_json_from_response(response: str) -> Optional[Dict[str, Any]]:
     """Extract and parse JSON from LLM response
@@ -25,22 +33,25 @@ def extract_json_from_response(response: str) -> Optional[Dict[str, Any]]:
     # Step 1: Extract JSON from markdown code blocks
     json_str = response.strip()
     
-    # Remove markdown code blocks
-    if "```json" in json_str:
+    # Remove markdown code blocks (a bare JSON object, as returned in JSON
+    # mode, has none)
+    if json_str.startswith('{') and json_str.endswith('}'):
+        pass
+    elif "```json" in json_str:
         # Extract content between ```json and ```
-        match = re.search(r'```json\s*(.*?)\s*```', json_str, re.DOTALL)
+        match = _FENCED_JSON.search(json_str)
         if match:
             json_str = match.group(1).strip()
     elif "```" in json_str:
         # Extract content between ``` and ```
-        match = re.search(r'```\s*(.*?)\s*```', json_str, re.DOTALL)
+        match = _FENCED_ANY.search(json_str)
         if match:
             json_str = match.group(1).strip()
     
     # Step 2: Try to parse the JSON
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError as e:
         # Step 3: Try to fix common issues
         
         # Fix 1: Remove any text before the first {
@@ -48,26 +59,28 @@ def extract_json_from_response(response: str) -> Optional[Dict[str, Any]]:
             start_idx = json_str.find('{')
             json_str = json_str[start_idx:]
         
-        # Fix 2: Find the last complete } to handle truncation
-        # Count braces to find where valid JSON ends
+        # Fix 2: Find the } closing the first object to handle truncation
+        # and trailing text (only braces and strings are visited)
         brace_count = 0
         last_valid_pos = 0
         
-        for i, char in enumerate(json_str):
-            if char == '{':
+        for match in _BRACE_OR_STRING.finditer(json_str):
+            token = match.group()
+            if token == '{':
                 brace_count += 1
-            elif char == '}':
+            elif token == '}':
                 brace_count -= 1
                 if brace_count == 0:
-                    last_valid_pos = i + 1
+                    last_valid_pos = match.end()
+                    break
         
         if last_valid_pos > 0 and last_valid_pos < len(json_str):
             json_str = json_str[:last_valid_pos]
         
         # Try parsing again
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
             # If still failing, return None
             return None
 
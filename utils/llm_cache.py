@@ -0,0 +1,145 @@
+"""LLM Response Cache
+
+Content-addressed cache for deterministic agent calls, so re-running the
+pipeline on the same repository does not pay for identical model calls twice.
+Uses `diskcache` when it is installed, otherwise a SQLite file (WAL mode), so
+results survive restarts either way. Both are capped at CACHE_SIZE_LIMIT bytes.
+Falls back to an in-process LRU only when the disk cache cannot be opened.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+CACHE_DIR = os.getenv("ACTUALCODE_CACHE_DIR", "/tmp/gemini_cache")
+DEFAULT_EXPIRE_SECONDS = 86400
+MEMORY_CACHE_SIZE = 256
+
+# Largest total size of cached responses on disk (oldest evicted first)
+CACHE_SIZE_LIMIT = 2 ** 30
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a cache key from the parts that determine a model response
+    
+    Args:
+        *parts: Model, temperature, system instruction, prompt, etc.
+    
+    Returns:
+        Hex digest identifying the request
+    """
+    return hashlib.blake2b(
+        "|".join(str(part) for part in parts).encode(),
+        digest_size=16
+    ).hexdigest()
+
+
+class SQLiteStore:
+    """Minimal expiring key/value store in a single SQLite file, holding at
+    most `size_limit` bytes of values"""
+    
+    def __init__(self, path: str, size_limit: int = CACHE_SIZE_LIMIT):
+        self.size_limit = size_limit
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key: str, value: str, expire: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + expire)
+            )
+            self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            self._cull()
+    
+    def _cull(self) -> None:
+        """Evict the entries closest to expiry until the values fit in size_limit"""
+        excess = self._conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM cache").fetchone()[0] - self.size_limit
+        if excess <= 0:
+            return
+        
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, LENGTH(value) FROM cache ORDER BY expires_at"):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", evicted)
+
+
+class LLMCache:
+    """Response cache backed by diskcache or SQLite, or an in-memory LRU"""
+    
+    def __init__(self, directory: str = CACHE_DIR, max_memory_entries: int = MEMORY_CACHE_SIZE):
+        try:
+            import diskcache
+        except ImportError:
+            diskcache = None
+        
+        try:
+            # Responses can hold private repository content, so keep the
+            # directory private (as the ETag cache does)
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            os.chmod(directory, 0o700)
+            if diskcache is not None:
+                self._disk = diskcache.Cache(directory, size_limit=CACHE_SIZE_LIMIT)
+            else:
+                self._disk = SQLiteStore(os.path.join(directory, "cache.db"))
+        except (OSError, sqlite3.Error):
+            self._disk = None
+        
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self.max_memory_entries = max_memory_entries
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None on a miss or expiry"""
+        if self._disk is not None:
+            return self._disk.get(key)
+        
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if time.time() >= expires_at:
+            del self._memory[key]
+            return None
+        
+        self._memory.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: str, expire: int = DEFAULT_EXPIRE_SECONDS) -> None:
+        """Store a response for `expire` seconds"""
+        if self._disk is not None:
+            self._disk.set(key, value, expire=expire)
+            return
+        
+        self._memory[key] = (time.time() + expire, value)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+
+@functools.cache
+def get_llm_cache() -> LLMCache:
+    """Get the process-wide LLM response cache"""
+    return LLMCache()
@@ -0,0 +1,73 @@
+"""LLM Request Pool
+
+Bounds the number of concurrent Vertex AI calls and smooths them to a
+requests-per-minute budget, so parallel agents overlap network latency
+without tripping quota (429) errors.
+"""
+
+import time
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, AsyncIterator
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_RPM = 100
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate_per_minute`"""
+    
+    def __init__(self, rate_per_minute: int):
+        self.capacity = rate_per_minute
+        self.tokens = float(rate_per_minute)
+        self.refill_rate = rate_per_minute / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Take one token, waiting until one is available"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+
+
+class LLMPool:
+    """Concurrency limit plus rate limit shared by all agents on an event loop"""
+    
+    # One pool per event loop: asyncio primitives cannot be shared across loops
+    # (the web server runs each generation on its own loop)
+    _instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMPool]" = weakref.WeakKeyDictionary()
+    
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, rpm: int = DEFAULT_RPM):
+        self.sem = asyncio.Semaphore(max_concurrency)
+        self.bucket = TokenBucket(rpm)
+    
+    @classmethod
+    def instance(cls) -> "LLMPool":
+        """Get the pool for the running event loop"""
+        loop = asyncio.get_running_loop()
+        pool = cls._instances.get(loop)
+        if pool is None:
+            pool = cls._instances[loop] = cls()
+        return pool
+    
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a concurrency slot (and spend one rate token) for the block"""
+        async with self.sem:
+            await self.bucket.acquire()
+            yield
+    
+    async def submit(self, coro: Awaitable[Any]) -> Any:
+        """Await `coro` once a slot and a rate token are available"""
+        async with self.slot():
+            return await coro
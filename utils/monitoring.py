@@ -4,13 +4,19 @@ This module provides logging, performance monitoring, and observability
 utilities for the multi-agent system.
 """
 
+import os
 import logging
 import time
-import json
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+from datetime import datetime, timezone
 from dataclasses import dataclass, field
 
+import orjson
+
+# "json" emits one JSON object per console line (picked up as structured
+# logs by Cloud Logging / Agent Engine); anything else is human-readable text
+LOG_FORMAT = os.getenv("ACTUALCODE_LOG_FORMAT", "text")
+
 
 @dataclass
 class LogEntry:
@@ -32,6 +38,20 @@ class LogEntry:
         }
 
 
+class JSONFormatter(logging.Formatter):
+    """Formats records as single-line JSON, with AgentLogger fields inlined"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "fields", {})
+        }
+        return orjson.dumps(entry, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS, default=str).decode()
+
+
 class AgentLogger:
     """Unified logging for agents
     
@@ -52,10 +72,13 @@ class AgentLogger:
         
         # Console handler with formatting
         handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        if LOG_FORMAT == "json":
+            formatter = JSONFormatter()
+        else:
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
         handler.setFormatter(formatter)
         self.logger.addHandler(handler)
     
@@ -78,15 +101,20 @@ class AgentLogger:
         
         self.logs.append(log_entry)
         
-        # Also log to Python logger
-        log_method = getattr(self.logger, level.lower(), self.logger.info)
+        # Also log to Python logger (skipping formatting for disabled levels)
+        level_no = getattr(logging, level, logging.INFO)
+        if not self.logger.isEnabledFor(level_no):
+            return
         
-        # Format extra data for console
-        if extra:
+        if LOG_FORMAT == "json":
+            # The formatter serializes the extra fields alongside the message
+            self.logger.log(level_no, message, extra={"fields": extra})
+        elif extra:
+            # Format extra data for console
             extra_str = " | " + " | ".join(f"{k}={v}" for k, v in extra.items())
-            log_method(message + extra_str)
+            self.logger.log(level_no, message + extra_str)
         else:
-            log_method(message)
+            self.logger.log(level_no, message)
     
     def info(self, message: str, **kwargs):
         """Log info message"""
@@ -125,8 +153,12 @@ class AgentLogger:
             format: Export format ('json' or 'text')
         """
         if format == "json":
-            with open(filepath, 'w') as f:
-                json.dump([log.to_dict() for log in self.logs], f, indent=2)
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(
+                    [log.to_dict() for log in self.logs],
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                    default=str
+                ))
         else:  # text format
             with open(filepath, 'w') as f:
                 for log in self.logs:
@@ -190,6 +222,23 @@ class PerformanceMonitor:
         
         return self.metrics[operation]["duration"]
     
+    def record(self, operation: str, duration: float) -> None:
+        """Record a completed operation timed by the caller
+        
+        Args:
+            operation: Name of the operation
+            duration: Duration in seconds
+        """
+        end_time = time.time()
+        count = self.operation_counts.get(operation, 0) + 1
+        self.operation_counts[operation] = count
+        self.metrics[operation] = {
+            "start_time": end_time - duration,
+            "end_time": end_time,
+            "duration": duration,
+            "count": count
+        }
+    
     def get_duration(self, operation: str) -> Optional[float]:
         """Get duration of an operation in seconds
         
@@ -0,0 +1,147 @@
+"""Repository Data Serialization
+
+Precomputes the prompt snippets that several agents derive from the same
+`repo_data` so the work is done once per scan instead of once per agent.
+"""
+
+import orjson
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+# Character budgets used by the analyzer prompts
+PR_BODY_CHAR_LIMIT = 200
+ISSUE_BODY_CHAR_LIMIT = 200
+DEPS_CHAR_LIMIT = 2000
+FILE_TREE_CHAR_LIMIT = 500
+ISSUES_CHAR_LIMIT = 2000
+MAX_PROMPT_ISSUES = 15
+README_CHAR_LIMIT = 500
+SUMMARY_README_CHAR_LIMIT = 6000
+
+# Number of recent contexts to keep (one per in-flight repository scan)
+_CACHE_SIZE = 8
+_context_cache: "OrderedDict[int, tuple]" = OrderedDict()
+
+
+def dumps_truncated(items: List[Any], limit: int) -> str:
+    """Serialize a list as compact JSON, stopping once `limit` chars are reached
+    
+    Produces the same text as `orjson.dumps(items).decode()[:limit]` but only
+    serializes as many items as are needed to fill the budget.
+    
+    Args:
+        items: List of JSON-serializable items
+        limit: Maximum number of characters to return
+    
+    Returns:
+        Truncated JSON string
+    """
+    parts = ["["]
+    length = 1
+    for i, item in enumerate(items):
+        entry = ("," if i else "") + orjson.dumps(item).decode()
+        parts.append(entry)
+        length += len(entry)
+        if length >= limit:
+            break
+    else:
+        parts.append("]")
+    
+    return "".join(parts)[:limit]
+
+
+def _project_pr(pr: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the pull request fields the analyzers use"""
+    return {
+        "number": pr.get("number", pr.get("id")),
+        "title": pr.get("title"),
+        "body": (pr.get("body") or pr.get("description") or "")[:PR_BODY_CHAR_LIMIT],
+        "state": pr.get("state"),
+        "merged_at": pr.get("merged_at"),
+        "files_changed": (pr.get("files_changed") or pr.get("files") or [])[:10]
+    }
+
+
+def _project_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the issue fields the issue analyzer uses"""
+    return {
+        "number": issue.get("number"),
+        "title": issue.get("title"),
+        "labels": issue.get("labels", []),
+        "state": issue.get("state"),
+        "body": (issue.get("body") or "")[:ISSUE_BODY_CHAR_LIMIT]
+    }
+
+
+def _build_summary_text(repo_data: Dict[str, Any], deps_json: str, pull_requests: List[Any]) -> str:
+    """Build the repository summary shared by all analyzers via a context cache"""
+    repository = repo_data.get('repository', {})
+    pr_titles = "\n".join(f"- {pr.get('title', 'N/A')}" for pr in pull_requests[:20]) or "None"
+    
+    return f"""REPOSITORY CONTEXT
+
+Repository: {repository.get('name', 'Unknown')}
+Primary Language: {repository.get('language', 'Unknown')}
+Description: {repository.get('description') or 'No description'}
+
+README:
+{repo_data.get('readme', 'No README')[:SUMMARY_README_CHAR_LIMIT]}
+
+Dependencies:
+{deps_json}
+
+Recent Pull Request Titles:
+{pr_titles}"""
+
+
+def get_repo_context(repo_data: Dict[str, Any]) -> Dict[str, str]:
+    """Get the prompt snippets derived from `repo_data`, computing them once
+    
+    Results are cached by object identity, so every agent handed the same
+    `repo_data` dict during a run shares one serialization.
+    
+    Args:
+        repo_data: Repository data from the scanner / GitHub MCP
+    
+    Returns:
+        Dictionary with content_hash, repo_name, language, prs_json,
+        deps_json, file_tree_json, issues_json, readme_excerpt and summary_text
+    """
+    key = id(repo_data)
+    cached = _context_cache.get(key)
+    # Keep a reference to repo_data so a recycled id() can never match
+    if cached is not None and cached[0] is repo_data:
+        _context_cache.move_to_end(key)
+        return cached[1]
+    
+    repository = repo_data.get('repository', {})
+    pull_requests = repo_data.get('pull_requests') or repo_data.get('pullRequests', [])
+    
+    deps_json = dumps_truncated(repo_data.get('dependencies', []), DEPS_CHAR_LIMIT)
+    
+    context = {
+        # Identifies the repository data by content, so results can be reused
+        # when an identical scan arrives as a new dict (e.g. on retries)
+        "content_hash": hashlib.blake2b(
+            orjson.dumps(repo_data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS),
+            digest_size=16
+        ).hexdigest(),
+        "repo_name": repository.get('name', 'Unknown'),
+        "language": repository.get('language', 'Unknown'),
+        "prs_json": orjson.dumps([_project_pr(pr) for pr in pull_requests[:10]]).decode(),
+        "deps_json": deps_json,
+        "file_tree_json": dumps_truncated(repo_data.get('codebase', {}).get('file_tree', []), FILE_TREE_CHAR_LIMIT),
+        "issues_json": dumps_truncated(
+            [_project_issue(issue) for issue in repo_data.get('issues', [])[:MAX_PROMPT_ISSUES]],
+            ISSUES_CHAR_LIMIT
+        ),
+        "readme_excerpt": repo_data.get('readme', 'No README')[:README_CHAR_LIMIT],
+        "summary_text": _build_summary_text(repo_data, deps_json, pull_requests)
+    }
+    
+    _context_cache[key] = (repo_data, context)
+    if len(_context_cache) > _CACHE_SIZE:
+        _context_cache.popitem(last=False)
+    
+    return context
@@ -0,0 +1,75 @@
+"""Semantic Response Cache
+
+Near-match cache keyed by embedding vectors, so results for inputs that
+differ only cosmetically (rewording, retitling) can be reused. Entries
+expire after a TTL and the least recently used entry is evicted when full.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence
+
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_EXPIRE_SECONDS = 86400
+DEFAULT_MAX_ENTRIES = 256
+
+
+def normalize(vector: Sequence[float]) -> List[float]:
+    """Scale a vector to unit length so a dot product is cosine similarity"""
+    norm = math.sqrt(sum(x * x for x in vector))
+    if not norm:
+        return list(vector)
+    return [x / norm for x in vector]
+
+
+class SemanticCache:
+    """In-memory cache that returns the value of the most similar stored
+    embedding, when that similarity clears `threshold`"""
+    
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        expire: int = DEFAULT_EXPIRE_SECONDS
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.expire = expire
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._next_id = 0
+    
+    def get(self, embedding: Sequence[float]) -> Optional[Any]:
+        """Get the value stored for the nearest embedding, or None on a miss
+        
+        Args:
+            embedding: Query vector (need not be normalized)
+        
+        Returns:
+            Cached value if the best cosine similarity is >= threshold
+        """
+        query = normalize(embedding)
+        now = time.time()
+        
+        best_id, best_score = None, self.threshold
+        for entry_id, (expires_at, vector, _) in list(self._entries.items()):
+            if now >= expires_at:
+                del self._entries[entry_id]
+                continue
+            
+            score = sum(a * b for a, b in zip(query, vector))
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+        
+        if best_id is None:
+            return None
+        
+        self._entries.move_to_end(best_id)
+        return self._entries[best_id][2]
+    
+    def set(self, embedding: Sequence[float], value: Any) -> None:
+        """Store a value under its embedding, evicting the LRU entry if full"""
+        self._entries[self._next_id] = (time.time() + self.expire, normalize(embedding), value)
+        self._next_id += 1
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
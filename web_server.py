@@ -13,8 +13,11 @@ from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 import logging
 
-from utils.github_mcp import get_github_mcp
+from utils.config import config
+from utils.github_mcp import get_github_mcp, aclose_all as aclose_github_clients
 from orchestrator import AssessmentOrchestrator
+from agents.base_agent import aclose_shared_clients
+from agents.qa_validator_agent import get_qa_validator
 from utils.monitoring import AgentLogger
 
 # Configure logging
@@ -65,8 +68,8 @@ def health():
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'github_token_configured': bool(os.getenv('GITHUB_TOKEN') or os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')),
-        'google_cloud_configured': bool(os.getenv('GOOGLE_CLOUD_PROJECT'))
+        'github_token_configured': bool(config().github_token),
+        'google_cloud_configured': bool(config().project)
     })
 
 
@@ -257,7 +260,7 @@ def run_generation(session_id, repo_url, difficulty, time_limit, problem_type):
         })
         
         # Get GitHub token
-        github_token = os.getenv('GITHUB_TOKEN') or os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')
+        github_token = config().github_token
         
         # Fetch repository data
         github_client = get_github_mcp(github_token)
@@ -471,11 +474,17 @@ def run_generation(session_id, repo_url, difficulty, time_limit, problem_type):
     finally:
         # Restore stdout
         sys.stdout = old_stdout
+        loop.run_until_complete(aclose_github_clients())
+        loop.run_until_complete(aclose_shared_clients())
         loop.close()
 
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5001))  # Changed to 5001 to avoid macOS AirPlay conflict
+    
+    # The server validates many problems over its lifetime, so near-duplicate
+    # ones can reuse an earlier verdict
+    get_qa_validator().enable_semantic_cache()
     print(f"""
 ╔═══════════════════════════════════════════════════════════════════╗
 ║                         ActualCode Web UI                         ║